@@ -0,0 +1,150 @@
+"""Benchmark the entity property reads of Home Assistant state writes.
+
+A state write reads the entity's availability, its state and its extra
+state attributes. Compares resolving the unit's freshness and status on
+every property read, as the entities used to, with resolving them once per
+coordinator update. Uses the real entity classes over a polled topology, so
+it needs Home Assistant installed but no running instance.
+
+    python benchmarks/bench_entity_state.py [units] [updates]
+"""
+from datetime import datetime, timezone
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.greenpoint.binary_sensor import (  # noqa: E402
+    GreenpointMotionSensor,
+)
+from custom_components.greenpoint.const import (  # noqa: E402
+    ATTR_LAST_UPDATED,
+    KIND_LIGHT,
+    KIND_MOTION,
+    KIND_SWITCH,
+)
+from custom_components.greenpoint.device import GreenpointDevice  # noqa: E402
+from custom_components.greenpoint.light import GreenpointLight  # noqa: E402
+from custom_components.greenpoint.pygreenpoint import Poller, unit_kinds  # noqa: E402
+from custom_components.greenpoint.pygreenpoint.fake import (  # noqa: E402
+    FakeController,
+)
+from custom_components.greenpoint.switch import GreenpointSwitch  # noqa: E402
+
+
+class _PerRead:
+    """Resolve the unit state on every property read, as entities used to."""
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self.coordinator.is_unit_fresh(self.device.unit_id)
+
+    @property
+    def device_status(self):
+        """Return the device status."""
+        if not self.available:
+            return {}
+        return self.coordinator.data["status"].get(self.device.unit_id, {})
+
+    @property
+    def extra_state_attributes(self):
+        """Return when the device status was last fetched."""
+        updated = self.coordinator.unit_updated.get(self.device.unit_id)
+        return {ATTR_LAST_UPDATED: updated.isoformat() if updated else None}
+
+    def _handle_coordinator_update(self) -> None:
+        """Write state without resolving anything up front."""
+
+
+class PerReadSwitch(_PerRead, GreenpointSwitch):
+    """Switch resolving its unit on every read."""
+
+
+class PerReadLight(_PerRead, GreenpointLight):
+    """Light resolving its unit on every read."""
+
+
+class PerReadMotionSensor(_PerRead, GreenpointMotionSensor):
+    """Motion sensor resolving its unit on every read."""
+
+
+# Entity classes per unit kind, and the property their state is read from
+CACHED = [
+    (KIND_MOTION, GreenpointMotionSensor, "is_on"),
+    (KIND_SWITCH, GreenpointSwitch, "is_on"),
+    (KIND_LIGHT, GreenpointLight, "is_on"),
+]
+PER_READ = [
+    (KIND_MOTION, PerReadMotionSensor, "is_on"),
+    (KIND_SWITCH, PerReadSwitch, "is_on"),
+    (KIND_LIGHT, PerReadLight, "is_on"),
+]
+
+
+def _coordinator(units: int) -> Poller:
+    """Return a poller with every unit polled, standing in for the coordinator."""
+    controller = FakeController(rooms=max(1, units // 10), units_per_room=10)
+    poller = Poller(None)
+    now = datetime.now(timezone.utc)
+    for room in controller.topology:
+        for unit in room["units"]:
+            unit_id = unit["fullId"]
+            poller.units[unit_id] = dict(unit, room_name=room["name"])
+            poller.unit_status[unit_id] = dict(controller.status[unit_id])
+            poller.unit_updated[unit_id] = now
+    poller.data = {"status": poller.unit_status}
+    return poller
+
+
+def _entities(poller: Poller, classes):
+    """Create the entities of every unit and the property their state reads."""
+    entities = []
+    for unit_id, unit in poller.units.items():
+        kinds = unit_kinds(unit, poller.unit_status[unit_id])
+        device = GreenpointDevice(unit_id, unit)
+        for kind, entity_class, state_property in classes:
+            if kind in kinds:
+                entities.append((entity_class(poller, device), state_property))
+    return entities
+
+
+def _run(entities, updates: int) -> float:
+    """Run coordinator updates each followed by a state write's reads."""
+    start = time.perf_counter()
+    for _ in range(updates):
+        for entity, state_property in entities:
+            entity._handle_coordinator_update()
+            entity.available
+            getattr(entity, state_property)
+            entity.extra_state_attributes
+    return time.perf_counter() - start
+
+
+def main(units: int, updates: int) -> None:
+    """Run the benchmark."""
+    poller = _coordinator(units)
+    results = {}
+    for name, classes in (
+        ("lookups on every read", PER_READ),
+        ("resolved per update", CACHED),
+    ):
+        entities = _entities(poller, classes)
+        for entity, _ in entities:
+            # State is written through the benchmark, not Home Assistant
+            entity.async_write_ha_state = lambda: None
+        _run(entities, 1)
+        elapsed = _run(entities, updates)
+        results[name] = (len(entities), elapsed / (len(entities) * updates) * 1e6)
+
+    print(f"{updates} coordinator updates")
+    for name, (count, per_entity_us) in results.items():
+        print(f"  {name:<22} {count:5d} entities {per_entity_us:8.2f} us/entity/update")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    )
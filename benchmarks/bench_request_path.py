@@ -0,0 +1,92 @@
+"""Benchmark the per-request CPU cost of the unit status request path.
+
+Compares building the request URL as a string on every call and decoding the
+body through ``response.json()`` with the client's pre-encoded URLs and
+direct byte decoding. Both run against a local aiohttp server, so the numbers
+reflect client-side CPU rather than controller latency.
+
+    python benchmarks/bench_request_path.py [requests]
+"""
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "custom_components", "greenpoint")
+)
+
+from pygreenpoint import GreenpointApiClient  # noqa: E402
+from pygreenpoint.const import API_UNIT  # noqa: E402
+
+UNIT_IDS = [f"1-{room}-{unit}" for room in range(10) for unit in range(10)]
+BODY = b'{"status": 1, "mode": 0, "temp": 21.5}'
+
+
+async def _unit_handler(request: web.Request) -> web.Response:
+    """Serve a fixed unit status."""
+    return web.Response(body=BODY, content_type="application/json")
+
+
+async def _string_url_path(session, base_url, token, count):
+    """Request units the way the client used to."""
+    for i in range(count):
+        full_id = UNIT_IDS[i % len(UNIT_IDS)]
+        response = await session.get(f"{base_url}{API_UNIT}/{full_id}?token={token}")
+        response.raise_for_status()
+        await response.json()
+
+
+async def _client_path(client, count):
+    """Request units through the API client."""
+    for i in range(count):
+        await client.get_unit_status(UNIT_IDS[i % len(UNIT_IDS)])
+
+
+async def main(count: int) -> None:
+    """Run the benchmark."""
+    app = web.Application()
+    app.router.add_get(f"{API_UNIT}/{{full_id}}", _unit_handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    async with aiohttp.ClientSession() as session:
+        client = GreenpointApiClient(
+            "127.0.0.1", port, "bench-token", session, rate_limit=0
+        )
+
+        # Warm up the connection pool and caches
+        await _string_url_path(session, client.base_url, client.token, 200)
+        await _client_path(client, 200)
+
+        results = {}
+        for name, run in (
+            ("string url + json()", lambda: _string_url_path(
+                session, client.base_url, client.token, count
+            )),
+            ("pre-encoded url + read()", lambda: _client_path(client, count)),
+        ):
+            cpu = time.process_time()
+            wall = time.perf_counter()
+            await run()
+            results[name] = (
+                (time.process_time() - cpu) / count * 1e6,
+                (time.perf_counter() - wall) / count * 1e6,
+            )
+
+    await runner.cleanup()
+
+    # Server and client share the process; the difference is client-side
+    print(f"{count} requests")
+    for name, (cpu_us, wall_us) in results.items():
+        print(f"  {name:<26} {cpu_us:8.1f} us CPU/request {wall_us:8.1f} us wall/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
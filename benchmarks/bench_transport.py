@@ -0,0 +1,84 @@
+"""Benchmark the aiohttp session against the raw keep-alive transport.
+
+Both run the API client against the fake controller on localhost, one unit
+request at a time and with several requests in flight. With several in
+flight the raw transport pipelines them on its single connection, while
+aiohttp opens one connection per concurrent request.
+
+    python benchmarks/bench_transport.py [requests] [concurrency]
+"""
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "custom_components", "greenpoint")
+)
+
+from pygreenpoint import GreenpointApiClient, RawHttpTransport  # noqa: E402
+from pygreenpoint.fake import FakeController  # noqa: E402
+
+
+async def _poll(client, unit_ids, count, concurrency):
+    """Request unit statuses with a number of workers."""
+    async def _worker(offset):
+        for i in range(offset, count, concurrency):
+            await client.get_unit_status(unit_ids[i % len(unit_ids)])
+
+    await asyncio.gather(*(_worker(offset) for offset in range(concurrency)))
+
+
+async def main(count: int, concurrency: int) -> None:
+    """Run the benchmark."""
+    controller = FakeController()
+    port = await controller.start()
+    unit_ids = controller.unit_ids
+
+    async with aiohttp.ClientSession() as session:
+        transport = RawHttpTransport("127.0.0.1", port)
+        clients = {
+            "aiohttp": GreenpointApiClient(
+                "127.0.0.1", port, controller.token, session, rate_limit=0
+            ),
+            "raw": GreenpointApiClient(
+                "127.0.0.1",
+                port,
+                controller.token,
+                session,
+                transport=transport,
+                rate_limit=0,
+            ),
+        }
+
+        results = {}
+        for workers in (1, concurrency):
+            for name, client in clients.items():
+                # Warm up connections and URL caches
+                await _poll(client, unit_ids, 200, workers)
+                cpu = time.process_time()
+                wall = time.perf_counter()
+                await _poll(client, unit_ids, count, workers)
+                results[f"{name}, {workers} in flight"] = (
+                    (time.process_time() - cpu) / count * 1e6,
+                    count / (time.perf_counter() - wall),
+                )
+        transport.close()
+
+    await controller.stop()
+
+    # Server and client share the process, so CPU includes the fake server
+    print(f"{count} requests")
+    for name, (cpu_us, rate) in results.items():
+        print(f"  {name:<22} {cpu_us:8.1f} us CPU/request {rate:9.0f} requests/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+        )
+    )
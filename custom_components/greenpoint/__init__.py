@@ -2,31 +2,154 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
 import aiohttp
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .api import CannotConnect, GreenpointApiClient, InvalidAuth
+from .pygreenpoint import CannotConnect, GreenpointApiClient, InvalidAuth
 from .const import (
     DOMAIN,
     CONF_HOST,
     CONF_PORT,
     CONF_TOKEN,
+    CONF_SCAN_INTERVAL,
+    CONF_MIN_UNIT_INTERVAL,
+    CONF_MAX_UNIT_INTERVAL,
+    CONF_CYCLE_DEADLINE,
+    CONF_POLL_CONCURRENCY,
+    CONF_TIMEOUT_FLOOR,
+    CONF_TIMEOUT_CEILING,
+    CONF_STATUS_MAX_AGE,
+    CONF_PER_ROOM_POLLING,
+    CONF_ROOM_SWITCHES,
+    CONF_EXCLUDED_ROOMS,
+    CONF_EXCLUDED_UNITS,
+    CONF_TEMP_DEADBAND,
+    CONF_TEMP_HEARTBEAT,
+    CONF_TEMP_STATS_WINDOW,
+    CONF_TRANSPORT,
+    CONF_RATE_LIMIT,
+    CONF_TRACE,
+    CONF_LOOP_BLOCK_THRESHOLD,
     DEFAULT_PORT,
+    DEFAULT_MIN_UNIT_INTERVAL,
+    DEFAULT_MAX_UNIT_INTERVAL,
+    DEFAULT_CYCLE_DEADLINE,
+    DEFAULT_POLL_CONCURRENCY,
+    DEFAULT_TIMEOUT_FLOOR,
+    DEFAULT_TIMEOUT_CEILING,
+    DEFAULT_STATUS_MAX_AGE,
+    DEFAULT_TRANSPORT,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_LOOP_BLOCK_THRESHOLD,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_TEMP_HEARTBEAT,
+    DEFAULT_TEMP_STATS_WINDOW,
+    TRANSPORT_RAW,
     UPDATE_INTERVAL,
 )
 from .coordinator import GreenpointDataUpdateCoordinator
+from .services import async_setup_services, async_unload_services
+from .pygreenpoint import RawHttpTransport
+from .pygreenpoint.looplag import LoopMonitor
+from .pygreenpoint.trace import Tracer
 
 _LOGGER = logging.getLogger(__name__)
 
 # List of platforms to support
 PLATFORMS = ["sensor", "binary_sensor", "switch", "light"]
 
+# Options that decide which entities exist or how they are set up, with
+# their defaults; changing them reloads the entry, while the other options
+# are applied live
+ENTITY_OPTIONS: Dict[str, Any] = {
+    CONF_PER_ROOM_POLLING: False,
+    CONF_ROOM_SWITCHES: False,
+    CONF_EXCLUDED_ROOMS: [],
+    CONF_EXCLUDED_UNITS: [],
+}
+
+
+def _connection(entry: ConfigEntry) -> Tuple[str, int, str]:
+    """Return the controller host, port and token of an entry."""
+    return (
+        entry.data[CONF_HOST],
+        entry.data.get(CONF_PORT, DEFAULT_PORT),
+        entry.data[CONF_TOKEN],
+    )
+
+
+def _entity_options(entry: ConfigEntry) -> Dict[str, Any]:
+    """Return the options that decide which entities exist."""
+    # An option never saved counts as its default, so the first save of the
+    # options form, which submits every default, does not reload the entry
+    return {
+        option: entry.options.get(option, default)
+        for option, default in ENTITY_OPTIONS.items()
+    }
+
+
+def _poll_settings(entry: ConfigEntry) -> Dict[str, Any]:
+    """Return the coordinator's polling settings from the entry options."""
+    return {
+        "update_interval": entry.options.get(CONF_SCAN_INTERVAL, UPDATE_INTERVAL),
+        "min_unit_interval": entry.options.get(
+            CONF_MIN_UNIT_INTERVAL, DEFAULT_MIN_UNIT_INTERVAL
+        ),
+        "max_unit_interval": entry.options.get(
+            CONF_MAX_UNIT_INTERVAL, DEFAULT_MAX_UNIT_INTERVAL
+        ),
+        "cycle_deadline": entry.options.get(
+            CONF_CYCLE_DEADLINE, DEFAULT_CYCLE_DEADLINE
+        ),
+        "poll_concurrency": entry.options.get(
+            CONF_POLL_CONCURRENCY, DEFAULT_POLL_CONCURRENCY
+        ),
+        "status_max_age": entry.options.get(
+            CONF_STATUS_MAX_AGE, DEFAULT_STATUS_MAX_AGE
+        ),
+    }
+
+
+def _temperature_filters(entry: ConfigEntry) -> Dict[str, Any]:
+    """Return the temperature sensor filters from the entry options."""
+    return {
+        "deadband": entry.options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND),
+        "heartbeat": entry.options.get(CONF_TEMP_HEARTBEAT, DEFAULT_TEMP_HEARTBEAT),
+        "stats_window": entry.options.get(
+            CONF_TEMP_STATS_WINDOW, DEFAULT_TEMP_STATS_WINDOW
+        ),
+    }
+
+
+def _create_transport(entry: ConfigEntry) -> Optional[RawHttpTransport]:
+    """Return the raw keep-alive transport if the options select it."""
+    if entry.options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT) != TRANSPORT_RAW:
+        return None
+    host, port, _ = _connection(entry)
+    return RawHttpTransport(host, port)
+
+
+def _create_tracer(hass: HomeAssistant, entry: ConfigEntry) -> Tracer:
+    """Return a tracer that records only if the options enable it."""
+    if not entry.options.get(CONF_TRACE, False):
+        return Tracer()
+    return Tracer(hass.config.path(f"greenpoint_trace_{entry.entry_id}.json"))
+
+
+def _loop_block_threshold(entry: ConfigEntry) -> Optional[float]:
+    """Return the loop block threshold in seconds, or None when off."""
+    threshold = entry.options.get(
+        CONF_LOOP_BLOCK_THRESHOLD, DEFAULT_LOOP_BLOCK_THRESHOLD
+    )
+    return threshold / 1000 if threshold else None
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Greenpoint IGH Compact from a config entry."""
@@ -35,13 +158,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Get a ClientSession
     session = async_get_clientsession(hass)
 
-    # Create API client
+    # Create API client, optionally talking to the controller over one
+    # persistent connection
+    host, port, token = _connection(entry)
     client = GreenpointApiClient(
-        host=entry.data[CONF_HOST],
-        port=entry.data.get(CONF_PORT, DEFAULT_PORT),
-        token=entry.data[CONF_TOKEN],
+        host=host,
+        port=port,
+        token=token,
         session=session,
+        timeout_floor=entry.options.get(CONF_TIMEOUT_FLOOR, DEFAULT_TIMEOUT_FLOOR),
+        timeout_ceiling=entry.options.get(
+            CONF_TIMEOUT_CEILING, DEFAULT_TIMEOUT_CEILING
+        ),
+        transport=_create_transport(entry),
+        rate_limit=entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+        # Optionally record poll cycles and requests for chrome://tracing
+        tracer=_create_tracer(hass, entry),
     )
+    # The transport can be swapped by an options update
+    entry.async_on_unload(lambda: _close_transport(client))
 
     # Validate the API connection (and authentication)
     try:
@@ -57,12 +192,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.error("Unexpected exception: %s", exception)
         raise ConfigEntryNotReady from exception
 
-    # Create update coordinator
-    scan_interval = entry.options.get("scan_interval", UPDATE_INTERVAL)
-    coordinator = GreenpointDataUpdateCoordinator(hass, client, scan_interval)
+    # Create update coordinator, optionally timing the integration's work
+    # on the event loop
+    coordinator = GreenpointDataUpdateCoordinator(
+        hass,
+        client,
+        monitor=LoopMonitor(_loop_block_threshold(entry)),
+        **_poll_settings(entry),
+    )
+    coordinator.entity_options = _entity_options(entry)
+    # Excluded units are dropped when the topology loads and never polled
+    coordinator.set_exclusions(
+        entry.options.get(CONF_EXCLUDED_ROOMS, []),
+        entry.options.get(CONF_EXCLUDED_UNITS, []),
+    )
 
     # Fetch initial data
     await coordinator.async_config_entry_first_refresh()
+    _async_remove_excluded_devices(hass, entry, coordinator)
+
+    # Optionally poll and notify each room separately
+    if entry.options.get(CONF_PER_ROOM_POLLING, False):
+        coordinator.async_setup_room_coordinators()
 
     # Store the coordinator
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -70,6 +221,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up all platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Register services
+    await async_setup_services(hass)
+
     # Register options update listener
     entry.async_on_unload(entry.add_update_listener(options_update_listener))
 
@@ -84,10 +238,72 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Remove config entry from domain
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        await async_unload_services(hass)
 
     return unload_ok
 
 
+def _async_remove_excluded_devices(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: GreenpointDataUpdateCoordinator
+) -> None:
+    """Remove the devices, and so the entities, of excluded units and rooms."""
+    device_registry = dr.async_get(hass)
+    excluded = {
+        unit_id for unit_id in coordinator.all_units if unit_id not in coordinator.units
+    }
+    excluded.update(f"room_{room_name}" for room_name in coordinator.excluded_rooms)
+    for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        if any(
+            domain == DOMAIN and identifier in excluded
+            for domain, identifier in device.identifiers
+        ):
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=entry.entry_id
+            )
+
+
+def _close_transport(client: GreenpointApiClient) -> None:
+    """Close the client's raw transport, if it uses one."""
+    if client.transport is not None:
+        client.transport.close()
+
+
 async def options_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Handle options update.
+
+    A new host, port or token, or a change to the options that decide
+    which entities exist, reloads the entry. All other options are applied
+    to the running client and coordinator, keeping the cached units.
+    """
+    coordinator: GreenpointDataUpdateCoordinator | None = hass.data[DOMAIN].get(
+        entry.entry_id
+    )
+    client = coordinator.api if coordinator is not None else None
+    if (
+        client is None
+        or _connection(entry) != (client.host, client.port, client.token)
+        or _entity_options(entry) != coordinator.entity_options
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    client.set_timeouts(
+        entry.options.get(CONF_TIMEOUT_FLOOR, DEFAULT_TIMEOUT_FLOOR),
+        entry.options.get(CONF_TIMEOUT_CEILING, DEFAULT_TIMEOUT_CEILING),
+    )
+    client.limiter.set_rate(entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT))
+    if entry.options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT) == TRANSPORT_RAW:
+        if client.transport is None:
+            client.transport = _create_transport(entry)
+    elif client.transport is not None:
+        # Requests still in flight on the old connection fail and are retried
+        # on the next poll
+        _close_transport(client)
+        client.transport = None
+    if entry.options.get(CONF_TRACE, False) != client.tracer.enabled:
+        client.tracer = _create_tracer(hass, entry)
+    coordinator.monitor.set_threshold(_loop_block_threshold(entry))
+    coordinator.apply_temperature_filters(**_temperature_filters(entry))
+
+    await coordinator.async_apply_settings(**_poll_settings(entry))
+    _LOGGER.debug("Applied new options without reloading")
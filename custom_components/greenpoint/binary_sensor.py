@@ -12,9 +12,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import ATTR_SPAN_SECOND, DOMAIN
+from .const import ATTR_SPAN_SECOND, DOMAIN, KIND_MOTION, MOTION_SPAN_THRESHOLD
 from .coordinator import GreenpointDataUpdateCoordinator
-from .device import GreenpointDevice, GreenpointDeviceEntity
+from .device import GreenpointDevice, GreenpointDeviceEntity, GreenpointRoomEntity
+from .pygreenpoint import unit_kinds
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,13 +31,24 @@ async def async_setup_entry(
 
     # Create binary sensor entities for each unit
     for unit_id, unit_data in coordinator.data["units"].items():
-        # Create a device object
-        device = GreenpointDevice(unit_id, unit_data)
+        # Get the device object shared with the other platforms
+        device = coordinator.get_device(unit_id)
 
         # Check if this is a motion sensor (has span_second)
         status = coordinator.data["status"].get(unit_id, {})
-        if ATTR_SPAN_SECOND in status:
-            entities.append(GreenpointMotionSensor(coordinator, device))
+        if KIND_MOTION in unit_kinds(unit_data, status):
+            entities.append(
+                GreenpointMotionSensor(coordinator.coordinator_for_unit(unit_id), device)
+            )
+
+    # Create an "any motion" sensor for each room with motion sensors
+    for room in coordinator.rooms.rooms.values():
+        if room.motion_units:
+            entities.append(
+                GreenpointRoomMotionSensor(
+                    coordinator.coordinator_for_room(room.name), room.name
+                )
+            )
 
     # Add all entities to Home Assistant
     async_add_entities(entities)
@@ -57,7 +69,24 @@ class GreenpointMotionSensor(GreenpointDeviceEntity, BinarySensorEntity):
         if not self.available:
             return None
 
-        # If span_second is less than 30, consider motion detected
+        # If span_second is less than the threshold, consider motion detected
         # This is a simple heuristic and may need adjustment based on actual API behavior
         span_second = self.device_status.get(ATTR_SPAN_SECOND, 0)
-        return span_second < 30
+        return span_second < MOTION_SPAN_THRESHOLD
+
+
+class GreenpointRoomMotionSensor(GreenpointRoomEntity, BinarySensorEntity):
+    """Motion anywhere in a room."""
+
+    _attr_device_class = BinarySensorDeviceClass.MOTION
+    aggregate_attribute = "motion"
+
+    def __init__(self, coordinator: GreenpointDataUpdateCoordinator, room_name: str):
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, room_name, "motion")
+        self._attr_name = f"{room_name} Motion"
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if any motion sensor in the room detects motion."""
+        return self.aggregate_value
@@ -8,12 +8,53 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_TOKEN
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
 
-from .api import CannotConnect, GreenpointApiClient, InvalidAuth
-from .const import DEFAULT_PORT, DOMAIN
+from .pygreenpoint import CannotConnect, GreenpointApiClient, InvalidAuth
+from .const import (
+    ATTR_NAME,
+    ATTR_ROOM_NAME,
+    CONF_SCAN_INTERVAL,
+    CONF_MIN_UNIT_INTERVAL,
+    CONF_MAX_UNIT_INTERVAL,
+    CONF_CYCLE_DEADLINE,
+    CONF_POLL_CONCURRENCY,
+    CONF_TIMEOUT_FLOOR,
+    CONF_TIMEOUT_CEILING,
+    CONF_STATUS_MAX_AGE,
+    CONF_TEMP_DEADBAND,
+    CONF_TEMP_HEARTBEAT,
+    CONF_TEMP_STATS_WINDOW,
+    CONF_PER_ROOM_POLLING,
+    CONF_TRANSPORT,
+    CONF_RATE_LIMIT,
+    CONF_TRACE,
+    CONF_ROOM_SWITCHES,
+    CONF_LOOP_BLOCK_THRESHOLD,
+    CONF_EXCLUDED_ROOMS,
+    CONF_EXCLUDED_UNITS,
+    DEFAULT_PORT,
+    DEFAULT_MIN_UNIT_INTERVAL,
+    DEFAULT_MAX_UNIT_INTERVAL,
+    DEFAULT_CYCLE_DEADLINE,
+    DEFAULT_POLL_CONCURRENCY,
+    DEFAULT_TIMEOUT_FLOOR,
+    DEFAULT_TIMEOUT_CEILING,
+    DEFAULT_STATUS_MAX_AGE,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_TEMP_HEARTBEAT,
+    DEFAULT_TEMP_STATS_WINDOW,
+    DEFAULT_TRANSPORT,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_LOOP_BLOCK_THRESHOLD,
+    DOMAIN,
+    TRANSPORT_AIOHTTP,
+    TRANSPORT_RAW,
+    UPDATE_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -119,6 +160,12 @@ class GreenpointConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle import from configuration.yaml."""
         return await self.async_step_user(import_info)
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
     """Handle options flow for the integration."""
@@ -130,13 +177,157 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_init(self, user_input=None):
         """Manage the options."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            # Keep the exclusions when the form could not offer them
+            exclusions = {
+                option: self.config_entry.options[option]
+                for option in (CONF_EXCLUDED_ROOMS, CONF_EXCLUDED_UNITS)
+                if option in self.config_entry.options
+            }
+            return self.async_create_entry(title="", data={**exclusions, **user_input})
 
         options = {
             vol.Optional(
-                "scan_interval",
-                default=self.config_entry.options.get("scan_interval", 30),
+                CONF_SCAN_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_SCAN_INTERVAL, UPDATE_INTERVAL
+                ),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_MIN_UNIT_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_MIN_UNIT_INTERVAL, DEFAULT_MIN_UNIT_INTERVAL
+                ),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_MAX_UNIT_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_MAX_UNIT_INTERVAL, DEFAULT_MAX_UNIT_INTERVAL
+                ),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_CYCLE_DEADLINE,
+                default=self.config_entry.options.get(
+                    CONF_CYCLE_DEADLINE, DEFAULT_CYCLE_DEADLINE
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+            vol.Optional(
+                CONF_POLL_CONCURRENCY,
+                default=self.config_entry.options.get(
+                    CONF_POLL_CONCURRENCY, DEFAULT_POLL_CONCURRENCY
+                ),
+            ): vol.All(int, vol.Range(min=1, max=10)),
+            vol.Optional(
+                CONF_TIMEOUT_FLOOR,
+                default=self.config_entry.options.get(
+                    CONF_TIMEOUT_FLOOR, DEFAULT_TIMEOUT_FLOOR
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+            vol.Optional(
+                CONF_TIMEOUT_CEILING,
+                default=self.config_entry.options.get(
+                    CONF_TIMEOUT_CEILING, DEFAULT_TIMEOUT_CEILING
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.5)),
+            vol.Optional(
+                CONF_STATUS_MAX_AGE,
+                default=self.config_entry.options.get(
+                    CONF_STATUS_MAX_AGE, DEFAULT_STATUS_MAX_AGE
+                ),
+            ): vol.All(int, vol.Range(min=2)),
+            vol.Optional(
+                CONF_TEMP_DEADBAND,
+                default=self.config_entry.options.get(
+                    CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND
+                ),
+            ): vol.Coerce(float),
+            vol.Optional(
+                CONF_TEMP_HEARTBEAT,
+                default=self.config_entry.options.get(
+                    CONF_TEMP_HEARTBEAT, DEFAULT_TEMP_HEARTBEAT
+                ),
             ): int,
+            vol.Optional(
+                CONF_TEMP_STATS_WINDOW,
+                default=self.config_entry.options.get(
+                    CONF_TEMP_STATS_WINDOW, DEFAULT_TEMP_STATS_WINDOW
+                ),
+            ): vol.All(int, vol.Range(min=2, max=1000)),
+            vol.Optional(
+                CONF_PER_ROOM_POLLING,
+                default=self.config_entry.options.get(CONF_PER_ROOM_POLLING, False),
+            ): bool,
+            vol.Optional(
+                CONF_TRANSPORT,
+                default=self.config_entry.options.get(
+                    CONF_TRANSPORT, DEFAULT_TRANSPORT
+                ),
+            ): vol.In([TRANSPORT_AIOHTTP, TRANSPORT_RAW]),
+            vol.Optional(
+                CONF_RATE_LIMIT,
+                default=self.config_entry.options.get(
+                    CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_ROOM_SWITCHES,
+                default=self.config_entry.options.get(CONF_ROOM_SWITCHES, False),
+            ): bool,
+            vol.Optional(
+                CONF_TRACE,
+                default=self.config_entry.options.get(CONF_TRACE, False),
+            ): bool,
+            vol.Optional(
+                CONF_LOOP_BLOCK_THRESHOLD,
+                default=self.config_entry.options.get(
+                    CONF_LOOP_BLOCK_THRESHOLD, DEFAULT_LOOP_BLOCK_THRESHOLD
+                ),
+            ): vol.All(int, vol.Range(min=0, max=10000)),
         }
+        options.update(self._exclusion_options())
 
         return self.async_show_form(step_id="init", data_schema=vol.Schema(options))
+
+    def _exclusion_options(self) -> Dict[Any, Any]:
+        """Return the room and unit exclusion fields, filled from the topology.
+
+        The rooms and units come from the running coordinator, so they are
+        only offered while the entry is loaded.
+        """
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if coordinator is None or not coordinator.all_units:
+            return {}
+
+        units = sorted(
+            coordinator.all_units.items(),
+            key=lambda item: (
+                item[1].get(ATTR_ROOM_NAME, "Unknown Room"),
+                item[1].get(ATTR_NAME, item[0]),
+            ),
+        )
+        rooms = sorted({unit.get(ATTR_ROOM_NAME, "Unknown Room") for _, unit in units})
+        unit_labels = {
+            unit_id: (
+                f"{unit.get(ATTR_ROOM_NAME, 'Unknown Room')} "
+                f"{unit.get(ATTR_NAME, unit_id)}"
+            )
+            for unit_id, unit in units
+        }
+        # Units or rooms the controller no longer reports are dropped
+        excluded_rooms = [
+            room
+            for room in self.config_entry.options.get(CONF_EXCLUDED_ROOMS, [])
+            if room in rooms
+        ]
+        excluded_units = [
+            unit_id
+            for unit_id in self.config_entry.options.get(CONF_EXCLUDED_UNITS, [])
+            if unit_id in unit_labels
+        ]
+        return {
+            vol.Optional(
+                CONF_EXCLUDED_ROOMS, default=excluded_rooms
+            ): cv.multi_select(rooms),
+            vol.Optional(
+                CONF_EXCLUDED_UNITS, default=excluded_units
+            ): cv.multi_select(unit_labels),
+        }
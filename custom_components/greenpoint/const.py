@@ -1,4 +1,36 @@
 """Constants for the Greenpoint IGH Compact integration."""
+# Library constants shared with the integration
+from .pygreenpoint.const import (  # noqa: F401
+    API_HOME,
+    API_SCENARIO,
+    API_UNIT,
+    ATTR_FULL_ID,
+    ATTR_MODE,
+    ATTR_NAME,
+    ATTR_ROOM_NAME,
+    ATTR_ROOMS,
+    ATTR_SPAN_SECOND,
+    ATTR_STATUS,
+    ATTR_TEMP,
+    ATTR_UNITS,
+    DEFAULT_CYCLE_DEADLINE,
+    DEFAULT_MAX_UNIT_INTERVAL,
+    DEFAULT_MIN_UNIT_INTERVAL,
+    DEFAULT_POLL_CONCURRENCY,
+    DEFAULT_PORT,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_STATUS_MAX_AGE,
+    DEFAULT_TIMEOUT_CEILING,
+    DEFAULT_TIMEOUT_FLOOR,
+    KIND_LIGHT,
+    KIND_MOTION,
+    KIND_SWITCH,
+    KIND_TEMPERATURE,
+    MOTION_SPAN_THRESHOLD,
+    RECENT_COMMAND_WINDOW,
+    ROOM_SCENARIO_PREFIX,
+    UPDATE_INTERVAL,
+)
 
 DOMAIN = "greenpoint"
 
@@ -7,23 +39,48 @@ CONF_HOST = "host"
 CONF_TOKEN = "token"
 CONF_PORT = "port"
 
-# Defaults
-DEFAULT_PORT = 20500
-
-# API Endpoints
-API_HOME = "/home"
-API_SCENARIO = "/scenario"
-API_UNIT = "/unit"
-
-# Data attributes
-ATTR_ROOMS = "rooms"
-ATTR_UNITS = "units"
-ATTR_NAME = "name"
-ATTR_FULL_ID = "fullId"
-ATTR_TEMP = "temp"
-ATTR_SPAN_SECOND = "span_second"
-ATTR_MODE = "mode"
-ATTR_STATUS = "status"
-
-# Update interval
-UPDATE_INTERVAL = 30  # seconds
+# Options
+CONF_SCAN_INTERVAL = "scan_interval"
+CONF_MIN_UNIT_INTERVAL = "min_unit_interval"
+CONF_MAX_UNIT_INTERVAL = "max_unit_interval"
+CONF_CYCLE_DEADLINE = "cycle_deadline"
+CONF_POLL_CONCURRENCY = "poll_concurrency"
+CONF_TIMEOUT_FLOOR = "timeout_floor"
+CONF_TIMEOUT_CEILING = "timeout_ceiling"
+CONF_STATUS_MAX_AGE = "status_max_age"
+CONF_TEMP_DEADBAND = "temp_deadband"
+CONF_TEMP_HEARTBEAT = "temp_heartbeat"
+CONF_TEMP_STATS_WINDOW = "temp_stats_window"
+CONF_PER_ROOM_POLLING = "per_room_polling"
+CONF_TRANSPORT = "transport"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_TRACE = "trace"
+CONF_ROOM_SWITCHES = "room_switches"
+CONF_LOOP_BLOCK_THRESHOLD = "loop_block_threshold"
+CONF_EXCLUDED_ROOMS = "excluded_rooms"
+CONF_EXCLUDED_UNITS = "excluded_units"
+
+# Entity attributes
+ATTR_LAST_UPDATED = "last_updated"
+ATTR_TEMP_MIN = "temperature_min"
+ATTR_TEMP_MAX = "temperature_max"
+ATTR_TEMP_MEAN = "temperature_mean"
+ATTR_TEMP_RATE = "temperature_rate"
+
+# HTTP transports: the shared aiohttp session, or one persistent pipelined
+# connection per controller
+TRANSPORT_AIOHTTP = "aiohttp"
+TRANSPORT_RAW = "raw"
+DEFAULT_TRANSPORT = TRANSPORT_AIOHTTP
+
+# A temperature is only published when it moves by at least the deadband
+# or when the heartbeat interval has passed since the last published value
+DEFAULT_TEMP_DEADBAND = 0.2  # degrees
+DEFAULT_TEMP_HEARTBEAT = 900  # seconds
+
+# Number of recent readings kept for rolling temperature statistics
+DEFAULT_TEMP_STATS_WINDOW = 20
+
+# Slices of integration work on the event loop longer than this are logged,
+# in milliseconds; 0 turns the monitor off
+DEFAULT_LOOP_BLOCK_THRESHOLD = 0
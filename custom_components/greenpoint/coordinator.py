@@ -1,55 +1,200 @@
 """Data update coordinator for Greenpoint IGH Compact."""
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api import CannotConnect, GreenpointApiClient, InvalidAuth
-from .const import DOMAIN, UPDATE_INTERVAL, ATTR_FULL_ID
+from .const import (
+    DOMAIN,
+    ATTR_ROOM_NAME,
+    DEFAULT_MIN_UNIT_INTERVAL,
+    DEFAULT_MAX_UNIT_INTERVAL,
+    DEFAULT_CYCLE_DEADLINE,
+    DEFAULT_POLL_CONCURRENCY,
+    DEFAULT_STATUS_MAX_AGE,
+)
+from .device import GreenpointDevice
+from .pygreenpoint import CannotConnect, GreenpointApiClient, InvalidAuth, Poller
+from .pygreenpoint.looplag import LoopMonitor
+from .pygreenpoint.rooms import RoomAggregator
+from .pygreenpoint.trace import (
+    LANE_CYCLE,
+    LANE_SPACING,
+    reset_trace_lane,
+    set_trace_lane,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class GreenpointDataUpdateCoordinator(DataUpdateCoordinator):
+def _is_idle(cycle: Dict[str, Any]) -> bool:
+    """Return True if a poll cycle polled no unit and expired none."""
+    return not cycle["due"] and not cycle["expired"]
+
+
+class GreenpointDataUpdateCoordinator(Poller, DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
     def __init__(
-        self, hass: HomeAssistant, client: GreenpointApiClient, update_interval: int
+        self,
+        hass: HomeAssistant,
+        client: GreenpointApiClient,
+        update_interval: int,
+        min_unit_interval: int = DEFAULT_MIN_UNIT_INTERVAL,
+        max_unit_interval: int = DEFAULT_MAX_UNIT_INTERVAL,
+        cycle_deadline: float = DEFAULT_CYCLE_DEADLINE,
+        poll_concurrency: int = DEFAULT_POLL_CONCURRENCY,
+        status_max_age: int = DEFAULT_STATUS_MAX_AGE,
+        monitor: Optional[LoopMonitor] = None,
     ) -> None:
         """Initialize."""
-        self.api = client
+        # Scheduling, polling and state diffing live in the HA-free poller
+        Poller.__init__(
+            self,
+            client,
+            update_interval,
+            min_unit_interval,
+            max_unit_interval,
+            cycle_deadline,
+            poll_concurrency,
+            status_max_age,
+            monitor,
+        )
         self.platforms = []
-        self.units = {}
-        self.unit_status = {}
+        # Options that decide which entities exist, as set up
+        self.entity_options: Dict[str, Any] = {}
+        # Cumulative time spent in listener callbacks, i.e. entity state writes
+        self.listener_time = 0.0
+        # Set up by async_setup_room_coordinators in per-room polling mode
+        self.room_coordinators: Dict[str, GreenpointRoomCoordinator] = {}
+        # One device per unit, shared by the entities of every platform
+        self.devices: Dict[str, GreenpointDevice] = {}
+        # Temperature sensors take new filter options without a reload
+        self.temperature_filter_listeners: List[Callable[..., None]] = []
+        # Set by a refresh that polled nothing and expired nothing
+        self._cycle_idle = False
 
-        super().__init__(
+        DataUpdateCoordinator.__init__(
+            self,
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=update_interval),
+            update_interval=timedelta(seconds=self.tick),
         )
 
+    def get_device(self, unit_id: str) -> GreenpointDevice:
+        """Return the device of a unit, creating it on first use."""
+        device = self.devices.get(unit_id)
+        if device is None:
+            device = self.devices[unit_id] = GreenpointDevice(
+                unit_id, self.units[unit_id]
+            )
+        return device
+
+    async def async_request_unit_refresh(self, unit_id: str) -> None:
+        """Poll a unit on the next refresh and request one."""
+        self.mark_unit_commanded(unit_id)
+        await self.async_request_refresh()
+
+    async def async_apply_settings(self, **settings: Any) -> None:
+        """Apply new polling settings to the running coordinator."""
+        self.configure(**settings)
+        interval = timedelta(seconds=self.tick)
+        if self.room_coordinators:
+            for room_coordinator in self.room_coordinators.values():
+                room_coordinator.update_interval = interval
+        else:
+            self.update_interval = interval
+        # Refreshing reschedules the next refresh with the new interval; room
+        # coordinators pick it up after their next refresh
+        await self.async_request_refresh()
+
+    def apply_temperature_filters(self, **filters: Any) -> None:
+        """Apply new temperature filter options to the temperature sensors."""
+        for listener in self.temperature_filter_listeners:
+            listener(**filters)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and time the state writes."""
+        if self._cycle_idle:
+            # No status changed and none went stale, so no entity can change
+            self._cycle_idle = False
+            return
+        start = time.monotonic()
+        with self.api.tracer.span(
+            "entity updates", "hass", {"listeners": len(self._listeners)}
+        ):
+            with self.monitor.block("state writes"):
+                super().async_update_listeners()
+            # A full refresh in per-room mode has new data for every room
+            for room_coordinator in self.room_coordinators.values():
+                room_coordinator.async_update_listeners()
+        self.listener_time += time.monotonic() - start
+
+    async def async_trace_cycle(
+        self, lane: int, name: str, refresh: Awaitable[None]
+    ) -> None:
+        """Run a refresh as one traced poll cycle and write out its spans."""
+        tracer = self.api.tracer
+        if not tracer.enabled:
+            await refresh
+            return
+
+        token = set_trace_lane(lane, name)
+        try:
+            with tracer.span(name, "poll"):
+                await refresh
+        finally:
+            reset_trace_lane(token)
+        await self.hass.async_add_executor_job(tracer.write, tracer.drain())
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data, tracing the whole cycle."""
+        await self.async_trace_cycle(
+            LANE_CYCLE, "poll cycle", super()._async_refresh(*args, **kwargs)
+        )
+
+    def async_setup_room_coordinators(self) -> None:
+        """Split polling and listeners into one coordinator per room."""
+        for index, room_name in enumerate(self.rooms.rooms, start=1):
+            room_coordinator = GreenpointRoomCoordinator(
+                self.hass, self, room_name, self.room_units(room_name)
+            )
+            # Each room traces its cycles and workers on lanes of its own
+            room_coordinator.trace_lane = index * LANE_SPACING
+            # Start from the data of the first full refresh
+            room_coordinator.data = self.data
+            self.room_coordinators[room_name] = room_coordinator
+
+        # The rooms poll on their own schedule; this coordinator now only
+        # refreshes on request, e.g. after a batch of scenarios
+        self.update_interval = None
+
+    def coordinator_for_room(self, room_name: str) -> DataUpdateCoordinator:
+        """Return the coordinator entities of a room should listen to."""
+        return self.room_coordinators.get(room_name, self)
+
+    def coordinator_for_unit(self, unit_id: str) -> DataUpdateCoordinator:
+        """Return the coordinator entities of a unit should listen to."""
+        room_name = self.units.get(unit_id, {}).get(ATTR_ROOM_NAME, "Unknown Room")
+        return self.coordinator_for_room(room_name)
+
     async def _async_update_data(self) -> Dict[str, Any]:
         """Update data via API."""
         try:
-            # Get all units first
-            if not self.units:
-                self.units = {
-                    unit[ATTR_FULL_ID]: unit for unit in await self.api.get_all_units()
-                }
-
-            # Update status for all units
-            for unit_id in self.units:
-                try:
-                    self.unit_status[unit_id] = await self.api.get_unit_status(unit_id)
-                except Exception as exception:
-                    _LOGGER.error("Error updating status for unit %s: %s", unit_id, exception)
+            # Load the units once, then poll those whose interval has elapsed
+            self._cycle_idle = False
+            cycle = await self.monitor.timed("poll", self.async_poll())
+            self._cycle_idle = self.last_update_success and _is_idle(cycle)
 
             return {
                 "units": self.units,
                 "status": self.unit_status,
+                "updated": self.unit_updated,
             }
         except CannotConnect as exception:
             _LOGGER.error("Cannot connect to IGH Compact API: %s", exception)
@@ -60,3 +205,108 @@ class GreenpointDataUpdateCoordinator(DataUpdateCoordinator):
         except Exception as exception:
             _LOGGER.error("Unexpected error: %s", exception)
             raise UpdateFailed(f"Unexpected error: {exception}") from exception
+
+
+class GreenpointRoomCoordinator(DataUpdateCoordinator):
+    """Poll the units of a single room on their own schedule."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        parent: GreenpointDataUpdateCoordinator,
+        room_name: str,
+        unit_ids: List[str],
+    ) -> None:
+        """Initialize."""
+        self.parent = parent
+        self.room_name = room_name
+        self.unit_ids = unit_ids
+        self.trace_lane = LANE_SPACING
+        # Result of this room's last poll cycle, for diagnostics
+        self.last_cycle: Dict[str, Any] = {}
+        # Set by a refresh that polled nothing and expired nothing
+        self._cycle_idle = False
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} {room_name}",
+            update_interval=timedelta(seconds=parent.tick),
+        )
+
+    # Entities share the parent's client and unit state
+    @property
+    def api(self) -> GreenpointApiClient:
+        """Return the API client."""
+        return self.parent.api
+
+    @property
+    def monitor(self) -> LoopMonitor:
+        """Return the event loop block monitor."""
+        return self.parent.monitor
+
+    @property
+    def rooms(self) -> RoomAggregator:
+        """Return the room aggregates."""
+        return self.parent.rooms
+
+    @property
+    def unit_status(self) -> Dict[str, Dict[str, Any]]:
+        """Return the status of all units."""
+        return self.parent.unit_status
+
+    @property
+    def unit_updated(self) -> Dict[str, datetime]:
+        """Return when each unit status was fetched."""
+        return self.parent.unit_updated
+
+    def is_unit_fresh(self, unit_id: str) -> bool:
+        """Return True if a unit's status is young enough to be served."""
+        return self.parent.is_unit_fresh(unit_id)
+
+    def mark_unit_commanded(self, unit_id: str) -> None:
+        """Poll a commanded unit first on the next refresh."""
+        self.parent.mark_unit_commanded(unit_id)
+
+    async def async_request_unit_refresh(self, unit_id: str) -> None:
+        """Poll a unit on the next refresh of this room and request one."""
+        self.parent.mark_unit_commanded(unit_id)
+        await self.async_request_refresh()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and time the state writes."""
+        if self._cycle_idle:
+            self._cycle_idle = False
+            return
+        start = time.monotonic()
+        with self.api.tracer.span(
+            "entity updates", "hass", {"listeners": len(self._listeners)}
+        ):
+            with self.monitor.block("state writes"):
+                super().async_update_listeners()
+        self.parent.listener_time += time.monotonic() - start
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data, tracing the whole cycle."""
+        await self.parent.async_trace_cycle(
+            self.trace_lane,
+            f"poll cycle {self.room_name}",
+            super()._async_refresh(*args, **kwargs),
+        )
+
+    async def _async_update_data(self) -> Dict[str, Any]:
+        """Update the units of this room."""
+        cycle = await self.monitor.timed(
+            "poll", self.parent.async_poll_due_units(self.unit_ids)
+        )
+        self.last_cycle = cycle
+
+        # Failed polls are counted and logged like in a full refresh rather
+        # than failing the refresh: listeners are not notified of repeated
+        # failed refreshes, so entities would never see their units go stale
+        if cycle["due"] and cycle["failed"] == cycle["due"]:
+            _LOGGER.warning("Failed to update any unit in %s", self.room_name)
+        self._cycle_idle = self.last_update_success and _is_idle(cycle)
+
+        return self.parent.data
@@ -1,12 +1,20 @@
 """Device management for Greenpoint IGH Compact."""
+from datetime import datetime
 import logging
 from typing import Dict, List, Optional, Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, ATTR_NAME, ATTR_FULL_ID
+from .const import (
+    DOMAIN,
+    ATTR_NAME,
+    ATTR_FULL_ID,
+    ATTR_LAST_UPDATED,
+    ROOM_SCENARIO_PREFIX,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,13 +28,15 @@ class GreenpointDevice:
         self.unit_data = unit_data
         self.name = unit_data.get(ATTR_NAME, "Unknown")
         self.room_name = unit_data.get("room_name", "Unknown Room")
+        # Shared by the device info and the names of the unit's entities
+        self.full_name = f"{self.room_name} {self.name}"
         self.device_info = self._get_device_info()
 
     def _get_device_info(self) -> DeviceInfo:
         """Return device information."""
         return DeviceInfo(
             identifiers={(DOMAIN, self.unit_id)},
-            name=f"{self.room_name} {self.name}",
+            name=self.full_name,
             manufacturer="Greenpoint",
             model="IGH Compact",
             via_device=(DOMAIN, "hub"),
@@ -37,10 +47,112 @@ class GreenpointDevice:
         self.unit_data = unit_data
         self.name = unit_data.get(ATTR_NAME, self.name)
         self.room_name = unit_data.get("room_name", self.room_name)
+        self.full_name = f"{self.room_name} {self.name}"
+
+
+class GreenpointRoomEntity(CoordinatorEntity):
+    """Base entity for a room aggregate."""
+
+    # The RoomAggregate attribute this entity reports, set by each subclass
+    aggregate_attribute: str
+
+    def __init__(self, coordinator, room_name: str, entity_type: str):
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.room_name = room_name
+        self._attr_unique_id = f"room_{room_name}_{entity_type}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"room_{room_name}")},
+            name=room_name,
+            manufacturer="Greenpoint",
+            model="IGH Compact Room",
+        )
+
+    @property
+    def room(self):
+        """Return the aggregate of this entity's room."""
+        return self.coordinator.rooms.rooms.get(self.room_name)
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        room = self.room
+        return room is not None and room.fresh
+
+    @property
+    def aggregate_value(self) -> Any:
+        """Return the aggregate value this entity reports."""
+        room = self.room
+        return getattr(room, self.aggregate_attribute) if room else None
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the value written when the entity is added."""
+        await super().async_added_to_hass()
+        self._written_value = (self.available, self.aggregate_value)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the room aggregate or its availability changed."""
+        value = (self.available, self.aggregate_value)
+        if value == self._written_value:
+            return
+        self._written_value = value
+        self.async_write_ha_state()
+
+
+class GreenpointRoomCommandEntity(GreenpointRoomEntity):
+    """Base entity that switches a whole room with one scenario."""
+
+    aggregate_attribute = "any_on"
+
+    def __init__(self, coordinator, room_name: str, entity_type: str):
+        """Initialize the entity."""
+        super().__init__(coordinator, room_name, entity_type)
+        self._attr_name = f"{room_name} {ROOM_SCENARIO_PREFIX}"
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available and bool(self.room.switch_units)
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if any switch or light in the room is on."""
+        return self.aggregate_value
+
+    async def _async_run_room_scenario(self, state: str) -> None:
+        """Run the room's scenario and refresh its switches once."""
+        scenario_name = f"{self.room_name} {ROOM_SCENARIO_PREFIX} {state}"
+
+        try:
+            await self.coordinator.monitor.timed(
+                "command", self.coordinator.api.run_scenario(scenario_name)
+            )
+            # Poll every switch of the room first on a single refresh
+            for unit_id in self.room.switch_units:
+                self.coordinator.mark_unit_commanded(unit_id)
+            await self.coordinator.async_request_refresh()
+        except Exception as exception:
+            _LOGGER.error("Failed to run %s: %s", scenario_name, exception)
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn the whole room on."""
+        await self._async_run_room_scenario("On")
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn the whole room off."""
+        await self._async_run_room_scenario("Off")
 
 
 class GreenpointDeviceEntity(CoordinatorEntity):
-    """Base entity for Greenpoint devices."""
+    """Base entity for Greenpoint devices.
+
+    The unit's availability and status are resolved once per coordinator
+    update, so the properties read while writing state are attribute reads.
+    """
+
+    # Changes on every poll, so keep it out of the recorder
+    _unrecorded_attributes = frozenset({ATTR_LAST_UPDATED})
 
     def __init__(self, coordinator, device: GreenpointDevice, entity_type: str):
         """Initialize the entity."""
@@ -49,24 +161,65 @@ class GreenpointDeviceEntity(CoordinatorEntity):
         self.entity_type = entity_type
         self._attr_device_info = device.device_info
         self._attr_unique_id = f"{device.unit_id}_{entity_type}"
-        self._attr_name = f"{device.room_name} {device.name} {entity_type.capitalize()}"
+        self._attr_name = f"{device.full_name} {entity_type.capitalize()}"
+        self._unit_available = False
+        self._unit_status: Dict[str, Any] = {}
+        self._unit_updated: Optional[datetime] = None
+        self._last_updated: Optional[str] = None
+        self._refresh_unit_state()
+
+    def _refresh_unit_state(self) -> None:
+        """Resolve the unit's availability and status from the coordinator."""
+        unit_id = self.device.unit_id
+        coordinator = self.coordinator
+        # Cached status is served until it exceeds the max age, so a failed
+        # poll cycle does not mark the entity unavailable
+        self._unit_available = coordinator.is_unit_fresh(unit_id)
+        self._unit_status = (
+            coordinator.unit_status.get(unit_id, {}) if self._unit_available else {}
+        )
+        updated = coordinator.unit_updated.get(unit_id)
+        if updated != self._unit_updated:
+            self._unit_updated = updated
+            self._last_updated = updated.isoformat() if updated else None
+
+    async def async_added_to_hass(self) -> None:
+        """Resolve the unit state again when the entity is added."""
+        await super().async_added_to_hass()
+        self._refresh_unit_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Resolve the unit state once and write it."""
+        self._refresh_unit_state()
+        self.async_write_ha_state()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        if not self.coordinator.last_update_success:
-            return False
-            
-        # Check if we have status data for this device
-        if self.device.unit_id not in self.coordinator.data.get("status", {}):
-            return False
-            
-        return True
+        return self._unit_available
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return when the device status was last fetched."""
+        return {ATTR_LAST_UPDATED: self._last_updated}
+
+    async def _async_run_scenario(self, state: str) -> None:
+        """Run the device's '<name> On/Off' scenario and poll it first."""
+        scenario_name = f"{self.device.name} {state}"
+
+        try:
+            await self.coordinator.monitor.timed(
+                "command", self.coordinator.api.run_scenario(scenario_name)
+            )
+            # Schedule an immediate update of this unit
+            await self.coordinator.async_request_unit_refresh(self.device.unit_id)
+        except Exception as exception:
+            _LOGGER.error(
+                "Failed to turn %s %s: %s", state.lower(), self.name, exception
+            )
 
     @property
     def device_status(self) -> Dict[str, Any]:
-        """Return the device status."""
-        if not self.available:
-            return {}
-            
-        return self.coordinator.data["status"].get(self.device.unit_id, {})
+        """Return the device status, empty while unavailable."""
+        return self._unit_status
@@ -0,0 +1,41 @@
+"""Diagnostics support for Greenpoint IGH Compact."""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_TOKEN, DOMAIN
+from .coordinator import GreenpointDataUpdateCoordinator
+
+TO_REDACT = {CONF_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: GreenpointDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "poll_schedule": coordinator.get_poll_schedule(),
+        # In per-room mode this is the last full refresh; the rooms poll
+        # on their own and report their cycles below
+        "last_cycle": coordinator.last_cycle,
+        "latency": coordinator.api.get_latency_stats(),
+        "rate_limit": coordinator.api.limiter.as_dict(),
+        "loop_monitor": coordinator.monitor.as_dict(),
+        "room_coordinators": {
+            room_name: {
+                "last_update_success": room.last_update_success,
+                "last_cycle": room.last_cycle,
+            }
+            for room_name, room in coordinator.room_coordinators.items()
+        },
+    }
@@ -9,9 +9,14 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import ATTR_STATUS, DOMAIN
+from .const import ATTR_STATUS, CONF_ROOM_SWITCHES, DOMAIN, KIND_LIGHT
 from .coordinator import GreenpointDataUpdateCoordinator
-from .device import GreenpointDevice, GreenpointDeviceEntity
+from .device import (
+    GreenpointDevice,
+    GreenpointDeviceEntity,
+    GreenpointRoomCommandEntity,
+)
+from .pygreenpoint import unit_kinds
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,13 +32,26 @@ async def async_setup_entry(
 
     # Create light entities for each unit
     for unit_id, unit_data in coordinator.data["units"].items():
-        # Create a device object
-        device = GreenpointDevice(unit_id, unit_data)
+        # Get the device object shared with the other platforms
+        device = coordinator.get_device(unit_id)
 
         # Check if this is a light unit (name contains "Light")
-        # This is a simple heuristic and may need adjustment based on actual API behavior
-        if "Light" in device.name and ATTR_STATUS in coordinator.data["status"].get(unit_id, {}):
-            entities.append(GreenpointLight(coordinator, device))
+        status = coordinator.data["status"].get(unit_id, {})
+        if KIND_LIGHT in unit_kinds(unit_data, status):
+            entities.append(
+                GreenpointLight(coordinator.coordinator_for_unit(unit_id), device)
+            )
+
+    # Optionally add a light per room whose switchable units are all lights,
+    # running the room's All On / All Off scenarios
+    if entry.options.get(CONF_ROOM_SWITCHES, False):
+        for room in coordinator.rooms.rooms.values():
+            if room.switch_units and room.switch_units == room.light_units:
+                entities.append(
+                    GreenpointRoomLight(
+                        coordinator.coordinator_for_room(room.name), room.name
+                    )
+                )
 
     # Add all entities to Home Assistant
     async_add_entities(entities)
@@ -58,24 +76,16 @@ class GreenpointLight(GreenpointDeviceEntity, LightEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the light on."""
-        # Create a scenario name based on the device name and "On"
-        scenario_name = f"{self.device.name} On"
-        
-        try:
-            await self.coordinator.api.run_scenario(scenario_name)
-            # Schedule an immediate data update
-            await self.coordinator.async_request_refresh()
-        except Exception as exception:
-            _LOGGER.error("Failed to turn on %s: %s", self.name, exception)
+        await self._async_run_scenario("On")
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
-        # Create a scenario name based on the device name and "Off"
-        scenario_name = f"{self.device.name} Off"
-        
-        try:
-            await self.coordinator.api.run_scenario(scenario_name)
-            # Schedule an immediate data update
-            await self.coordinator.async_request_refresh()
-        except Exception as exception:
-            _LOGGER.error("Failed to turn off %s: %s", self.name, exception)
+        await self._async_run_scenario("Off")
+
+
+class GreenpointRoomLight(GreenpointRoomCommandEntity, LightEntity):
+    """Switches all lights in a room with one scenario."""
+
+    def __init__(self, coordinator: GreenpointDataUpdateCoordinator, room_name: str):
+        """Initialize the light."""
+        super().__init__(coordinator, room_name, "light")
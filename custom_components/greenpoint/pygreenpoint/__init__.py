@@ -0,0 +1,21 @@
+"""Home Assistant independent library for the Greenpoint IGH Compact controller.
+
+Everything in this package imports only relative modules and plain asyncio
+libraries, so it can run outside Home Assistant:
+
+    cd custom_components/greenpoint && python -m pygreenpoint --help
+"""
+from .api import CannotConnect, GreenpointApiClient, InvalidAuth, validate_input
+from .classify import unit_kinds
+from .poller import Poller
+from .transport import RawHttpTransport
+
+__all__ = [
+    "CannotConnect",
+    "GreenpointApiClient",
+    "InvalidAuth",
+    "Poller",
+    "RawHttpTransport",
+    "unit_kinds",
+    "validate_input",
+]
@@ -0,0 +1,247 @@
+"""Command line interface for polling an IGH Compact controller.
+
+    cd custom_components/greenpoint
+    python -m pygreenpoint --host 192.168.1.10 --token TOKEN topology
+    python -m pygreenpoint --fake poll --all --interval 0 --cycles 100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from .api import GreenpointApiClient
+from .classify import unit_kinds
+from .const import (
+    API_UNIT,
+    DEFAULT_CYCLE_DEADLINE,
+    DEFAULT_POLL_CONCURRENCY,
+    DEFAULT_PORT,
+    DEFAULT_RATE_LIMIT,
+    UPDATE_INTERVAL,
+)
+from .fake import FakeController
+from .looplag import LoopMonitor
+from .poller import Poller
+from .trace import LANE_CYCLE, Tracer, set_trace_lane
+from .transport import RawHttpTransport
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Return a percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _topology(poller: Poller) -> Dict[str, Any]:
+    """Return the rooms, units and device kinds of the controller."""
+    poller.mark_all_units_due()
+    await poller.async_poll()
+    rooms: Dict[str, List[Dict[str, Any]]] = {}
+    for room_name in poller.rooms.rooms:
+        rooms[room_name] = [
+            {
+                "id": unit_id,
+                "name": poller.units[unit_id].get("name"),
+                "kinds": sorted(
+                    unit_kinds(poller.units[unit_id], poller.unit_status.get(unit_id, {}))
+                ),
+                "status": poller.unit_status.get(unit_id),
+            }
+            for unit_id in poller.room_units(room_name)
+        ]
+    return rooms
+
+
+async def _poll(poller: Poller, args: argparse.Namespace) -> Dict[str, Any]:
+    """Poll continuously and return throughput statistics."""
+    tracer = poller.api.tracer
+    set_trace_lane(LANE_CYCLE, "poll cycle")
+    durations: List[float] = []
+    polled = changed = failed = 0
+    # Ctrl-C stops polling and still prints the statistics
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGINT, stop.set)
+    except (NotImplementedError, RuntimeError):
+        pass
+
+    start = time.monotonic()
+    try:
+        while not stop.is_set() and (not args.cycles or len(durations) < args.cycles):
+            cycle_start = time.monotonic()
+            if args.all:
+                poller.mark_all_units_due()
+            with tracer.span("poll cycle", "poll"):
+                cycle = await poller.async_poll()
+            durations.append(time.monotonic() - cycle_start)
+            if tracer.enabled:
+                await loop.run_in_executor(None, tracer.write, tracer.drain())
+            polled += cycle["due"] - cycle["carried_over"]
+            changed += cycle["changed"]
+            failed += cycle["failed"]
+            if not args.quiet:
+                print(
+                    f"cycle {len(durations)}: {cycle['due']} due, "
+                    f"{cycle['changed']} changed, {cycle['failed']} failed, "
+                    f"{cycle['carried_over']} carried over in {durations[-1]:.3f}s"
+                )
+            try:
+                await asyncio.wait_for(
+                    stop.wait(), max(0.0, args.interval - durations[-1])
+                )
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        try:
+            loop.remove_signal_handler(signal.SIGINT)
+        except (NotImplementedError, RuntimeError):
+            pass
+    elapsed = time.monotonic() - start
+
+    latency = poller.api.latency[API_UNIT]
+    return {
+        "cycles": len(durations),
+        "elapsed": round(elapsed, 3),
+        "requests": polled,
+        "requests_per_second": round(polled / elapsed, 1) if elapsed else None,
+        "changed": changed,
+        "unchanged_responses": poller.api.unchanged_responses,
+        "failed": failed,
+        "cycle_p50": round(_percentile(durations, 50), 4) if durations else None,
+        "cycle_p95": round(_percentile(durations, 95), 4) if durations else None,
+        "cycle_max": round(max(durations), 4) if durations else None,
+        "latency_p50": latency.percentile(50),
+        "latency_p95": latency.percentile(95),
+        "rate_limit": poller.api.limiter.as_dict(),
+        "loop_monitor": poller.monitor.as_dict() if poller.monitor.enabled else None,
+    }
+
+
+async def async_main(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run a command and return its result."""
+    fake: Optional[FakeController] = None
+    host, port, token = args.host, args.port, args.token
+    if args.fake:
+        fake = FakeController(args.rooms, args.units_per_room)
+        host, port, token = "127.0.0.1", await fake.start(), fake.token
+
+    transport = RawHttpTransport(host, port) if args.raw else None
+    try:
+        async with aiohttp.ClientSession() as session:
+            client = GreenpointApiClient(
+                host,
+                port,
+                token,
+                session,
+                transport=transport,
+                rate_limit=args.rate_limit,
+                tracer=Tracer(args.trace) if args.trace else None,
+            )
+            poller = Poller(
+                client,
+                update_interval=UPDATE_INTERVAL,
+                cycle_deadline=args.deadline,
+                poll_concurrency=args.concurrency,
+                monitor=LoopMonitor(args.loop_threshold),
+            )
+            poller.set_exclusions(args.exclude_room, args.exclude_unit)
+            if args.command == "topology":
+                return await _topology(poller)
+            return await _poll(poller, args)
+    finally:
+        if transport is not None:
+            transport.close()
+        if fake is not None:
+            await fake.stop()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m pygreenpoint",
+        description="Poll a Greenpoint IGH Compact controller outside Home Assistant.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--token", default="")
+    parser.add_argument(
+        "--fake", action="store_true", help="start a local fake controller and use it"
+    )
+    parser.add_argument("--rooms", type=int, default=10, help="fake controller rooms")
+    parser.add_argument(
+        "--units-per-room", type=int, default=10, help="fake controller units per room"
+    )
+    parser.add_argument(
+        "--raw", action="store_true", help="use the raw keep-alive transport"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=DEFAULT_RATE_LIMIT,
+        help="requests per second, 0 for no limit",
+    )
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_POLL_CONCURRENCY)
+    parser.add_argument(
+        "--deadline", type=float, default=DEFAULT_CYCLE_DEADLINE, help="cycle time budget"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="write a Chrome trace of poll cycles and requests",
+    )
+    parser.add_argument(
+        "--exclude-room",
+        action="append",
+        default=[],
+        metavar="ROOM",
+        help="do not poll the units of a room; can be repeated",
+    )
+    parser.add_argument(
+        "--exclude-unit",
+        action="append",
+        default=[],
+        metavar="UNIT_ID",
+        help="do not poll a unit; can be repeated",
+    )
+    parser.add_argument(
+        "--loop-threshold",
+        type=float,
+        metavar="SECONDS",
+        help="log poll work that blocks the event loop longer than this",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("topology", help="print rooms, units and device kinds as JSON")
+    poll = commands.add_parser("poll", help="poll continuously and print statistics")
+    poll.add_argument("--cycles", type=int, default=0, help="stop after this many cycles")
+    poll.add_argument(
+        "--interval", type=float, default=1.0, help="seconds between cycle starts"
+    )
+    poll.add_argument(
+        "--all", action="store_true", help="poll every unit each cycle"
+    )
+    poll.add_argument("--quiet", action="store_true", help="only print the summary")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line interface."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    result = asyncio.run(async_main(args))
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
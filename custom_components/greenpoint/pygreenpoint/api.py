@@ -0,0 +1,340 @@
+"""API client for Greenpoint IGH Compact."""
+import asyncio
+from collections import deque
+import json
+import logging
+import time
+from urllib.parse import quote
+import aiohttp
+import async_timeout
+from typing import Deque, Dict, List, Any, Optional, Tuple
+from yarl import URL
+
+from .const import (
+    API_HOME,
+    API_SCENARIO,
+    API_UNIT,
+    ATTR_ROOMS,
+    ATTR_UNITS,
+    ATTR_NAME,
+    ATTR_FULL_ID,
+    DEFAULT_TIMEOUT_FLOOR,
+    DEFAULT_TIMEOUT_CEILING,
+)
+from .ratelimit import TokenBucket, shared_limiter
+from .trace import Tracer
+from .transport import HttpProtocolError, RawHttpTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+# Latency samples kept per endpoint, and how many are needed before the
+# timeout adapts (until then the ceiling is used)
+LATENCY_SAMPLES = 100
+LATENCY_MIN_SAMPLES = 10
+
+# Timeout = this percentile of recent latencies times the safety factor
+TIMEOUT_PERCENTILE = 95
+TIMEOUT_SAFETY_FACTOR = 3
+
+class CannotConnect(Exception):
+    """Error to indicate we cannot connect."""
+
+class InvalidAuth(Exception):
+    """Error to indicate there is invalid auth."""
+
+class LatencyTracker:
+    """Track recent request latencies of one endpoint."""
+
+    def __init__(self, size: int = LATENCY_SAMPLES) -> None:
+        """Initialize the tracker."""
+        self.samples: Deque[float] = deque(maxlen=size)
+        self._sorted: Optional[List[float]] = None
+
+    def add(self, latency: float) -> None:
+        """Record a request latency in seconds."""
+        self.samples.append(latency)
+        self._sorted = None
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Return a latency percentile, or None without enough samples."""
+        if len(self.samples) < LATENCY_MIN_SAMPLES:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self.samples)
+        index = min(len(self._sorted) - 1, int(len(self._sorted) * pct / 100))
+        return self._sorted[index]
+
+    def timeout(self, floor: float, ceiling: float) -> float:
+        """Return the request timeout derived from recent latencies."""
+        latency = self.percentile(TIMEOUT_PERCENTILE)
+        if latency is None:
+            return ceiling
+        return max(floor, min(ceiling, latency * TIMEOUT_SAFETY_FACTOR))
+
+
+class GreenpointApiClient:
+    """API client for Greenpoint IGH Compact."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        token: str,
+        session: aiohttp.ClientSession,
+        timeout_floor: float = DEFAULT_TIMEOUT_FLOOR,
+        timeout_ceiling: float = DEFAULT_TIMEOUT_CEILING,
+        transport: Optional[RawHttpTransport] = None,
+        rate_limit: Optional[float] = None,
+        tracer: Optional[Tracer] = None,
+    ):
+        """Initialize the API client."""
+        self.host = host
+        self.port = port
+        self.session = session
+        # Optional keep-alive transport used instead of the aiohttp session
+        self.transport = transport
+        # Every client of a controller shares its limiter; None keeps the
+        # current rate so setup checks do not reset a configured limit
+        self.limiter: TokenBucket = shared_limiter(host, port, rate_limit)
+        # Records request spans when tracing is enabled
+        self.tracer = tracer if tracer is not None else Tracer()
+        self.base_url = f"http://{host}:{port}"
+        # Request targets are built and encoded once; aiohttp skips parsing
+        # and requoting for URL objects built with encoded=True
+        self._home_url: Optional[URL] = None
+        self._unit_urls: Dict[str, URL] = {}
+        self._scenario_urls: Dict[str, URL] = {}
+        # Last response body and decoded status of each unit
+        self._unit_bodies: Dict[str, Tuple[bytes, Dict[str, Any]]] = {}
+        self.token = token
+        self.set_timeouts(timeout_floor, timeout_ceiling)
+        self.latency: Dict[str, LatencyTracker] = {
+            API_HOME: LatencyTracker(),
+            API_UNIT: LatencyTracker(),
+            API_SCENARIO: LatencyTracker(),
+        }
+        # Cumulative time spent waiting on HTTP and decoding JSON
+        self.http_time = 0.0
+        self.decode_time = 0.0
+        # Unit responses identical to the previous one, which are not decoded
+        self.unchanged_responses = 0
+
+    @property
+    def token(self) -> str:
+        """Return the API token."""
+        return self._token
+
+    @token.setter
+    def token(self, token: str) -> None:
+        """Set the API token and rebuild the request targets."""
+        self._token = token
+        self._token_query = f"token={quote(token, safe='')}"
+        self._home_url = self._build_url(API_HOME, self._token_query)
+        self._unit_urls.clear()
+        self._scenario_urls.clear()
+
+    def set_timeouts(self, timeout_floor: float, timeout_ceiling: float) -> None:
+        """Set the bounds of the adaptive request timeouts."""
+        self.timeout_floor = min(timeout_floor, timeout_ceiling)
+        self.timeout_ceiling = timeout_ceiling
+
+    def _build_url(self, path: str, query: str) -> URL:
+        """Build a pre-encoded request URL."""
+        return URL.build(
+            scheme="http",
+            host=self.host,
+            port=self.port,
+            path=path,
+            query_string=query,
+            encoded=True,
+        )
+
+    def _unit_url(self, full_id: str) -> URL:
+        """Return the status URL of a unit."""
+        url = self._unit_urls.get(full_id)
+        if url is None:
+            url = self._unit_urls[full_id] = self._build_url(
+                f"{API_UNIT}/{quote(full_id, safe='')}", self._token_query
+            )
+        return url
+
+    def _scenario_url(self, scene_name: str) -> URL:
+        """Return the URL that runs a scenario."""
+        url = self._scenario_urls.get(scene_name)
+        if url is None:
+            url = self._scenario_urls[scene_name] = self._build_url(
+                API_SCENARIO,
+                f"name={quote(scene_name, safe='')}&{self._token_query}",
+            )
+        return url
+
+    async def test_connection(self) -> bool:
+        """Test connectivity to the API."""
+        try:
+            await self.get_home_data()
+            return True
+        except Exception as exception:
+            _LOGGER.error("Connection test failed: %s", exception)
+            return False
+
+    async def get_home_data(self) -> Dict[str, Any]:
+        """Get home data from the API."""
+        return await self._api_request(self._home_url, API_HOME)
+
+    async def get_unit_status(self, full_id: str) -> Dict[str, Any]:
+        """Get unit status from the API.
+
+        When the response body is identical to the previous one for the
+        unit, the previously returned dict itself is returned without
+        decoding, so callers can detect an unchanged status with `is`. The
+        returned dict must not be modified.
+        """
+        return await self._api_request(
+            self._unit_url(full_id), API_UNIT, cache_key=full_id
+        )
+
+    async def run_scenario(self, scene_name: str) -> Dict[str, Any]:
+        """Run a scenario by name."""
+        return await self._api_request(
+            self._scenario_url(scene_name), API_SCENARIO, priority=True
+        )
+
+    async def get_all_units(self) -> List[Dict[str, Any]]:
+        """Get all units from all rooms."""
+        home_data = await self.get_home_data()
+        units = []
+
+        if ATTR_ROOMS not in home_data:
+            _LOGGER.error("No rooms found in home data")
+            return units
+
+        for room in home_data[ATTR_ROOMS]:
+            if ATTR_UNITS in room:
+                for unit in room[ATTR_UNITS]:
+                    # Add room name to unit data for reference
+                    unit["room_name"] = room.get(ATTR_NAME, "Unknown Room")
+                    units.append(unit)
+
+        # Rebuild the unit URLs for the current topology
+        self._unit_urls.clear()
+        self._unit_bodies.clear()
+        for unit in units:
+            if ATTR_FULL_ID in unit:
+                self._unit_url(unit[ATTR_FULL_ID])
+
+        return units
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return latency percentiles and current timeout per endpoint."""
+        return {
+            path: {
+                "samples": len(tracker.samples),
+                "p50": tracker.percentile(50),
+                "p95": tracker.percentile(TIMEOUT_PERCENTILE),
+                "timeout": tracker.timeout(self.timeout_floor, self.timeout_ceiling),
+            }
+            for path, tracker in self.latency.items()
+        }
+
+    async def _api_request(
+        self,
+        url: URL,
+        path: str,
+        priority: bool = False,
+        cache_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Make a request to the API.
+
+        With a cache key, a body identical to the last one under that key
+        returns the last decoded data instead of decoding it again.
+        """
+        tracer = self.tracer
+        with tracer.span(path, "api") as span:
+            # Waiting for the limiter is not part of the request latency
+            with tracer.span("rate limit", "api"):
+                await self.limiter.acquire(priority)
+
+            tracker = self.latency[path]
+            timeout = tracker.timeout(self.timeout_floor, self.timeout_ceiling)
+            start = time.monotonic()
+
+            try:
+                with tracer.span("http", "api"):
+                    async with async_timeout.timeout(timeout):
+                        if self.transport is not None:
+                            status, body = await self.transport.get(url.raw_path_qs)
+                            span.args["status"] = status
+                            if status == 401:
+                                raise InvalidAuth("Invalid authentication")
+                            if status >= 400:
+                                raise CannotConnect(f"Unexpected response status {status}")
+                        else:
+                            response = await self.session.get(url)
+                            span.args["status"] = response.status
+
+                            if response.status == 401:
+                                raise InvalidAuth("Invalid authentication")
+
+                            response.raise_for_status()
+                            # Decode straight from bytes, skipping the text round trip
+                            body = await response.read()
+            except asyncio.TimeoutError:
+                # Count the timeout as a sample so a slowing controller raises it
+                tracker.add(timeout)
+                _LOGGER.error("Timeout after %.1fs requesting %s", timeout, path)
+                raise
+            except aiohttp.ClientResponseError as exception:
+                _LOGGER.error("Error fetching data: %s", exception)
+                raise
+            except aiohttp.ClientError as exception:
+                _LOGGER.error("Error connecting to API: %s", exception)
+                raise CannotConnect() from exception
+            except (OSError, HttpProtocolError) as exception:
+                # Raised by the raw transport
+                _LOGGER.error("Error connecting to API: %s", exception)
+                raise CannotConnect() from exception
+
+            span.args["bytes"] = len(body)
+            decode_start = time.monotonic()
+            tracker.add(decode_start - start)
+            self.http_time += decode_start - start
+
+            if cache_key is not None:
+                cached = self._unit_bodies.get(cache_key)
+                # Comparing bytes is exact and cheaper than hashing them
+                if cached is not None and cached[0] == body:
+                    span.args["unchanged"] = True
+                    self.unchanged_responses += 1
+                    return cached[1]
+
+            with tracer.span("decode", "api"):
+                data = json.loads(body)
+            self.decode_time += time.monotonic() - decode_start
+            if cache_key is not None:
+                self._unit_bodies[cache_key] = (body, data)
+            return data
+
+async def validate_input(host: str, port: int, token: str) -> Dict[str, Any]:
+    """Validate the user input allows us to connect."""
+    async with aiohttp.ClientSession() as session:
+        client = GreenpointApiClient(host, port, token, session)
+        
+        try:
+            home_data = await client.get_home_data()
+            
+            # Check if we got valid data
+            if ATTR_ROOMS not in home_data:
+                raise CannotConnect("Invalid response from API")
+                
+            # Return info that you want to store in the config entry.
+            return {"title": f"IGH Compact ({host})"}
+            
+        except CannotConnect as exception:
+            _LOGGER.error("Cannot connect to IGH Compact: %s", exception)
+            raise
+        except InvalidAuth as exception:
+            _LOGGER.error("Invalid authentication: %s", exception)
+            raise
+        except Exception as exception:
+            _LOGGER.error("Unexpected exception: %s", exception)
+            raise
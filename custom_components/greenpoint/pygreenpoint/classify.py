@@ -0,0 +1,30 @@
+"""Device classification for Greenpoint IGH Compact units."""
+from __future__ import annotations
+
+from typing import Any, Dict, FrozenSet
+
+from .const import (
+    ATTR_NAME,
+    ATTR_SPAN_SECOND,
+    ATTR_STATUS,
+    ATTR_TEMP,
+    KIND_LIGHT,
+    KIND_MOTION,
+    KIND_SWITCH,
+    KIND_TEMPERATURE,
+)
+
+
+def unit_kinds(unit: Dict[str, Any], status: Dict[str, Any]) -> FrozenSet[str]:
+    """Return the kinds of device a unit is exposed as, based on its status."""
+    kinds = set()
+    if ATTR_TEMP in status:
+        kinds.add(KIND_TEMPERATURE)
+    if ATTR_SPAN_SECOND in status:
+        kinds.add(KIND_MOTION)
+    if ATTR_STATUS in status:
+        kinds.add(KIND_SWITCH)
+        # A simple heuristic: controllable units named like lights
+        if "Light" in unit.get(ATTR_NAME, "Unknown"):
+            kinds.add(KIND_LIGHT)
+    return frozenset(kinds)
@@ -0,0 +1,57 @@
+"""Constants for the Greenpoint IGH Compact library."""
+
+# Defaults
+DEFAULT_PORT = 20500
+
+# API Endpoints
+API_HOME = "/home"
+API_SCENARIO = "/scenario"
+API_UNIT = "/unit"
+
+# Data attributes
+ATTR_ROOMS = "rooms"
+ATTR_UNITS = "units"
+ATTR_NAME = "name"
+ATTR_FULL_ID = "fullId"
+ATTR_TEMP = "temp"
+ATTR_SPAN_SECOND = "span_second"
+ATTR_MODE = "mode"
+ATTR_STATUS = "status"
+ATTR_ROOM_NAME = "room_name"
+
+# Kinds of device a unit is exposed as
+KIND_TEMPERATURE = "temperature"
+KIND_MOTION = "motion"
+KIND_SWITCH = "switch"
+KIND_LIGHT = "light"
+
+# Room-wide scenarios are named "<room> All On" and "<room> All Off"
+ROOM_SCENARIO_PREFIX = "All"
+
+# Update interval
+UPDATE_INTERVAL = 30  # seconds
+
+# Bounds for the adaptive per-unit poll interval
+DEFAULT_MIN_UNIT_INTERVAL = 10  # seconds
+DEFAULT_MAX_UNIT_INTERVAL = 300  # seconds
+
+# Time budget for a single poll cycle and number of parallel unit requests
+DEFAULT_CYCLE_DEADLINE = 8  # seconds
+DEFAULT_POLL_CONCURRENCY = 1
+
+# Bounds for the adaptive per-request timeout
+DEFAULT_TIMEOUT_FLOOR = 1.0  # seconds
+DEFAULT_TIMEOUT_CEILING = 10.0  # seconds
+
+# Requests per second sent to one controller across polls, commands and
+# setup checks (0, the default, disables the limit)
+DEFAULT_RATE_LIMIT = 0.0
+
+# Unit status older than this is no longer served
+DEFAULT_STATUS_MAX_AGE = 600  # seconds
+
+# A motion sensor reports motion while span_second is below this
+MOTION_SPAN_THRESHOLD = 30  # seconds
+
+# Units commanded within this window are polled before all others
+RECENT_COMMAND_WINDOW = 60  # seconds
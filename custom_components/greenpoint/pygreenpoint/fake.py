@@ -0,0 +1,219 @@
+"""A fake IGH Compact controller for tests, benchmarks and the CLI.
+
+Serves a generated topology on the controller's endpoints over a minimal
+asyncio HTTP/1.1 server. It keeps connections alive and answers pipelined
+requests in order, like the real controller's web server.
+
+For soak tests it can inject faults into its responses (latency spikes,
+401s, dropped connections and malformed JSON), reboot, and drift the unit
+statuses so every cycle has changes to deliver.
+
+    cd custom_components/greenpoint
+    python -m pygreenpoint.fake [port] [rooms] [units_per_room]
+"""
+import asyncio
+import json
+import random
+import sys
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+TOKEN = "fake-token"
+
+# Kinds of injected faults
+FAULT_DROP = "drop"
+FAULT_UNAUTHORIZED = "unauthorized"
+FAULT_MALFORMED = "malformed"
+FAULT_LATENCY = "latency"
+
+
+class Faults:
+    """Per-request probabilities of injected faults."""
+
+    def __init__(
+        self,
+        drop: float = 0.0,
+        unauthorized: float = 0.0,
+        malformed: float = 0.0,
+        latency: float = 0.0,
+        spike: float = 1.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Initialize the faults; spike is the added latency in seconds."""
+        self.probabilities = [
+            (FAULT_DROP, drop),
+            (FAULT_UNAUTHORIZED, unauthorized),
+            (FAULT_MALFORMED, malformed),
+            (FAULT_LATENCY, latency),
+        ]
+        self.spike = spike
+        self._random = random.Random(seed)
+
+    def pick(self) -> Optional[str]:
+        """Return the fault to inject into the next response, if any."""
+        draw = self._random.random()
+        for fault, probability in self.probabilities:
+            if draw < probability:
+                return fault
+            draw -= probability
+        return None
+
+
+class FakeController:
+    """Serve a generated topology and unit statuses."""
+
+    def __init__(
+        self,
+        rooms: int = 10,
+        units_per_room: int = 10,
+        token: str = TOKEN,
+        faults: Optional[Faults] = None,
+        seed: Optional[int] = None,
+    ):
+        """Initialize the fake controller."""
+        self.token = token
+        self.faults = faults
+        self.requests = 0
+        self.injected: Dict[str, int] = {}
+        self.reboots = 0
+        self._random = random.Random(seed)
+        self.topology: List[Dict[str, Any]] = []
+        self.status: Dict[str, Dict[str, Any]] = {}
+        for room in range(rooms):
+            units = []
+            for unit in range(units_per_room):
+                full_id = f"1-{room}-{unit}"
+                kind = unit % 3
+                if kind == 0:
+                    units.append({"name": f"Temp {room}-{unit}", "fullId": full_id})
+                    self.status[full_id] = {"temp": 21.5, "mode": 0}
+                elif kind == 1:
+                    units.append({"name": f"Light {room}-{unit}", "fullId": full_id})
+                    self.status[full_id] = {"status": 1, "mode": 0}
+                else:
+                    units.append({"name": f"Motion {room}-{unit}", "fullId": full_id})
+                    self.status[full_id] = {"span_second": 120}
+            self.topology.append({"name": f"Room {room}", "units": units})
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._address: Tuple[str, int] = ("127.0.0.1", 0)
+
+    @property
+    def unit_ids(self) -> List[str]:
+        """Return the ids of all units."""
+        return list(self.status)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start serving and return the bound port."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        port = self._server.sockets[0].getsockname()[1]
+        self._address = (host, port)
+        return port
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.close()
+            for task in self._connections:
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def reboot(self, downtime: float) -> None:
+        """Drop every connection and stop answering for downtime seconds."""
+        self.reboots += 1
+        await self.stop()
+        await asyncio.sleep(downtime)
+        await self.start(*self._address)
+
+    def drift(self, fraction: float) -> None:
+        """Change the status of a random fraction of the units."""
+        count = round(len(self.status) * fraction)
+        for full_id in self._random.sample(self.unit_ids, count):
+            status = self.status[full_id]
+            if "temp" in status:
+                step = self._random.choice((-0.5, 0.5))
+                status["temp"] = round(status["temp"] + step, 1)
+            elif "status" in status:
+                status["status"] = 1 - status["status"]
+            else:
+                status["span_second"] = self._random.randint(0, 600)
+
+    def respond(self, target: str) -> Tuple[int, Any]:
+        """Return the status and JSON document for a request target."""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        if query.get("token") != [self.token]:
+            return 401, {"error": "unauthorized"}
+        if url.path == "/home":
+            return 200, {"rooms": self.topology}
+        if url.path.startswith("/unit/"):
+            status = self.status.get(unquote(url.path[len("/unit/"):]))
+            if status is None:
+                return 404, {"error": "unknown unit"}
+            return 200, status
+        if url.path == "/scenario":
+            return 200, {"success": True}
+        return 404, {"error": "not found"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer requests on one connection until the client closes it."""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                _, target, _ = lines[0].split(" ", 2)
+                close = any(line.lower() == "connection: close" for line in lines[1:])
+
+                self.requests += 1
+                fault = self.faults.pick() if self.faults is not None else None
+                if fault is not None:
+                    self.injected[fault] = self.injected.get(fault, 0) + 1
+                if fault == FAULT_DROP:
+                    # Close the connection without answering
+                    break
+                if fault == FAULT_LATENCY:
+                    await asyncio.sleep(self.faults.spike)
+
+                if fault == FAULT_UNAUTHORIZED:
+                    status, document = 401, {"error": "unauthorized"}
+                else:
+                    status, document = self.respond(target)
+                body = json.dumps(document).encode()
+                if fault == FAULT_MALFORMED:
+                    body = body[: len(body) // 2]
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+                if close:
+                    break
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+
+async def main(port: int, rooms: int, units_per_room: int) -> None:
+    """Serve until interrupted."""
+    controller = FakeController(rooms, units_per_room)
+    port = await controller.start("0.0.0.0", port)
+    print(f"Fake controller on port {port}, token {controller.token}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    defaults = [20500, 10, 10]
+    asyncio.run(main(*(args + defaults[len(args):])))
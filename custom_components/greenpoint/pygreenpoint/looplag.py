@@ -0,0 +1,133 @@
+"""Event loop blocking detection for Greenpoint IGH Compact.
+
+A coroutine runs on the event loop in synchronous slices, from one await
+that suspends it to the next. The loop can run nothing else during a slice,
+so the slice durations of the integration's own coroutines and callbacks
+are exactly the loop lag it causes. Timing them attributes blocking to the
+integration without counting the work of other tasks that happen to run
+while it waits.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+import logging
+import time
+from typing import Any, Awaitable, Dict, Generator, Iterator, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SectionStats:
+    """Slice durations of one kind of integration work."""
+
+    __slots__ = ("slices", "blocked", "total", "worst")
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.slices = 0
+        self.blocked = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            "slices": self.slices,
+            "blocked": self.blocked,
+            "total": round(self.total, 4),
+            "worst": round(self.worst, 4),
+        }
+
+
+class _TimedAwaitable:
+    """Await a coroutine, timing each synchronous slice it runs."""
+
+    __slots__ = ("_monitor", "_section", "_awaitable")
+
+    def __init__(self, monitor: LoopMonitor, section: str, awaitable: Awaitable) -> None:
+        """Initialize the wrapper."""
+        self._monitor = monitor
+        self._section = section
+        self._awaitable = awaitable
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        """Drive the wrapped coroutine one slice at a time."""
+        steps = self._awaitable.__await__()
+        value: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            start = time.perf_counter()
+            try:
+                if error is None:
+                    yielded = steps.send(value)
+                else:
+                    yielded = steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self._monitor.record(self._section, time.perf_counter() - start)
+
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                steps.close()
+                raise
+            except BaseException as exception:  # pylint: disable=broad-except
+                # Cancellation and other errors are delivered to the coroutine
+                value, error = None, exception
+
+
+class LoopMonitor:
+    """Count the slices of integration work that blocked the event loop."""
+
+    def __init__(self, threshold: Optional[float] = None) -> None:
+        """Initialize the monitor; without a threshold nothing is timed."""
+        self.sections: Dict[str, SectionStats] = {}
+        self.set_threshold(threshold)
+
+    def set_threshold(self, threshold: Optional[float]) -> None:
+        """Change the threshold; None stops timing new work."""
+        self.threshold = threshold
+        self.enabled = threshold is not None
+
+    def timed(self, section: str, awaitable: Awaitable) -> Awaitable:
+        """Return an awaitable that times the slices of awaitable."""
+        if not self.enabled:
+            return awaitable
+        return _TimedAwaitable(self, section, awaitable)
+
+    @contextmanager
+    def block(self, section: str) -> Iterator[None]:
+        """Time a block of synchronous code as one slice."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(section, time.perf_counter() - start)
+
+    def record(self, section: str, duration: float) -> None:
+        """Record one slice of integration work."""
+        stats = self.sections.get(section)
+        if stats is None:
+            stats = self.sections[section] = SectionStats()
+        stats.slices += 1
+        stats.total += duration
+        if duration > stats.worst:
+            stats.worst = duration
+        if self.threshold is not None and duration > self.threshold:
+            stats.blocked += 1
+            _LOGGER.warning(
+                "Greenpoint %s blocked the event loop for %.3fs", section, duration
+            )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the statistics of every section for diagnostics."""
+        return {
+            "threshold": self.threshold,
+            "sections": {
+                section: stats.as_dict() for section, stats in self.sections.items()
+            },
+        }
@@ -0,0 +1,382 @@
+"""Adaptive unit polling for Greenpoint IGH Compact."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta, timezone
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import async_timeout
+
+from .api import GreenpointApiClient
+from .const import (
+    ATTR_FULL_ID,
+    ATTR_NAME,
+    ATTR_ROOM_NAME,
+    ATTR_STATUS,
+    DEFAULT_CYCLE_DEADLINE,
+    DEFAULT_MAX_UNIT_INTERVAL,
+    DEFAULT_MIN_UNIT_INTERVAL,
+    DEFAULT_POLL_CONCURRENCY,
+    DEFAULT_STATUS_MAX_AGE,
+    RECENT_COMMAND_WINDOW,
+    ROOM_SCENARIO_PREFIX,
+    UPDATE_INTERVAL,
+)
+from .looplag import LoopMonitor
+from .rooms import RoomAggregator
+from .scheduler import UnitPollState
+from .trace import set_worker_lane
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Poller:
+    """Keep unit statuses current by polling the units that are due."""
+
+    def __init__(
+        self,
+        client: GreenpointApiClient,
+        update_interval: int = UPDATE_INTERVAL,
+        min_unit_interval: int = DEFAULT_MIN_UNIT_INTERVAL,
+        max_unit_interval: int = DEFAULT_MAX_UNIT_INTERVAL,
+        cycle_deadline: float = DEFAULT_CYCLE_DEADLINE,
+        poll_concurrency: int = DEFAULT_POLL_CONCURRENCY,
+        status_max_age: int = DEFAULT_STATUS_MAX_AGE,
+        monitor: Optional[LoopMonitor] = None,
+    ) -> None:
+        """Initialize the poller."""
+        self.api = client
+        # Times the poll work done on the event loop when enabled
+        self.monitor = monitor if monitor is not None else LoopMonitor()
+        # Every unit the controller reports, and the ones that are polled
+        self.all_units: Dict[str, Dict[str, Any]] = {}
+        self.units: Dict[str, Dict[str, Any]] = {}
+        # Set once the topology is loaded, even if every unit is excluded
+        self.units_loaded = False
+        self.excluded_rooms: Set[str] = set()
+        self.excluded_units: Set[str] = set()
+        self.unit_status: Dict[str, Dict[str, Any]] = {}
+        self.unit_updated: Dict[str, datetime] = {}
+        self.unit_schedule: Dict[str, UnitPollState] = {}
+        self.unit_commanded: Dict[str, float] = {}
+        self.rooms = RoomAggregator()
+        # Units whose status went stale and was taken out of the room aggregates
+        self.stale_units: Set[str] = set()
+        self.last_cycle: Dict[str, Any] = {}
+        self.configure(
+            update_interval,
+            min_unit_interval,
+            max_unit_interval,
+            cycle_deadline,
+            poll_concurrency,
+            status_max_age,
+        )
+
+    def configure(
+        self,
+        update_interval: int = UPDATE_INTERVAL,
+        min_unit_interval: int = DEFAULT_MIN_UNIT_INTERVAL,
+        max_unit_interval: int = DEFAULT_MAX_UNIT_INTERVAL,
+        cycle_deadline: float = DEFAULT_CYCLE_DEADLINE,
+        poll_concurrency: int = DEFAULT_POLL_CONCURRENCY,
+        status_max_age: int = DEFAULT_STATUS_MAX_AGE,
+    ) -> None:
+        """Apply polling settings, keeping what was learned about each unit."""
+        self.scan_interval = update_interval
+        self.status_max_age = status_max_age
+        # Poll every unit at least twice within the max age so a single
+        # failed poll does not make it stale
+        self.max_unit_interval = min(max_unit_interval, status_max_age / 2)
+        self.min_unit_interval = min(min_unit_interval, self.max_unit_interval)
+        self.poll_concurrency = max(1, poll_concurrency)
+
+        # Tick often enough to serve the busiest units; quiet units are
+        # skipped until their own interval has elapsed
+        self.tick = min(update_interval, self.min_unit_interval)
+        # A cycle must finish before the next one is due
+        self.cycle_deadline = min(cycle_deadline, self.tick)
+
+        for schedule in self.unit_schedule.values():
+            schedule.set_bounds(self.min_unit_interval, self.max_unit_interval)
+
+    async def async_load_units(self) -> None:
+        """Fetch the unit topology from the controller."""
+        self.all_units = {
+            unit[ATTR_FULL_ID]: unit for unit in await self.api.get_all_units()
+        }
+        self.units_loaded = True
+        self._apply_exclusions()
+
+    def set_exclusions(self, rooms: Iterable[str], units: Iterable[str]) -> None:
+        """Stop polling excluded units and every unit of excluded rooms."""
+        self.excluded_rooms = set(rooms)
+        self.excluded_units = set(units)
+        if self.all_units:
+            self._apply_exclusions()
+
+    def is_unit_excluded(self, unit_id: str) -> bool:
+        """Return True if a unit is excluded, directly or by its room."""
+        if unit_id in self.excluded_units:
+            return True
+        unit = self.all_units.get(unit_id, {})
+        return unit.get(ATTR_ROOM_NAME, "Unknown Room") in self.excluded_rooms
+
+    def _apply_exclusions(self) -> None:
+        """Select the units to poll and drop the state of excluded ones."""
+        self.units = {
+            unit_id: unit
+            for unit_id, unit in self.all_units.items()
+            if not self.is_unit_excluded(unit_id)
+        }
+        for state in (
+            self.unit_status,
+            self.unit_updated,
+            self.unit_schedule,
+            self.unit_commanded,
+        ):
+            for unit_id in [unit_id for unit_id in state if unit_id not in self.units]:
+                del state[unit_id]
+        self.stale_units &= set(self.units)
+
+        # Rebuild the room aggregates from the statuses already known
+        self.rooms.set_topology(self.units)
+        for unit_id, status in self.unit_status.items():
+            if unit_id in self.stale_units:
+                self.rooms.remove_unit(unit_id, None)
+            else:
+                self.rooms.update_unit(unit_id, None, status)
+
+    def _get_schedule(self, unit_id: str, now: float) -> UnitPollState:
+        """Return the poll state for a unit, creating it if needed."""
+        schedule = self.unit_schedule.get(unit_id)
+        if schedule is None:
+            schedule = self.unit_schedule[unit_id] = UnitPollState(
+                self.scan_interval,
+                self.min_unit_interval,
+                self.max_unit_interval,
+                now,
+            )
+        return schedule
+
+    def mark_unit_commanded(self, unit_id: str) -> None:
+        """Poll a commanded unit first on the next cycle."""
+        now = time.monotonic()
+        self._get_schedule(unit_id, now).mark_due(now)
+        self.unit_commanded[unit_id] = now
+
+    def mark_all_units_due(self) -> None:
+        """Poll every unit on the next cycle."""
+        now = time.monotonic()
+        for unit_id in self.units:
+            self._get_schedule(unit_id, now).mark_due(now)
+
+    def get_scenario_units(self, scenario: str) -> List[str]:
+        """Return the units controlled by a '<unit name> On/Off' scenario.
+
+        Room-wide '<room> All On/Off' scenarios control the switches and
+        lights of the room.
+        """
+        name = scenario.rsplit(" ", 1)[0]
+        unit_ids = [
+            unit_id
+            for unit_id, unit in self.units.items()
+            if unit.get(ATTR_NAME) == name
+        ]
+        room_name, _, prefix = name.rpartition(" ")
+        if not unit_ids and prefix == ROOM_SCENARIO_PREFIX:
+            room = self.rooms.rooms.get(room_name)
+            if room is not None:
+                unit_ids = sorted(room.switch_units)
+        return unit_ids
+
+    def room_units(self, room_name: str) -> List[str]:
+        """Return the units in a room."""
+        return [
+            unit_id
+            for unit_id, unit in self.units.items()
+            if unit.get(ATTR_ROOM_NAME, "Unknown Room") == room_name
+        ]
+
+    def unit_age(self, unit_id: str) -> Optional[float]:
+        """Return the age of a unit's status in seconds."""
+        updated = self.unit_updated.get(unit_id)
+        if updated is None:
+            return None
+        return (datetime.now(timezone.utc) - updated).total_seconds()
+
+    def is_unit_fresh(self, unit_id: str) -> bool:
+        """Return True if a unit's status is young enough to be served."""
+        age = self.unit_age(unit_id)
+        return age is not None and age <= self.status_max_age
+
+    def get_poll_schedule(self) -> Dict[str, Dict[str, Any]]:
+        """Return the current poll interval of every unit."""
+        now = time.monotonic()
+        return {
+            unit_id: schedule.as_dict(now)
+            for unit_id, schedule in self.unit_schedule.items()
+        }
+
+    def _poll_priority(self, unit_id: str, now: float) -> tuple:
+        """Return the sort key that orders due units within a cycle."""
+        commanded = now - self.unit_commanded.get(unit_id, -RECENT_COMMAND_WINDOW)
+        # Controllable units are the ones users look at and act on
+        user_facing = ATTR_STATUS in self.unit_status.get(unit_id, {})
+        last_poll = self.unit_schedule[unit_id].last_poll
+        return (
+            commanded >= RECENT_COMMAND_WINDOW,
+            not user_facing,
+            -1.0 if last_poll is None else last_poll,
+        )
+
+    def _record_status(self, unit_id: str, status: Dict[str, Any]) -> bool:
+        """Store a freshly polled unit status, returning True if it changed."""
+        previous = self.unit_status.get(unit_id)
+        self.unit_updated[unit_id] = datetime.now(timezone.utc)
+        if unit_id in self.stale_units:
+            # Put a unit that went stale back into its room
+            self.stale_units.discard(unit_id)
+            self.rooms.update_unit(unit_id, None, status)
+            previous_in_rooms = status
+        else:
+            previous_in_rooms = previous
+        if status is previous:
+            # The client hands back the same dict for an unchanged response
+            self.unit_schedule[unit_id].record_poll(False, time.monotonic())
+            return False
+        self.unit_status[unit_id] = status
+
+        changed = previous != status
+        if previous_in_rooms != status:
+            # Room aggregates only do work for units that changed
+            self.rooms.update_unit(unit_id, previous_in_rooms, status)
+        self.unit_schedule[unit_id].record_poll(
+            previous is not None and changed, time.monotonic()
+        )
+        return changed
+
+    def _expire_stale_units(self) -> int:
+        """Take units whose status exceeded the max age out of their rooms.
+
+        A dead sensor would otherwise keep its last reading in the room
+        aggregates forever. Returns the number of units that went stale.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.status_max_age)
+        expired = 0
+        for unit_id, updated in self.unit_updated.items():
+            if updated < cutoff and unit_id not in self.stale_units:
+                self.stale_units.add(unit_id)
+                self.rooms.remove_unit(unit_id, self.unit_status.get(unit_id))
+                expired += 1
+        return expired
+
+    async def _async_poll_units(
+        self, unit_ids: List[str], deadline: Optional[float]
+    ) -> Tuple[List[str], int, int]:
+        """Poll units in order until the deadline, if there is one.
+
+        Returns the units left over, the number of failed polls and the
+        number of units whose status changed.
+        """
+        queue = deque(unit_ids)
+        left_over: List[str] = []
+        failed = 0
+        changed = 0
+
+        async def _poll_worker(worker: int) -> None:
+            nonlocal failed, changed
+            set_worker_lane(worker)
+            while queue:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return
+                unit_id = queue.popleft()
+                try:
+                    async with async_timeout.timeout(remaining):
+                        status = await self.api.get_unit_status(unit_id)
+                except asyncio.TimeoutError:
+                    if deadline is None or time.monotonic() < deadline:
+                        _LOGGER.error("Timeout updating status for unit %s", unit_id)
+                        self.unit_schedule[unit_id].record_failure(time.monotonic())
+                        failed += 1
+                    else:
+                        left_over.append(unit_id)
+                    continue
+                except Exception as exception:
+                    _LOGGER.error("Error updating status for unit %s: %s", unit_id, exception)
+                    # A dead unit is retried less and less often
+                    self.unit_schedule[unit_id].record_failure(time.monotonic())
+                    failed += 1
+                    continue
+
+                if self._record_status(unit_id, status):
+                    changed += 1
+
+        await asyncio.gather(
+            *(
+                self.monitor.timed("poll", _poll_worker(worker))
+                for worker in range(1, min(self.poll_concurrency, len(queue)) + 1)
+            )
+        )
+
+        left_over.extend(queue)
+        return left_over, failed, changed
+
+    async def async_poll_due_units(
+        self, unit_ids: Iterable[str], bounded: bool = True
+    ) -> Dict[str, Any]:
+        """Run one poll cycle over the due units among unit_ids.
+
+        Units are polled most important first. Units still waiting when the
+        deadline passes stay due and carry over to the next cycle. An
+        unbounded cycle polls every due unit however long it takes.
+        """
+        start = time.monotonic()
+        with self.api.tracer.span("poll units", "poll") as span:
+            due = [
+                unit_id
+                for unit_id in unit_ids
+                if self._get_schedule(unit_id, start).is_due(start)
+            ]
+            due.sort(key=lambda unit_id: self._poll_priority(unit_id, start))
+            left_over, failed, changed = await self._async_poll_units(
+                due, start + self.cycle_deadline if bounded else None
+            )
+            span.args.update(
+                due=len(due),
+                failed=failed,
+                changed=changed,
+                carried_over=len(left_over),
+            )
+            expired = self._expire_stale_units()
+
+        if left_over:
+            _LOGGER.debug(
+                "Poll cycle deadline reached, %d of %d units carried over",
+                len(left_over),
+                len(due),
+            )
+        return {
+            "due": len(due),
+            "failed": failed,
+            "changed": changed,
+            "carried_over": len(left_over),
+            "expired": expired,
+            "duration": round(time.monotonic() - start, 3),
+        }
+
+    async def async_poll(self) -> Dict[str, Any]:
+        """Run one poll cycle over all units, loading the topology first."""
+        bounded = True
+        if not self.units_loaded:
+            await self.async_load_units()
+            # Platforms create entities for the units with a status after the
+            # first refresh, so it polls every unit past the deadline
+            bounded = False
+        self.last_cycle = await self.async_poll_due_units(self.units, bounded)
+        return self.last_cycle
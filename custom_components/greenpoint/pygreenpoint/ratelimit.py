@@ -0,0 +1,135 @@
+"""Request rate limiting for Greenpoint IGH Compact."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import time
+from typing import Any, Deque, Dict, Optional, Tuple
+from weakref import WeakValueDictionary
+
+from .const import DEFAULT_RATE_LIMIT
+
+# Limiters shared by every client talking to the same controller
+_LIMITERS: "WeakValueDictionary[Tuple[str, int], TokenBucket]" = WeakValueDictionary()
+
+
+class TokenBucket:
+    """Token bucket that spaces out requests to a controller.
+
+    Tokens refill at ``rate`` per second up to ``burst``. Priority waiters are
+    served before all others, so commands are not stuck behind a poll cycle.
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        """Initialize the bucket."""
+        self.rate = 0.0
+        self.burst = 1.0
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._waiters: Dict[bool, Deque[asyncio.Future]] = {True: deque(), False: deque()}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.set_rate(rate, burst)
+        self._tokens = self.burst
+        # Cumulative time spent waiting for a token and number of waits,
+        # for priority (True) and normal (False) requests
+        self.wait_time: Dict[bool, float] = {True: 0.0, False: 0.0}
+        self.waits: Dict[bool, int] = {True: 0, False: 0}
+
+    def set_rate(self, rate: float, burst: Optional[float] = None) -> None:
+        """Change the refill rate, by default allowing one second of burst."""
+        # Tokens earned so far count at the old rate
+        self._refill()
+        self.rate = max(0.0, rate)
+        self.burst = max(1.0, burst if burst is not None else self.rate)
+        self._tokens = min(self._tokens, self.burst)
+
+        # Waiters are woken at the time worked out for the new rate
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self._schedule()
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, priority: bool = False) -> None:
+        """Wait for a token."""
+        if self.rate <= 0:
+            return
+
+        self._refill()
+        ahead = self._waiters[True] or (not priority and self._waiters[False])
+        if self._tokens >= 1 and not ahead:
+            self._tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(future)
+        self._schedule()
+        start = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation; hand the token back
+                self._tokens += 1
+                self._schedule()
+            elif future in self._waiters[priority]:
+                self._waiters[priority].remove(future)
+            if self._timer is not None and not (self._waiters[True] or self._waiters[False]):
+                self._timer.cancel()
+                self._timer = None
+            raise
+        finally:
+            self.wait_time[priority] += time.monotonic() - start
+            self.waits[priority] += 1
+
+    def _schedule(self) -> None:
+        """Schedule the next token release for the waiters."""
+        if self._timer is not None or not (self._waiters[True] or self._waiters[False]):
+            return
+        self._refill()
+        delay = max(0.0, (1 - self._tokens) / self.rate) if self.rate > 0 else 0.0
+        self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        """Hand out the available tokens, priority waiters first."""
+        self._timer = None
+        self._refill()
+        for priority in (True, False):
+            waiters = self._waiters[priority]
+            while waiters and (self._tokens >= 1 or self.rate <= 0):
+                future = waiters.popleft()
+                if future.done():
+                    continue
+                future.set_result(None)
+                if self.rate > 0:
+                    self._tokens -= 1
+        self._schedule()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the rate and wait counters."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "waiting": len(self._waiters[True]) + len(self._waiters[False]),
+            "command_waits": self.waits[True],
+            "command_wait_time": round(self.wait_time[True], 3),
+            "poll_waits": self.waits[False],
+            "poll_wait_time": round(self.wait_time[False], 3),
+        }
+
+
+def shared_limiter(host: str, port: int, rate: Optional[float] = None) -> TokenBucket:
+    """Return the limiter for a controller, creating or updating it."""
+    limiter = _LIMITERS.get((host, port))
+    if limiter is None:
+        limiter = TokenBucket(DEFAULT_RATE_LIMIT if rate is None else rate)
+        _LIMITERS[(host, port)] = limiter
+    elif rate is not None and rate != limiter.rate:
+        limiter.set_rate(rate)
+    return limiter
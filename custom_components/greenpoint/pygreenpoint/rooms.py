@@ -0,0 +1,169 @@
+"""Room-level aggregates for Greenpoint IGH Compact."""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Set
+
+from .classify import unit_kinds
+from .const import (
+    ATTR_ROOM_NAME,
+    ATTR_SPAN_SECOND,
+    ATTR_STATUS,
+    ATTR_TEMP,
+    KIND_LIGHT,
+    MOTION_SPAN_THRESHOLD,
+)
+
+
+class RoomAggregate:
+    """Average temperature, motion and switch state of the units in one room."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize the aggregate."""
+        self.name = name
+        self.units: Set[str] = set()
+        self.stale_units: Set[str] = set()
+        self.temp_units: Set[str] = set()
+        self.motion_units: Set[str] = set()
+        self.temp_sum = 0.0
+        self.temp_count = 0
+        self.active_motion: Set[str] = set()
+        self.switch_units: Set[str] = set()
+        self.light_units: Set[str] = set()
+        self.active_switches: Set[str] = set()
+
+    @property
+    def fresh(self) -> bool:
+        """Return True if any unit in the room still has a fresh status."""
+        return len(self.stale_units) < len(self.units)
+
+    @property
+    def average_temperature(self) -> Optional[float]:
+        """Return the average temperature of the room."""
+        if not self.temp_count:
+            return None
+        return round(self.temp_sum / self.temp_count, 1)
+
+    @property
+    def motion(self) -> bool:
+        """Return True if any motion sensor in the room detects motion."""
+        return bool(self.active_motion)
+
+    @property
+    def any_on(self) -> bool:
+        """Return True if any switch or light in the room is on."""
+        return bool(self.active_switches)
+
+
+def _temperature(status: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Return the temperature reported in a unit status."""
+    if not status:
+        return None
+    temp = status.get(ATTR_TEMP)
+    return float(temp) if isinstance(temp, (int, float)) else None
+
+
+def _motion(status: Optional[Dict[str, Any]]) -> Optional[bool]:
+    """Return the motion state reported in a unit status."""
+    if not status or ATTR_SPAN_SECOND not in status:
+        return None
+    return status[ATTR_SPAN_SECOND] < MOTION_SPAN_THRESHOLD
+
+
+def _switch(status: Optional[Dict[str, Any]]) -> Optional[bool]:
+    """Return the on state reported in a unit status."""
+    if not status or not isinstance(status.get(ATTR_STATUS), int):
+        return None
+    return status[ATTR_STATUS] > 0
+
+
+class RoomAggregator:
+    """Keep room aggregates up to date from per-unit status changes."""
+
+    def __init__(self) -> None:
+        """Initialize the aggregator."""
+        self.rooms: Dict[str, RoomAggregate] = {}
+        self._unit_room: Dict[str, str] = {}
+        self._units: Dict[str, Dict[str, Any]] = {}
+
+    def set_topology(self, units: Dict[str, Dict[str, Any]]) -> None:
+        """Assign units to their rooms, dropping all aggregated state."""
+        self.rooms = {}
+        self._unit_room = {}
+        self._units = units
+        for unit_id, unit in units.items():
+            room_name = unit.get(ATTR_ROOM_NAME, "Unknown Room")
+            self._unit_room[unit_id] = room_name
+            if room_name not in self.rooms:
+                self.rooms[room_name] = RoomAggregate(room_name)
+            self.rooms[room_name].units.add(unit_id)
+
+    def update_unit(
+        self,
+        unit_id: str,
+        previous: Optional[Dict[str, Any]],
+        status: Dict[str, Any],
+    ) -> bool:
+        """Apply a unit status change and return True if its room changed."""
+        room_name = self._unit_room.get(unit_id)
+        if room_name is None:
+            return False
+        room = self.rooms[room_name]
+        changed = False
+        if unit_id in room.stale_units:
+            room.stale_units.discard(unit_id)
+            changed = True
+
+        old_temp, new_temp = _temperature(previous), _temperature(status)
+        if old_temp != new_temp:
+            if old_temp is not None:
+                room.temp_sum -= old_temp
+                room.temp_count -= 1
+            if new_temp is not None:
+                room.temp_sum += new_temp
+                room.temp_count += 1
+                room.temp_units.add(unit_id)
+            changed = True
+
+        motion = _motion(status)
+        if motion is not None:
+            room.motion_units.add(unit_id)
+            if motion and unit_id not in room.active_motion:
+                room.active_motion.add(unit_id)
+                changed = True
+            elif not motion and unit_id in room.active_motion:
+                room.active_motion.discard(unit_id)
+                changed = True
+
+        switch = _switch(status)
+        if switch is not None:
+            if unit_id not in room.switch_units:
+                room.switch_units.add(unit_id)
+                if KIND_LIGHT in unit_kinds(self._units[unit_id], status):
+                    room.light_units.add(unit_id)
+            if switch and unit_id not in room.active_switches:
+                room.active_switches.add(unit_id)
+                changed = True
+            elif not switch and unit_id in room.active_switches:
+                room.active_switches.discard(unit_id)
+                changed = True
+
+        return changed
+
+    def remove_unit(self, unit_id: str, status: Optional[Dict[str, Any]]) -> bool:
+        """Take a unit's last status out of its room, returning True if it changed."""
+        room_name = self._unit_room.get(unit_id)
+        if room_name is None:
+            return False
+        room = self.rooms[room_name]
+        # The unit keeps its place in the room, only its readings are dropped
+        changed = self.update_unit(unit_id, status, {})
+        if unit_id not in room.stale_units:
+            room.stale_units.add(unit_id)
+            changed = True
+        if unit_id in room.active_motion:
+            room.active_motion.discard(unit_id)
+            changed = True
+        if unit_id in room.active_switches:
+            room.active_switches.discard(unit_id)
+            changed = True
+        return changed
@@ -0,0 +1,93 @@
+"""Per-unit poll scheduling for Greenpoint IGH Compact."""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+# Weight of the newest sample in the moving change-period estimate
+CHANGE_PERIOD_ALPHA = 0.3
+
+# Number of polls we want to make per expected status change
+POLLS_PER_CHANGE = 2
+
+
+class UnitPollState:
+    """Track how often a unit changes and derive its poll interval."""
+
+    def __init__(
+        self,
+        interval: float,
+        min_interval: float,
+        max_interval: float,
+        now: float,
+    ) -> None:
+        """Initialize the poll state."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = self._clamp(interval)
+        # Seed the estimate so a new unit starts at the configured interval
+        self.change_period: float = self.interval * POLLS_PER_CHANGE
+        self.last_change = now
+        self.last_poll: Optional[float] = None
+        self.next_poll = now
+        self.polls = 0
+        self.changes = 0
+        # Failed polls in a row, each doubling the wait before the next
+        self.failures = 0
+
+    def _clamp(self, interval: float) -> float:
+        """Keep an interval within the configured bounds."""
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def set_bounds(self, min_interval: float, max_interval: float) -> None:
+        """Change the interval bounds, keeping the learned change period."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = self._clamp(self.interval)
+        # A shorter interval takes effect without waiting out the old one
+        if self.last_poll is not None:
+            self.next_poll = min(self.next_poll, self.last_poll + self.interval)
+
+    def is_due(self, now: float) -> bool:
+        """Return True if the unit should be polled."""
+        return now >= self.next_poll
+
+    def mark_due(self, now: float) -> None:
+        """Poll the unit on the next cycle regardless of its interval."""
+        self.next_poll = now
+
+    def record_poll(self, changed: bool, now: float) -> None:
+        """Record a poll result and schedule the next poll."""
+        self.polls += 1
+        self.last_poll = now
+        self.failures = 0
+
+        if changed:
+            self.changes += 1
+            sample = now - self.last_change
+            self.change_period = (
+                CHANGE_PERIOD_ALPHA * sample
+                + (1 - CHANGE_PERIOD_ALPHA) * self.change_period
+            )
+            self.last_change = now
+
+        # A quiet spell longer than the estimate stretches it out
+        period = max(self.change_period, now - self.last_change)
+        self.interval = self._clamp(period / POLLS_PER_CHANGE)
+        self.next_poll = now + self.interval
+
+    def record_failure(self, now: float) -> None:
+        """Record a failed poll and back off up to the maximum interval."""
+        self.failures += 1
+        backoff = self.min_interval * 2 ** (self.failures - 1)
+        self.next_poll = now + min(self.max_interval, backoff)
+
+    def as_dict(self, now: float) -> Dict[str, Any]:
+        """Return the poll state for diagnostics."""
+        return {
+            "interval": round(self.interval, 1),
+            "change_period": round(self.change_period, 1),
+            "next_poll_in": round(max(0.0, self.next_poll - now), 1),
+            "polls": self.polls,
+            "changes": self.changes,
+            "failures": self.failures,
+        }
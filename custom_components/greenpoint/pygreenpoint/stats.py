@@ -0,0 +1,87 @@
+"""Rolling statistics for Greenpoint IGH Compact readings."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class RollingStats:
+    """Min, max, mean and rate of change over the last readings.
+
+    Every operation is O(1) amortized: the mean comes from a running sum and
+    min/max from monotonic queues, so nothing rescans the buffer per reading.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize the statistics."""
+        self.size = max(2, size)
+        self._readings: Deque[Tuple[float, float]] = deque()
+        self._min: Deque[Tuple[int, float]] = deque()
+        self._max: Deque[Tuple[int, float]] = deque()
+        self._sum = 0.0
+        self._seq = 0
+
+    def __len__(self) -> int:
+        """Return the number of buffered readings."""
+        return len(self._readings)
+
+    def resized(self, size: int) -> RollingStats:
+        """Return statistics over a new number of the latest readings."""
+        stats = RollingStats(size)
+        for timestamp, value in list(self._readings)[-stats.size:]:
+            stats.add(value, timestamp)
+        return stats
+
+    def add(self, value: float, timestamp: float) -> None:
+        """Add a reading taken at a timestamp in seconds."""
+        seq = self._seq
+        self._seq += 1
+
+        self._readings.append((timestamp, value))
+        self._sum += value
+        if len(self._readings) > self.size:
+            self._sum -= self._readings.popleft()[1]
+
+        # Recompute the sum once per buffer length to stop float drift
+        if seq % self.size == 0:
+            self._sum = sum(reading for _, reading in self._readings)
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+
+        oldest = seq - self.size
+        if self._min[0][0] <= oldest:
+            self._min.popleft()
+        if self._max[0][0] <= oldest:
+            self._max.popleft()
+
+    @property
+    def minimum(self) -> Optional[float]:
+        """Return the lowest buffered reading."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def maximum(self) -> Optional[float]:
+        """Return the highest buffered reading."""
+        return self._max[0][1] if self._max else None
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Return the mean of the buffered readings."""
+        if not self._readings:
+            return None
+        return self._sum / len(self._readings)
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Return the change per hour between the oldest and newest reading."""
+        if len(self._readings) < 2:
+            return None
+        (start, first), (end, last) = self._readings[0], self._readings[-1]
+        if end <= start:
+            return None
+        return (last - first) / (end - start) * 3600
@@ -0,0 +1,251 @@
+"""Chrome trace-event recording for Greenpoint IGH Compact.
+
+Spans are buffered in memory as complete ("X") events and appended to a
+JSON array file that chrome://tracing and Perfetto open directly. Writing is
+separate from recording so callers can do the file I/O off the event loop.
+
+Spans of one asyncio task must nest, so each task records on its own lane
+(a trace thread id). Poll cycles set explicit lanes for the cycle itself and
+for each of its poll workers; other tasks, such as commands, get a lane of
+their own.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar, Token
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
+# Size of one trace file before it is rotated, and rotated files kept
+DEFAULT_TRACE_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_TRACE_BACKUPS = 2
+
+# Lanes of poll cycles are this far apart, leaving room for their workers;
+# other tasks get lanes from TASK_LANE_START
+LANE_CYCLE = 0
+LANE_SPACING = 100
+TASK_LANE_START = 10000
+
+_LANE: ContextVar[Optional[Tuple[int, str]]] = ContextVar(
+    "greenpoint_trace_lane", default=None
+)
+
+
+def set_trace_lane(lane: int, name: str) -> Token:
+    """Record the spans of the current task on a named lane."""
+    return _LANE.set((lane, name))
+
+
+def reset_trace_lane(token: Token) -> None:
+    """Restore the lane that was current before set_trace_lane."""
+    _LANE.reset(token)
+
+
+def set_worker_lane(worker: int) -> None:
+    """Record the spans of the current task on a worker lane of its cycle."""
+    lane, name = _LANE.get() or (LANE_CYCLE, "poll cycle")
+    _LANE.set((lane + worker, f"{name} worker {worker}"))
+
+
+class _NullSpan:
+    """Span of a disabled tracer."""
+
+    __slots__ = ("args",)
+
+    def __init__(self) -> None:
+        """Initialize the span."""
+        self.args: Dict[str, Any] = {}
+
+    def __enter__(self) -> "_NullSpan":
+        """Start the span."""
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        """End the span."""
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A timed region recorded as a complete trace event."""
+
+    __slots__ = ("_tracer", "name", "cat", "args", "_start")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: Dict[str, Any]) -> None:
+        """Initialize the span."""
+        self._tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self._start = 0.0
+
+    def __enter__(self) -> "Span":
+        """Start the span."""
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        """End the span and record it."""
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self._tracer.record(self.name, self.cat, self._start, end, self.args)
+
+
+class Tracer:
+    """Record spans and write them to a rotating trace file."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = DEFAULT_TRACE_MAX_BYTES,
+        backups: int = DEFAULT_TRACE_BACKUPS,
+    ) -> None:
+        """Initialize the tracer; without a path nothing is recorded."""
+        self.path = path
+        self.enabled = path is not None
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._buffer: List[Dict[str, Any]] = []
+        self._lane_names: Dict[int, str] = {}
+        # Lanes named in the current trace file
+        self._written_lanes: Set[int] = set()
+        self._task_lanes: "WeakKeyDictionary[asyncio.Task, int]" = WeakKeyDictionary()
+        # Task lanes are never reused, so a lane always belongs to one task
+        self._next_task_lane = TASK_LANE_START
+        # Writes run in executor threads and may overlap
+        self._write_lock = threading.Lock()
+
+    def span(self, name: str, cat: str, args: Optional[Dict[str, Any]] = None):
+        """Return a context manager that records a span."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, cat, args if args is not None else {})
+
+    def _lane(self) -> int:
+        """Return the lane of the current task."""
+        current = _LANE.get()
+        if current is not None:
+            lane, name = current
+            if lane not in self._lane_names:
+                self._lane_names[lane] = name
+            return lane
+
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            return TASK_LANE_START
+        lane = self._task_lanes.get(task)
+        if lane is None:
+            lane = self._task_lanes[task] = self._next_task_lane
+            self._next_task_lane += 1
+            self._lane_names[lane] = task.get_name()
+        return lane
+
+    def record(
+        self, name: str, cat: str, start: float, end: float, args: Dict[str, Any]
+    ) -> None:
+        """Record a complete span from perf_counter timestamps."""
+        self._buffer.append(
+            {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": self._pid,
+                "tid": self._lane(),
+                "args": args,
+            }
+        )
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Return and clear the buffered events, led by the lane names.
+
+        The lane names are copied here, on the thread that records spans, so
+        writing the events in another thread never reads them.
+        """
+        if not self._buffer:
+            return []
+        events, self._buffer = self._buffer, []
+        names = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": lane,
+                "args": {"name": name},
+            }
+            for lane, name in self._lane_names.items()
+        ]
+
+        # A task finished by now has no events left to record, so its lane
+        # is forgotten once named in this batch
+        live = set(self._task_lanes.values())
+        for lane in [lane for lane in self._lane_names if lane >= TASK_LANE_START]:
+            if lane not in live:
+                del self._lane_names[lane]
+        return names + events
+
+    def write(self, events: List[Dict[str, Any]]) -> None:
+        """Append drained events to the trace file, rotating it when full.
+
+        This does blocking file I/O.
+        """
+        if not events or self.path is None:
+            return
+        with self._write_lock:
+            self._write(events)
+
+    def _write(self, events: List[Dict[str, Any]]) -> None:
+        """Append events to the trace file, naming the lanes new to it."""
+        data = "".join(
+            json.dumps(event) + ",\n" for event in events if event["ph"] != "M"
+        )
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+            size = 0
+        if not size:
+            self._written_lanes.clear()
+
+        # Name the lanes new to this file so every file opens on its own
+        names = [event for event in events if event["ph"] == "M"]
+        data = (
+            "".join(
+                json.dumps(event) + ",\n"
+                for event in names
+                if event["tid"] not in self._written_lanes
+            )
+            + data
+        )
+        # Lanes missing from the batch were forgotten after the last one
+        self._written_lanes = {event["tid"] for event in names}
+
+        with open(self.path, "a", encoding="utf-8") as trace_file:
+            # The closing bracket is optional in the trace-event array format,
+            # so the file stays valid while it is appended to
+            if not size:
+                trace_file.write("[\n")
+            trace_file.write(data)
+
+    def _rotate(self) -> None:
+        """Shift the trace file into the numbered backups."""
+        for index in range(self.backups, 0, -1):
+            source = self.path if index == 1 else f"{self.path}.{index - 1}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index}")
+        if not self.backups:
+            os.remove(self.path)
@@ -0,0 +1,250 @@
+"""Minimal HTTP/1.1 transport for the IGH Compact web server.
+
+The controller answers small JSON documents to plain GET requests, so this
+transport only implements what that needs: one persistent connection,
+pipelined GET requests and responses framed by Content-Length, chunked
+encoding or connection close.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+# Responses whose headers do not fit are rejected
+MAX_HEADER_SIZE = 16384
+
+# Requests written to the connection before their responses arrive
+DEFAULT_PIPELINE_DEPTH = 8
+
+
+class HttpProtocolError(Exception):
+    """Error to indicate the controller sent a response we cannot parse."""
+
+
+class RawHttpProtocol(asyncio.Protocol):
+    """Match pipelined responses to their requests in order."""
+
+    def __init__(self) -> None:
+        """Initialize the protocol."""
+        self.transport: Optional[asyncio.Transport] = None
+        self.pending: Deque[asyncio.Future] = deque()
+        self.closed = False
+        self._buffer = bytearray()
+        self._chunks = bytearray()
+        self._status: Optional[int] = None
+        self._length: Optional[int] = None
+        self._chunked = False
+        self._close_after = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport."""
+        self.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        """Parse every response completed by the new data."""
+        self._buffer += data
+        try:
+            while self._buffer and self._parse_response():
+                pass
+        except HttpProtocolError as exception:
+            self._fail(exception)
+            self.transport.close()
+
+    def eof_received(self) -> bool:
+        """Complete a response that is delimited by the connection close."""
+        if self._status is not None and self._length is None and not self._chunked:
+            self._complete(bytes(self._buffer))
+            self._buffer.clear()
+        return False
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        """Fail the requests still waiting for a response."""
+        self._fail(exc)
+
+    def _fail(self, exc: Optional[Exception]) -> None:
+        """Fail all pending requests."""
+        self.closed = True
+        while self.pending:
+            future = self.pending.popleft()
+            if not future.done():
+                error = ConnectionResetError(f"Connection to controller lost: {exc}")
+                future.set_exception(error)
+
+    def _complete(self, body: bytes) -> None:
+        """Hand a complete response to the oldest pending request."""
+        status, self._status = self._status, None
+        if self.pending:
+            future = self.pending.popleft()
+            # The request may have been cancelled by its timeout
+            if not future.done():
+                future.set_result((status, body))
+        if self._close_after:
+            self.closed = True
+            self.transport.close()
+
+    def _parse_head(self) -> bool:
+        """Parse the status line and headers of the next response."""
+        end = self._buffer.find(b"\r\n\r\n")
+        if end < 0:
+            if len(self._buffer) > MAX_HEADER_SIZE:
+                raise HttpProtocolError("Response headers too large")
+            return False
+
+        lines = self._buffer[:end].decode("latin-1").split("\r\n")
+        del self._buffer[: end + 4]
+
+        version, _, rest = lines[0].partition(" ")
+        if not version.startswith("HTTP/1."):
+            raise HttpProtocolError(f"Invalid status line: {lines[0]!r}")
+        try:
+            self._status = int(rest[:3])
+        except ValueError as exception:
+            raise HttpProtocolError(f"Invalid status line: {lines[0]!r}") from exception
+
+        self._length = None
+        self._chunked = False
+        self._close_after = version == "HTTP/1.0"
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            name = name.strip().lower()
+            value = value.strip().lower()
+            if name == "content-length":
+                try:
+                    self._length = int(value)
+                except ValueError as exception:
+                    raise HttpProtocolError(f"Invalid Content-Length: {value}") from exception
+            elif name == "transfer-encoding":
+                self._chunked = "chunked" in value
+            elif name == "connection":
+                self._close_after = value == "close"
+
+        if self._status in (204, 304) or self._status < 200:
+            self._length = 0
+        return True
+
+    def _parse_chunked(self) -> bool:
+        """Collect chunks until the terminating zero-length chunk."""
+        while True:
+            end = self._buffer.find(b"\r\n")
+            if end < 0:
+                return False
+            try:
+                size = int(bytes(self._buffer[:end]).split(b";")[0], 16)
+            except ValueError as exception:
+                raise HttpProtocolError("Invalid chunk size") from exception
+
+            if size == 0:
+                # Skip optional trailers up to the closing empty line
+                trailer_end = self._buffer.find(b"\r\n\r\n", end)
+                if trailer_end < 0:
+                    return False
+                del self._buffer[: trailer_end + 4]
+                body = bytes(self._chunks)
+                self._chunks.clear()
+                self._complete(body)
+                return True
+
+            if len(self._buffer) < end + size + 4:
+                return False
+            self._chunks += self._buffer[end + 2 : end + 2 + size]
+            del self._buffer[: end + size + 4]
+
+    def _parse_response(self) -> bool:
+        """Parse one response from the buffer, returning True if complete."""
+        if self._status is None and not self._parse_head():
+            return False
+        if self._chunked:
+            return self._parse_chunked()
+        if self._length is None:
+            # The body runs until the controller closes the connection
+            return False
+        if len(self._buffer) < self._length:
+            return False
+
+        body = bytes(self._buffer[: self._length])
+        del self._buffer[: self._length]
+        self._complete(body)
+        return True
+
+
+class RawHttpTransport:
+    """Send GET requests over one persistent, pipelined connection."""
+
+    def __init__(
+        self, host: str, port: int, pipeline_depth: int = DEFAULT_PIPELINE_DEPTH
+    ) -> None:
+        """Initialize the transport."""
+        self.host = host
+        self.port = port
+        self._request_tail = f" HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode()
+        self._protocol: Optional[RawHttpProtocol] = None
+        self._connect_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(pipeline_depth)
+
+    async def _get_protocol(self) -> RawHttpProtocol:
+        """Return an open connection, connecting if needed."""
+        protocol = self._protocol
+        if protocol is not None and not protocol.closed:
+            return protocol
+
+        async with self._connect_lock:
+            if self._protocol is None or self._protocol.closed:
+                loop = asyncio.get_running_loop()
+                _, self._protocol = await loop.create_connection(
+                    RawHttpProtocol, self.host, self.port
+                )
+            return self._protocol
+
+    async def get(self, target: str) -> Tuple[int, bytes]:
+        """Send a GET request and return the status and body."""
+        await self._slots.acquire()
+        release = True
+        try:
+            protocol = await self._get_protocol()
+            future = asyncio.get_running_loop().create_future()
+            protocol.pending.append(future)
+            protocol.transport.write(b"GET " + target.encode() + self._request_tail)
+            try:
+                return await future
+            except asyncio.CancelledError:
+                if protocol.pending and protocol.pending[0] is future:
+                    # The oldest response is overdue or half read, and every
+                    # later request queues behind it; drop the connection so
+                    # the next request reconnects
+                    self._drop(protocol)
+                elif future in protocol.pending:
+                    # Requests behind it may still be answered; discard its
+                    # response when it arrives
+                    self._abandon(protocol, future)
+                    release = False
+                raise
+        finally:
+            if release:
+                self._slots.release()
+
+    def _abandon(self, protocol: RawHttpProtocol, future: asyncio.Future) -> None:
+        """Discard a request's response, keeping its slot until it arrives."""
+
+        def _response_done(abandoned: asyncio.Future) -> None:
+            if not abandoned.cancelled():
+                # Retrieve a connection error so it is not logged as unhandled
+                abandoned.exception()
+            self._slots.release()
+
+        abandoned = asyncio.get_running_loop().create_future()
+        abandoned.add_done_callback(_response_done)
+        protocol.pending[protocol.pending.index(future)] = abandoned
+
+    def _drop(self, protocol: RawHttpProtocol) -> None:
+        """Close a connection, failing its pending requests."""
+        protocol.closed = True
+        if protocol.transport is not None:
+            protocol.transport.close()
+        if self._protocol is protocol:
+            self._protocol = None
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._protocol is not None:
+            self._drop(self._protocol)
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any, Dict, List, Optional
 
 from homeassistant.components.sensor import (
@@ -11,12 +12,28 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import ATTR_TEMP, DOMAIN
+from .const import (
+    ATTR_TEMP,
+    ATTR_TEMP_MAX,
+    ATTR_TEMP_MEAN,
+    ATTR_TEMP_MIN,
+    ATTR_TEMP_RATE,
+    CONF_TEMP_DEADBAND,
+    CONF_TEMP_HEARTBEAT,
+    CONF_TEMP_STATS_WINDOW,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_TEMP_HEARTBEAT,
+    DEFAULT_TEMP_STATS_WINDOW,
+    DOMAIN,
+    KIND_TEMPERATURE,
+)
 from .coordinator import GreenpointDataUpdateCoordinator
-from .device import GreenpointDevice, GreenpointDeviceEntity
+from .device import GreenpointDevice, GreenpointDeviceEntity, GreenpointRoomEntity
+from .pygreenpoint import unit_kinds
+from .pygreenpoint.stats import RollingStats
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,19 +43,46 @@ async def async_setup_entry(
 ) -> None:
     """Set up Greenpoint IGH Compact sensors based on config entry."""
     coordinator: GreenpointDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    deadband = entry.options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND)
+    heartbeat = entry.options.get(CONF_TEMP_HEARTBEAT, DEFAULT_TEMP_HEARTBEAT)
+    stats_window = entry.options.get(CONF_TEMP_STATS_WINDOW, DEFAULT_TEMP_STATS_WINDOW)
 
     # Create a list to hold our entities
     entities = []
 
     # Create sensor entities for each unit
     for unit_id, unit_data in coordinator.data["units"].items():
-        # Create a device object
-        device = GreenpointDevice(unit_id, unit_data)
+        # Get the device object shared with the other platforms
+        device = coordinator.get_device(unit_id)
 
         # Check if this is a sensor type unit (has temperature)
         status = coordinator.data["status"].get(unit_id, {})
-        if ATTR_TEMP in status:
-            entities.append(GreenpointTemperatureSensor(coordinator, device))
+        if KIND_TEMPERATURE in unit_kinds(unit_data, status):
+            entities.append(
+                GreenpointTemperatureSensor(
+                    coordinator.coordinator_for_unit(unit_id),
+                    device,
+                    deadband,
+                    heartbeat,
+                    stats_window,
+                )
+            )
+
+    # Filter option changes are applied to the sensors without a reload
+    coordinator.temperature_filter_listeners = [
+        entity.set_filters
+        for entity in entities
+        if isinstance(entity, GreenpointTemperatureSensor)
+    ]
+
+    # Create an average temperature sensor for each room with temperature units
+    for room in coordinator.rooms.rooms.values():
+        if room.temp_units:
+            entities.append(
+                GreenpointRoomTemperatureSensor(
+                    coordinator.coordinator_for_room(room.name), room.name
+                )
+            )
 
     # Add all entities to Home Assistant
     async_add_entities(entities)
@@ -50,10 +94,90 @@ class GreenpointTemperatureSensor(GreenpointDeviceEntity, SensorEntity):
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-
-    def __init__(self, coordinator: GreenpointDataUpdateCoordinator, device: GreenpointDevice):
+    # Derived from the state history, so there is no point recording them
+    _unrecorded_attributes = GreenpointDeviceEntity._unrecorded_attributes | frozenset(
+        {ATTR_TEMP_MIN, ATTR_TEMP_MAX, ATTR_TEMP_MEAN, ATTR_TEMP_RATE}
+    )
+
+    def __init__(
+        self,
+        coordinator: GreenpointDataUpdateCoordinator,
+        device: GreenpointDevice,
+        deadband: float = DEFAULT_TEMP_DEADBAND,
+        heartbeat: float = DEFAULT_TEMP_HEARTBEAT,
+        stats_window: int = DEFAULT_TEMP_STATS_WINDOW,
+    ):
         """Initialize the sensor."""
         super().__init__(coordinator, device, "temperature")
+        self.deadband = deadband
+        self.heartbeat = heartbeat
+        self.stats = RollingStats(stats_window)
+        self._stats_sampled_at = None
+        self._published_value: float | None = None
+        self._published_available = False
+        self._published_at = 0.0
+        self._sample_reading()
+        self._publish_if_significant()
+
+    def set_filters(self, deadband: float, heartbeat: float, stats_window: int) -> None:
+        """Apply new filter options, keeping the recent readings."""
+        self.deadband = deadband
+        self.heartbeat = heartbeat
+        if stats_window != self.stats.size:
+            self.stats = self.stats.resized(stats_window)
+
+    def _sample_reading(self) -> None:
+        """Add a freshly polled temperature to the rolling statistics."""
+        updated = self._unit_updated
+        if updated is None or updated == self._stats_sampled_at:
+            return
+
+        value = self.coordinator.unit_status.get(self.device.unit_id, {}).get(ATTR_TEMP)
+        if isinstance(value, (int, float)):
+            self.stats.add(value, updated.timestamp())
+        self._stats_sampled_at = updated
+
+    def _publish_if_significant(self) -> bool:
+        """Publish the polled temperature if it is worth a state write."""
+        available = self._unit_available
+        value = self._unit_status.get(ATTR_TEMP) if available else None
+        now = time.monotonic()
+
+        # Small changes within the heartbeat interval are dropped
+        if (
+            available == self._published_available
+            and value is not None
+            and self._published_value is not None
+            and abs(value - self._published_value) < self.deadband
+            and now - self._published_at < self.heartbeat
+        ):
+            return False
+
+        self._published_value = value
+        self._published_available = available
+        self._published_at = now
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only for significant temperature changes."""
+        self._refresh_unit_state()
+        self._sample_reading()
+        if self._publish_if_significant():
+            self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return rolling statistics of recent readings."""
+        attributes = super().extra_state_attributes
+        stats = self.stats
+        if stats.mean is not None:
+            attributes[ATTR_TEMP_MIN] = stats.minimum
+            attributes[ATTR_TEMP_MAX] = stats.maximum
+            attributes[ATTR_TEMP_MEAN] = round(stats.mean, 2)
+        if stats.rate is not None:
+            attributes[ATTR_TEMP_RATE] = round(stats.rate, 2)
+        return attributes
 
     @property
     def native_value(self) -> float | None:
@@ -61,4 +185,23 @@ class GreenpointTemperatureSensor(GreenpointDeviceEntity, SensorEntity):
         if not self.available:
             return None
 
-        return self.device_status.get(ATTR_TEMP)
+        return self._published_value
+
+
+class GreenpointRoomTemperatureSensor(GreenpointRoomEntity, SensorEntity):
+    """Average temperature of the units in a room."""
+
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    aggregate_attribute = "average_temperature"
+
+    def __init__(self, coordinator: GreenpointDataUpdateCoordinator, room_name: str):
+        """Initialize the sensor."""
+        super().__init__(coordinator, room_name, "temperature")
+        self._attr_name = f"{room_name} Average Temperature"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the average room temperature."""
+        return self.aggregate_value
@@ -0,0 +1,194 @@
+"""Services for Greenpoint IGH Compact."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import logging
+import time
+from typing import Any, Dict
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import DOMAIN
+from .coordinator import GreenpointDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_RUN_SCENARIOS = "run_scenarios"
+SERVICE_PROFILE = "profile"
+
+ATTR_SCENARIOS = "scenarios"
+ATTR_CONCURRENCY = "concurrency"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_CYCLES = "cycles"
+
+RUN_SCENARIOS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_SCENARIOS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_CONCURRENCY, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10)
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=5): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall) -> GreenpointDataUpdateCoordinator:
+    """Return the coordinator a service call is aimed at."""
+    coordinators = hass.data.get(DOMAIN, {})
+
+    if ATTR_CONFIG_ENTRY_ID in call.data:
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        if entry_id not in coordinators:
+            raise HomeAssistantError(f"Unknown Greenpoint config entry: {entry_id}")
+        return coordinators[entry_id]
+
+    if len(coordinators) != 1:
+        raise HomeAssistantError(
+            "Specify config_entry_id when more than one controller is configured"
+        )
+    return next(iter(coordinators.values()))
+
+
+async def _async_run_scenarios(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Run a batch of scenarios and refresh once afterwards."""
+    coordinator = _get_coordinator(hass, call)
+    scenarios = call.data[ATTR_SCENARIOS]
+    semaphore = asyncio.Semaphore(call.data[ATTR_CONCURRENCY])
+
+    # Set when a scene-style scenario, e.g. "Good Night", ran: its units
+    # are unknown, so every unit is polled on the refresh
+    unmapped = False
+
+    async def _run(scenario: str) -> Dict[str, Any]:
+        nonlocal unmapped
+        async with semaphore:
+            try:
+                await coordinator.monitor.timed(
+                    "command", coordinator.api.run_scenario(scenario)
+                )
+            except Exception as exception:
+                _LOGGER.error("Failed to run scenario %s: %s", scenario, exception)
+                return {"scenario": scenario, "success": False, "error": str(exception)}
+
+        unit_ids = coordinator.get_scenario_units(scenario)
+        if not unit_ids:
+            unmapped = True
+        for unit_id in unit_ids:
+            coordinator.mark_unit_commanded(unit_id)
+        return {"scenario": scenario, "success": True}
+
+    # With a concurrency of 1 the semaphore runs the scenarios in order
+    results = await asyncio.gather(*(_run(scenario) for scenario in scenarios))
+
+    if unmapped:
+        coordinator.mark_all_units_due()
+
+    await coordinator.async_refresh()
+
+    return {"results": list(results)}
+
+
+async def _async_profile(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Profile a number of full poll cycles and write the stats file."""
+    coordinator = _get_coordinator(hass, call)
+    cycles = call.data[ATTR_CYCLES]
+    api = coordinator.api
+
+    http_time, decode_time = api.http_time, api.decode_time
+    listener_time = coordinator.listener_time
+    profiler = cProfile.Profile()
+
+    poll_time = 0.0
+    start = time.monotonic()
+    profiler.enable()
+    try:
+        for _ in range(cycles):
+            # Poll every unit so each cycle exercises the whole path
+            coordinator.mark_all_units_due()
+            await coordinator.async_refresh()
+            poll_time += coordinator.last_cycle.get("duration", 0.0)
+    finally:
+        profiler.disable()
+    elapsed = time.monotonic() - start
+
+    path = hass.config.path(f"greenpoint_profile_{int(time.time())}.prof")
+    await hass.async_add_executor_job(profiler.dump_stats, path)
+
+    result = {
+        "path": path,
+        "cycles": cycles,
+        "total": round(elapsed, 3),
+        "polling": round(poll_time, 3),
+        # Concurrent requests overlap, so this can exceed the polling time
+        "http_requests": round(api.http_time - http_time, 3),
+        "json_decode": round(api.decode_time - decode_time, 3),
+        "state_writes": round(coordinator.listener_time - listener_time, 3),
+    }
+    _LOGGER.info(
+        "Profiled %d poll cycles in %.3fs: polling %.3fs (HTTP requests %.3fs "
+        "summed over all requests), JSON decoding %.3fs, entity state writes "
+        "%.3fs. Stats written to %s",
+        cycles,
+        result["total"],
+        result["polling"],
+        result["http_requests"],
+        result["json_decode"],
+        result["state_writes"],
+        path,
+    )
+    return result
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+    if hass.services.has_service(DOMAIN, SERVICE_RUN_SCENARIOS):
+        return
+
+    async def _handle_run_scenarios(call: ServiceCall) -> ServiceResponse:
+        return await _async_run_scenarios(hass, call)
+
+    async def _handle_profile(call: ServiceCall) -> ServiceResponse:
+        return await _async_profile(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RUN_SCENARIOS,
+        _handle_run_scenarios,
+        schema=RUN_SCENARIOS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the integration services once no controller is left."""
+    if hass.data.get(DOMAIN):
+        return
+
+    hass.services.async_remove(DOMAIN, SERVICE_RUN_SCENARIOS)
+    hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
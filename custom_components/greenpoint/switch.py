@@ -9,9 +9,14 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import ATTR_STATUS, DOMAIN
+from .const import ATTR_STATUS, CONF_ROOM_SWITCHES, DOMAIN, KIND_SWITCH
 from .coordinator import GreenpointDataUpdateCoordinator
-from .device import GreenpointDevice, GreenpointDeviceEntity
+from .device import (
+    GreenpointDevice,
+    GreenpointDeviceEntity,
+    GreenpointRoomCommandEntity,
+)
+from .pygreenpoint import unit_kinds
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,13 +32,26 @@ async def async_setup_entry(
 
     # Create switch entities for each unit
     for unit_id, unit_data in coordinator.data["units"].items():
-        # Create a device object
-        device = GreenpointDevice(unit_id, unit_data)
+        # Get the device object shared with the other platforms
+        device = coordinator.get_device(unit_id)
 
         # Check if this is a switch type unit (has status)
         status = coordinator.data["status"].get(unit_id, {})
-        if ATTR_STATUS in status:
-            entities.append(GreenpointSwitch(coordinator, device))
+        if KIND_SWITCH in unit_kinds(unit_data, status):
+            entities.append(
+                GreenpointSwitch(coordinator.coordinator_for_unit(unit_id), device)
+            )
+
+    # Optionally add a switch per room that runs its All On / All Off
+    # scenarios; rooms with only lights get a light instead
+    if entry.options.get(CONF_ROOM_SWITCHES, False):
+        for room in coordinator.rooms.rooms.values():
+            if room.switch_units and room.switch_units != room.light_units:
+                entities.append(
+                    GreenpointRoomSwitch(
+                        coordinator.coordinator_for_room(room.name), room.name
+                    )
+                )
 
     # Add all entities to Home Assistant
     async_add_entities(entities)
@@ -58,24 +76,16 @@ class GreenpointSwitch(GreenpointDeviceEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        # Create a scenario name based on the device name and "On"
-        scenario_name = f"{self.device.name} On"
-        
-        try:
-            await self.coordinator.api.run_scenario(scenario_name)
-            # Schedule an immediate data update
-            await self.coordinator.async_request_refresh()
-        except Exception as exception:
-            _LOGGER.error("Failed to turn on %s: %s", self.name, exception)
+        await self._async_run_scenario("On")
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        # Create a scenario name based on the device name and "Off"
-        scenario_name = f"{self.device.name} Off"
-        
-        try:
-            await self.coordinator.api.run_scenario(scenario_name)
-            # Schedule an immediate data update
-            await self.coordinator.async_request_refresh()
-        except Exception as exception:
-            _LOGGER.error("Failed to turn off %s: %s", self.name, exception)
+        await self._async_run_scenario("Off")
+
+
+class GreenpointRoomSwitch(GreenpointRoomCommandEntity, SwitchEntity):
+    """Switches everything in a room with one scenario."""
+
+    def __init__(self, coordinator: GreenpointDataUpdateCoordinator, room_name: str):
+        """Initialize the switch."""
+        super().__init__(coordinator, room_name, "switch")
@@ -0,0 +1,239 @@
+"""Soak test harness for the fake IGH Compact controller.
+
+Problems that only show after days of uptime need long runs to reproduce:
+memory that grows a little every cycle, a request rate that creeps up, slow
+cycles and slow recovery after the controller reboots. A soak run drifts
+the fake controller's statuses, injects faults and reboots it on a
+schedule, and keeps those numbers. Everything it keeps has a fixed size, so
+its own bookkeeping does not show up as memory growth in a run of hours.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from custom_components.greenpoint.pygreenpoint.fake import FakeController
+
+# Cycle times are counted in buckets growing by this factor, so percentiles
+# are accurate to within 5% in constant memory
+HISTOGRAM_START = 0.001  # seconds
+HISTOGRAM_GROWTH = 1.05
+
+# Memory growth is measured from the first sample after the warmup, once
+# caches and connection pools have filled
+DEFAULT_SOAK_WARMUP = 60.0  # seconds
+
+
+class Histogram:
+    """Count values in logarithmic buckets for approximate percentiles."""
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        """Count a value."""
+        index = 0
+        if value > HISTOGRAM_START:
+            index = int(math.log(value / HISTOGRAM_START, HISTOGRAM_GROWTH)) + 1
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Return the upper bound of the bucket holding a percentile."""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(self.count * pct / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self.max, HISTOGRAM_START * HISTOGRAM_GROWTH**index)
+        return self.max
+
+
+class SoakStats:
+    """Track the health of a long run against a fake controller."""
+
+    def __init__(
+        self, controller: FakeController, warmup: float = DEFAULT_SOAK_WARMUP
+    ) -> None:
+        """Initialize the statistics."""
+        self.controller = controller
+        self.warmup = warmup
+        self.cycle_times = Histogram()
+        self.cycles = 0
+        self.failed_refreshes = 0
+        self.polled = 0
+        self.failed_polls = 0
+        self.recoveries = 0
+        self.recovery_total = 0.0
+        self.recovery_max = 0.0
+        self._started = time.monotonic()
+        self._requests = controller.requests
+        self._tracing = False
+        # When the controller last came back, until a poll succeeds again
+        self._restarted: Optional[float] = None
+        self._memory_baseline: Optional[int] = None
+        self._memory = 0
+        self._memory_peak = 0
+        # Running sums of a least squares fit of memory over time in hours
+        self._fit = [0, 0.0, 0.0, 0.0, 0.0]
+
+    def start(self) -> None:
+        """Start the run, tracing memory allocations from now on."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        self._started = time.monotonic()
+        self._requests = self.controller.requests
+
+    def stop(self) -> None:
+        """Stop tracing memory allocations if the run started it."""
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def record_cycle(self, cycle: Dict[str, Any], success: bool) -> None:
+        """Record the outcome of one refresh and its poll cycle."""
+        if not success:
+            self.failed_refreshes += 1
+            return
+        self.cycles += 1
+        self.cycle_times.add(cycle.get("duration", 0.0))
+        polled = cycle.get("due", 0) - cycle.get("carried_over", 0)
+        failed = cycle.get("failed", 0)
+        self.polled += polled
+        self.failed_polls += failed
+
+        # Polling has recovered once any unit answers again
+        if self._restarted is not None and polled > failed:
+            recovery = time.monotonic() - self._restarted
+            self._restarted = None
+            self.recoveries += 1
+            self.recovery_total += recovery
+            self.recovery_max = max(self.recovery_max, recovery)
+
+    def controller_restarted(self) -> None:
+        """Start timing the recovery from a controller reboot."""
+        if self._restarted is None:
+            self._restarted = time.monotonic()
+
+    def sample_memory(self) -> None:
+        """Sample the memory allocated since the run started."""
+        if not tracemalloc.is_tracing():
+            return
+        self._memory, peak = tracemalloc.get_traced_memory()
+        self._memory_peak = max(self._memory_peak, peak)
+        elapsed = time.monotonic() - self._started
+        if elapsed < self.warmup:
+            return
+        if self._memory_baseline is None:
+            self._memory_baseline = self._memory
+
+        hours = elapsed / 3600
+        fit = self._fit
+        fit[0] += 1
+        fit[1] += hours
+        fit[2] += self._memory
+        fit[3] += hours * hours
+        fit[4] += hours * self._memory
+
+    def _memory_slope(self) -> Optional[float]:
+        """Return the fitted memory growth in bytes per hour."""
+        count, hours, memory, hours_squared, product = self._fit
+        spread = count * hours_squared - hours * hours
+        if count < 2 or spread <= 0:
+            return None
+        return (count * product - hours * memory) / spread
+
+    def report(self) -> Dict[str, Any]:
+        """Return the statistics of the run so far."""
+        elapsed = time.monotonic() - self._started
+        requests = self.controller.requests - self._requests
+        cycle_times = self.cycle_times
+        slope = self._memory_slope()
+
+        def _round(value: Optional[float], digits: int = 4) -> Optional[float]:
+            return round(value, digits) if value is not None else None
+
+        return {
+            "elapsed": round(elapsed, 1),
+            "cycles": self.cycles,
+            "failed_refreshes": self.failed_refreshes,
+            "polled": self.polled,
+            "failed_polls": self.failed_polls,
+            "requests": requests,
+            "requests_per_second": round(requests / elapsed, 1) if elapsed else None,
+            "cycle_p50": _round(cycle_times.percentile(50)),
+            "cycle_p95": _round(cycle_times.percentile(95)),
+            "cycle_p99": _round(cycle_times.percentile(99)),
+            "cycle_max": _round(cycle_times.max),
+            "faults": dict(self.controller.injected),
+            "reboots": self.controller.reboots,
+            "recoveries": self.recoveries,
+            "recovering": self._restarted is not None,
+            "recovery_mean": _round(
+                self.recovery_total / self.recoveries if self.recoveries else None, 3
+            ),
+            "recovery_max": _round(self.recovery_max, 3),
+            "memory_kib": self._memory // 1024,
+            "memory_peak_kib": self._memory_peak // 1024,
+            "memory_growth_kib": (
+                (self._memory - self._memory_baseline) // 1024
+                if self._memory_baseline is not None
+                else None
+            ),
+            "memory_growth_kib_per_hour": _round(
+                slope / 1024 if slope is not None else None, 1
+            ),
+        }
+
+
+async def async_run_soak(
+    stats: SoakStats,
+    duration: float,
+    reboot_interval: float = 0.0,
+    downtime: float = 5.0,
+    step: float = 1.0,
+    drift: float = 0.05,
+    on_step: Optional[Callable[[], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """Run the fake controller for duration seconds and return the report.
+
+    Every step a fraction of the unit statuses drift and on_step runs, e.g.
+    to send commands. Every reboot_interval seconds the controller reboots
+    and stays down for downtime seconds. The caller feeds the poll cycles
+    to stats.record_cycle.
+    """
+    controller = stats.controller
+    stats.start()
+    try:
+        start = time.monotonic()
+        end = start + duration
+        next_reboot = start + reboot_interval
+        while True:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(step, remaining))
+            controller.drift(drift)
+            if on_step is not None:
+                await on_step()
+            stats.sample_memory()
+
+            now = time.monotonic()
+            if reboot_interval and now >= next_reboot and now + downtime < end:
+                await controller.reboot(downtime)
+                stats.controller_restarted()
+                next_reboot = time.monotonic() + reboot_interval
+        return stats.report()
+    finally:
+        stats.stop()
@@ -1,15 +1,22 @@
 """Tests for the Greenpoint IGH Compact API client."""
 import asyncio
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 
-from custom_components.greenpoint.api import (
+from custom_components.greenpoint.pygreenpoint.api import (
     GreenpointApiClient,
     CannotConnect,
     InvalidAuth,
+    LatencyTracker,
     validate_input,
 )
-from custom_components.greenpoint.const import ATTR_ROOMS
+from custom_components.greenpoint.const import API_UNIT, ATTR_ROOMS
+
+
+def _body(data):
+    """Return a JSON response body."""
+    return json.dumps(data).encode()
 
 
 @pytest.fixture
@@ -34,10 +41,10 @@ async def test_get_home_data(api_client, mock_session):
     """Test getting home data."""
     mock_response = MagicMock()
     mock_response.status = 200
-    mock_response.json = MagicMock(
+    mock_response.read = MagicMock(
         return_value=asyncio.Future()
     )
-    mock_response.json.return_value.set_result({
+    mock_response.read.return_value.set_result(_body({
         ATTR_ROOMS: [
             {
                 "name": "Living Room",
@@ -49,7 +56,7 @@ async def test_get_home_data(api_client, mock_session):
                 ]
             }
         ]
-    })
+    }))
     mock_session.get = MagicMock(
         return_value=asyncio.Future()
     )
@@ -69,13 +76,13 @@ async def test_get_unit_status(api_client, mock_session):
     """Test getting unit status."""
     mock_response = MagicMock()
     mock_response.status = 200
-    mock_response.json = MagicMock(
+    mock_response.read = MagicMock(
         return_value=asyncio.Future()
     )
-    mock_response.json.return_value.set_result({
+    mock_response.read.return_value.set_result(_body({
         "status": 1,
         "mode": 0,
-    })
+    }))
     mock_session.get = MagicMock(
         return_value=asyncio.Future()
     )
@@ -89,16 +96,41 @@ async def test_get_unit_status(api_client, mock_session):
     assert result["mode"] == 0
 
 
+async def test_unchanged_unit_status_is_not_decoded(api_client, mock_session):
+    """Test an identical unit response returns the previous status as is."""
+    bodies = [_body({"status": 1}), _body({"status": 1}), _body({"status": 0})]
+
+    async def _get(url):
+        response = MagicMock()
+        response.status = 200
+        response.read = MagicMock(return_value=asyncio.Future())
+        response.read.return_value.set_result(bodies.pop(0))
+        return response
+
+    mock_session.get = MagicMock(side_effect=_get)
+
+    first = await api_client.get_unit_status("light-1")
+    with patch("custom_components.greenpoint.pygreenpoint.api.json.loads") as loads:
+        second = await api_client.get_unit_status("light-1")
+    loads.assert_not_called()
+    assert second is first
+    assert api_client.unchanged_responses == 1
+
+    third = await api_client.get_unit_status("light-1")
+    assert third == {"status": 0}
+    assert third is not first
+
+
 async def test_run_scenario(api_client, mock_session):
     """Test running a scenario."""
     mock_response = MagicMock()
     mock_response.status = 200
-    mock_response.json = MagicMock(
+    mock_response.read = MagicMock(
         return_value=asyncio.Future()
     )
-    mock_response.json.return_value.set_result({
+    mock_response.read.return_value.set_result(_body({
         "success": True,
-    })
+    }))
     mock_session.get = MagicMock(
         return_value=asyncio.Future()
     )
@@ -133,3 +165,45 @@ async def test_cannot_connect(api_client, mock_session):
 
     with pytest.raises(CannotConnect):
         await api_client.get_home_data()
+
+
+def test_latency_tracker_timeout():
+    """Test the timeout follows recent latencies within its bounds."""
+    tracker = LatencyTracker()
+    assert tracker.timeout(1.0, 10.0) == 10.0
+
+    for _ in range(20):
+        tracker.add(0.05)
+    assert tracker.timeout(1.0, 10.0) == 1.0
+    assert tracker.timeout(0.1, 10.0) == pytest.approx(0.15)
+
+    for _ in range(100):
+        tracker.add(5.0)
+    assert tracker.timeout(1.0, 10.0) == 10.0
+
+
+async def test_timeout_is_recorded(api_client, mock_session):
+    """Test a timed out request counts towards the endpoint latency."""
+    async def _hang(url):
+        await asyncio.sleep(1)
+
+    api_client.timeout_ceiling = 0.01
+    mock_session.get = MagicMock(side_effect=_hang)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await api_client.get_unit_status("light-1")
+
+    assert list(api_client.latency[API_UNIT].samples) == [0.01]
+
+
+def test_request_urls_are_cached(api_client):
+    """Test request URLs are built once and rebuilt on token change."""
+    url = api_client._unit_url("light 1")
+    assert str(url) == "http://192.168.1.100:20500/unit/light%201?token=test_token"
+    assert api_client._unit_url("light 1") is url
+
+    scenario = api_client._scenario_url("Light On")
+    assert scenario.raw_query_string == "name=Light%20On&token=test_token"
+
+    api_client.token = "new token"
+    assert api_client._unit_url("light 1").raw_query_string == "token=new%20token"
@@ -0,0 +1,56 @@
+"""Tests for the Greenpoint IGH Compact library command line interface."""
+from custom_components.greenpoint.pygreenpoint import unit_kinds
+from custom_components.greenpoint.pygreenpoint.__main__ import async_main, parse_args
+
+
+def test_unit_kinds():
+    """Test units are classified by their status."""
+    assert unit_kinds({"name": "Temp"}, {"temp": 21.5}) == {"temperature"}
+    assert unit_kinds({"name": "Motion"}, {"span_second": 5}) == {"motion"}
+    assert unit_kinds({"name": "Fan"}, {"status": 0}) == {"switch"}
+    assert unit_kinds({"name": "Hall Light"}, {"status": 1}) == {"switch", "light"}
+    assert unit_kinds({"name": "Unknown"}, {}) == frozenset()
+
+
+async def test_topology(socket_enabled):
+    """Test the topology command against the fake controller."""
+    rooms = await async_main(
+        parse_args(["--fake", "--rooms", "2", "--units-per-room", "3", "topology"])
+    )
+
+    assert list(rooms) == ["Room 0", "Room 1"]
+    assert [unit["kinds"] for unit in rooms["Room 0"]] == [
+        ["temperature"],
+        ["light", "switch"],
+        ["motion"],
+    ]
+
+
+async def test_poll(socket_enabled):
+    """Test the poll command reports throughput statistics."""
+    stats = await async_main(
+        parse_args(
+            [
+                "--fake",
+                "--raw",
+                "--rate-limit",
+                "0",
+                "--concurrency",
+                "4",
+                "poll",
+                "--all",
+                "--cycles",
+                "3",
+                "--interval",
+                "0",
+                "--quiet",
+            ]
+        )
+    )
+
+    assert stats["cycles"] == 3
+    assert stats["requests"] == 300
+    assert stats["failed"] == 0
+    # Only the first cycle sees new statuses
+    assert stats["changed"] == 100
+    assert stats["cycle_max"] >= stats["cycle_p50"]
@@ -7,7 +7,7 @@ from homeassistant import config_entries, data_entry_flow
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_TOKEN
 from custom_components.greenpoint.const import DOMAIN, DEFAULT_PORT
 from custom_components.greenpoint.config_flow import ConfigFlow
-from custom_components.greenpoint.api import CannotConnect, InvalidAuth
+from custom_components.greenpoint.pygreenpoint.api import CannotConnect, InvalidAuth
 
 
 @pytest.fixture(autouse=True)
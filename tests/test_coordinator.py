@@ -0,0 +1,380 @@
+"""Tests for the Greenpoint IGH Compact data update coordinator."""
+import asyncio
+import json
+import time
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.greenpoint.coordinator import GreenpointDataUpdateCoordinator
+from custom_components.greenpoint.light import GreenpointLight
+from custom_components.greenpoint.pygreenpoint.trace import Tracer
+
+UNITS = [
+    {"name": "Temp", "fullId": "temp-1", "room_name": "Hall"},
+    {"name": "Light", "fullId": "light-1", "room_name": "Hall"},
+    {"name": "Motion", "fullId": "motion-1", "room_name": "Hall"},
+]
+
+STATUS = {
+    "temp-1": {"temp": 21.5},
+    "light-1": {"status": 1},
+    "motion-1": {"span_second": 120},
+}
+
+
+def _mock_client():
+    """Return an API client mock serving the test units."""
+    client = MagicMock()
+    client.get_all_units = AsyncMock(return_value=[dict(unit) for unit in UNITS])
+    client.get_unit_status = AsyncMock(side_effect=lambda unit_id: dict(STATUS[unit_id]))
+    return client
+
+
+async def test_first_refresh_polls_all_units(hass: HomeAssistant):
+    """Test every unit is polled on the first refresh."""
+    client = _mock_client()
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30)
+
+    data = await coordinator._async_update_data()
+
+    assert set(data["status"]) == {"temp-1", "light-1", "motion-1"}
+    assert coordinator.last_cycle["carried_over"] == 0
+
+
+async def test_units_not_due_are_skipped(hass: HomeAssistant):
+    """Test units whose interval has not elapsed are not polled again."""
+    client = _mock_client()
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30)
+    await coordinator._async_update_data()
+    client.get_unit_status.reset_mock()
+
+    await coordinator._async_update_data()
+    client.get_unit_status.assert_not_called()
+
+    await coordinator.async_request_unit_refresh("light-1")
+    await coordinator.async_shutdown()
+    await coordinator._async_update_data()
+    client.get_unit_status.assert_called_once_with("light-1")
+
+
+async def test_priority_order(hass: HomeAssistant):
+    """Test commanded and controllable units are polled first."""
+    client = _mock_client()
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30)
+    await coordinator._async_update_data()
+
+    for unit_id in STATUS:
+        coordinator.unit_schedule[unit_id].mark_due(0)
+    coordinator.unit_commanded["motion-1"] = time.monotonic()
+    client.get_unit_status.reset_mock()
+
+    await coordinator._async_update_data()
+
+    polled = [call.args[0] for call in client.get_unit_status.call_args_list]
+    assert polled == ["motion-1", "light-1", "temp-1"]
+
+
+async def test_deadline_carries_units_over(hass: HomeAssistant):
+    """Test units left when the deadline passes are polled next cycle."""
+    client = _mock_client()
+
+    async def _slow_status(unit_id):
+        await asyncio.sleep(0.05)
+        return dict(STATUS[unit_id])
+
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30, cycle_deadline=0.07)
+    await coordinator._async_update_data()
+    client.get_unit_status = AsyncMock(side_effect=_slow_status)
+    client.get_unit_status.reset_mock()
+
+    coordinator.mark_all_units_due()
+    await coordinator._async_update_data()
+    assert coordinator.last_cycle["carried_over"] == 2
+    assert client.get_unit_status.await_count == 2
+
+    await coordinator._async_update_data()
+    await coordinator._async_update_data()
+    polled = {call.args[0] for call in client.get_unit_status.call_args_list}
+    assert polled == {"temp-1", "light-1", "motion-1"}
+
+
+async def test_first_refresh_ignores_deadline(hass: HomeAssistant):
+    """Test the first refresh polls more units than one deadline covers."""
+    client = _mock_client()
+    client.get_all_units = AsyncMock(
+        return_value=[
+            {"name": f"Temp {index}", "fullId": f"temp-{index}", "room_name": "Hall"}
+            for index in range(40)
+        ]
+    )
+
+    async def _slow_status(unit_id):
+        await asyncio.sleep(0.005)
+        return {"temp": 20.0}
+
+    client.get_unit_status = AsyncMock(side_effect=_slow_status)
+    coordinator = GreenpointDataUpdateCoordinator(
+        hass, client, 30, cycle_deadline=0.05, poll_concurrency=1
+    )
+
+    await coordinator._async_update_data()
+    assert coordinator.last_cycle["carried_over"] == 0
+    assert len(coordinator.unit_status) == 40
+
+    coordinator.mark_all_units_due()
+    await coordinator._async_update_data()
+    assert coordinator.last_cycle["carried_over"] > 0
+
+
+async def test_failed_poll_keeps_serving_status(hass: HomeAssistant):
+    """Test a unit keeps its last status until it exceeds the max age."""
+    client = _mock_client()
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30, status_max_age=60)
+    await coordinator._async_update_data()
+    assert coordinator.is_unit_fresh("light-1")
+
+    client.get_unit_status = AsyncMock(side_effect=Exception("boom"))
+    coordinator.unit_schedule["light-1"].mark_due(0)
+    await coordinator._async_update_data()
+    assert coordinator.unit_status["light-1"] == {"status": 1}
+    assert coordinator.is_unit_fresh("light-1")
+
+    coordinator.unit_updated["light-1"] -= timedelta(seconds=61)
+    assert not coordinator.is_unit_fresh("light-1")
+    assert not coordinator.is_unit_fresh("unknown-1")
+
+
+async def test_failed_units_back_off(hass: HomeAssistant):
+    """Test a unit whose polls fail is not retried on every tick."""
+    client = _mock_client()
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30)
+    await coordinator._async_update_data()
+
+    client.get_unit_status = AsyncMock(side_effect=Exception("boom"))
+    coordinator.mark_all_units_due()
+    await coordinator._async_update_data()
+    assert coordinator.last_cycle["failed"] == 3
+
+    await coordinator._async_update_data()
+    assert coordinator.last_cycle["due"] == 0
+    assert coordinator.unit_schedule["light-1"].failures == 1
+
+
+async def test_idle_refresh_skips_listeners(hass: HomeAssistant):
+    """Test listeners only hear of refreshes that polled or expired units."""
+    client = _mock_client()
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30, status_max_age=60)
+    listener = MagicMock()
+    remove_listener = coordinator.async_add_listener(listener)
+
+    await coordinator.async_refresh()
+    assert listener.call_count == 1
+
+    await coordinator.async_refresh()
+    assert listener.call_count == 1
+
+    coordinator.unit_updated["temp-1"] -= timedelta(seconds=61)
+    await coordinator.async_refresh()
+    assert coordinator.last_cycle["expired"] == 1
+    assert listener.call_count == 2
+
+    coordinator.mark_all_units_due()
+    await coordinator.async_refresh()
+    remove_listener()
+    assert listener.call_count == 3
+
+
+async def test_room_coordinators_isolate_failures(hass: HomeAssistant):
+    """Test a failing room does not affect the other rooms."""
+    client = _mock_client()
+    client.get_all_units = AsyncMock(
+        return_value=[
+            {"name": "Temp", "fullId": "temp-1", "room_name": "Hall"},
+            {"name": "Light", "fullId": "light-1", "room_name": "Kitchen"},
+        ]
+    )
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30)
+    await coordinator.async_refresh()
+    coordinator.async_setup_room_coordinators()
+    assert coordinator.update_interval is None
+
+    hall = coordinator.coordinator_for_unit("temp-1")
+    kitchen = coordinator.coordinator_for_unit("light-1")
+    assert hall is not kitchen
+    assert coordinator.coordinator_for_room("Hall") is hall
+
+    def _status(unit_id):
+        if unit_id == "light-1":
+            raise Exception("boom")
+        return dict(STATUS[unit_id])
+
+    client.get_unit_status = AsyncMock(side_effect=_status)
+    coordinator.mark_all_units_due()
+    await hall.async_refresh()
+    await kitchen.async_refresh()
+
+    assert hall.last_update_success
+    # Failed polls do not fail the refresh, so listeners keep hearing of it
+    assert kitchen.last_update_success
+    assert hall.last_cycle["failed"] == 0
+    assert kitchen.last_cycle["failed"] == 1
+    assert [call.args[0] for call in client.get_unit_status.call_args_list] == [
+        "temp-1",
+        "light-1",
+    ]
+
+
+async def test_room_down_past_max_age_goes_unavailable(hass: HomeAssistant):
+    """Test the entities of a room that stays down become unavailable."""
+    client = _mock_client()
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30, status_max_age=60)
+    await coordinator.async_refresh()
+    coordinator.async_setup_room_coordinators()
+    hall = coordinator.coordinator_for_room("Hall")
+
+    light = GreenpointLight(hall, coordinator.get_device("light-1"))
+    light.async_write_ha_state = MagicMock()
+    remove_listener = hall.async_add_listener(light._handle_coordinator_update)
+    assert light.available
+
+    client.get_unit_status = AsyncMock(side_effect=Exception("boom"))
+    for _ in range(4):
+        coordinator.mark_all_units_due()
+        await hall.async_refresh()
+    assert light.async_write_ha_state.call_count == 4
+    assert light.available
+
+    coordinator.unit_updated["light-1"] -= timedelta(seconds=61)
+    coordinator.mark_all_units_due()
+    await hall.async_refresh()
+    remove_listener()
+
+    assert not light.available
+    assert light.is_on is None
+
+
+async def test_stale_units_leave_room_aggregates(hass: HomeAssistant):
+    """Test a unit past the max age stops counting towards its room."""
+    client = _mock_client()
+    client.get_all_units = AsyncMock(
+        return_value=[
+            dict(UNITS[0]),
+            {"name": "Temp 2", "fullId": "temp-2", "room_name": "Hall"},
+        ]
+    )
+    statuses = {"temp-1": {"temp": 20.0}, "temp-2": {"temp": 30.0}}
+    client.get_unit_status = AsyncMock(side_effect=lambda unit_id: statuses[unit_id])
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30, status_max_age=60)
+    await coordinator._async_update_data()
+    hall = coordinator.rooms.rooms["Hall"]
+    assert hall.average_temperature == 25.0
+
+    coordinator.unit_updated["temp-2"] -= timedelta(seconds=61)
+    await coordinator._async_update_data()
+    assert hall.average_temperature == 20.0
+    assert hall.fresh
+
+    coordinator.unit_updated["temp-1"] -= timedelta(seconds=61)
+    await coordinator._async_update_data()
+    assert hall.average_temperature is None
+    assert not hall.fresh
+
+    # A unit answering again rejoins its room, even with an unchanged status
+    coordinator.mark_all_units_due()
+    await coordinator._async_update_data()
+    assert hall.average_temperature == 25.0
+    assert hall.fresh
+
+
+async def test_unchanged_status_is_not_diffed(hass: HomeAssistant):
+    """Test a status returned unchanged by the client counts as no change."""
+    client = _mock_client()
+    statuses = {unit_id: dict(status) for unit_id, status in STATUS.items()}
+    client.get_unit_status = AsyncMock(side_effect=lambda unit_id: statuses[unit_id])
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30)
+    await coordinator._async_update_data()
+    updated = dict(coordinator.unit_updated)
+
+    coordinator.mark_all_units_due()
+    await coordinator._async_update_data()
+
+    assert coordinator.last_cycle["changed"] == 0
+    assert coordinator.unit_status["light-1"] is statuses["light-1"]
+    assert coordinator.unit_updated["light-1"] > updated["light-1"]
+
+
+async def test_excluded_units_are_never_polled(hass: HomeAssistant):
+    """Test excluded units and rooms cost no requests and keep no state."""
+    client = _mock_client()
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30)
+    coordinator.set_exclusions([], ["motion-1"])
+
+    await coordinator._async_update_data()
+
+    polled = {call.args[0] for call in client.get_unit_status.await_args_list}
+    assert polled == {"temp-1", "light-1"}
+    assert set(coordinator.all_units) == {"temp-1", "light-1", "motion-1"}
+    assert coordinator.rooms.rooms["Hall"].average_temperature == 21.5
+
+    coordinator.set_exclusions(["Hall"], [])
+    assert coordinator.units == {}
+    assert coordinator.unit_status == {}
+    assert coordinator.rooms.rooms == {}
+
+
+async def test_topology_loaded_once_with_no_units(hass: HomeAssistant):
+    """Test the topology is not fetched again when no unit is polled."""
+    client = _mock_client()
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30)
+    coordinator.set_exclusions(["Hall"], [])
+
+    await coordinator._async_update_data()
+    await coordinator._async_update_data()
+
+    assert not coordinator.units
+    client.get_all_units.assert_awaited_once()
+    client.get_unit_status.assert_not_called()
+
+
+async def test_room_scenario_units(hass: HomeAssistant):
+    """Test a room-wide scenario maps to the switches of the room."""
+    coordinator = GreenpointDataUpdateCoordinator(hass, _mock_client(), 30)
+    await coordinator._async_update_data()
+
+    assert coordinator.get_scenario_units("Light Off") == ["light-1"]
+    assert coordinator.get_scenario_units("Hall All Off") == ["light-1"]
+    assert coordinator.get_scenario_units("Attic All On") == []
+
+
+async def test_devices_are_shared(hass: HomeAssistant):
+    """Test every platform gets the same device object for a unit."""
+    coordinator = GreenpointDataUpdateCoordinator(hass, _mock_client(), 30)
+    await coordinator._async_update_data()
+
+    device = coordinator.get_device("light-1")
+    assert coordinator.get_device("light-1") is device
+    assert device.full_name == "Hall Light"
+    assert device.device_info["name"] == "Hall Light"
+
+
+async def test_refresh_is_traced(hass: HomeAssistant, tmp_path):
+    """Test a refresh writes a poll cycle span enclosing its entity updates."""
+    client = _mock_client()
+    path = tmp_path / "trace.json"
+    client.tracer = Tracer(str(path))
+    coordinator = GreenpointDataUpdateCoordinator(hass, client, 30)
+    remove_listener = coordinator.async_add_listener(lambda: None)
+
+    await coordinator.async_refresh()
+    remove_listener()
+
+    events = json.loads(path.read_text().rstrip(",\n") + "]")
+    spans = {event["name"]: event for event in events if event["ph"] == "X"}
+    cycle, updates = spans["poll cycle"], spans["entity updates"]
+    assert cycle["tid"] == updates["tid"] == 0
+    assert cycle["ts"] <= updates["ts"]
+    assert updates["ts"] + updates["dur"] <= cycle["ts"] + cycle["dur"]
+    assert updates["args"] == {"listeners": 1}
+    assert spans["poll units"]["args"]["due"] == 3
@@ -0,0 +1,64 @@
+"""Tests for the Greenpoint IGH Compact device entities."""
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from custom_components.greenpoint.binary_sensor import GreenpointRoomMotionSensor
+from custom_components.greenpoint.device import GreenpointDevice
+from custom_components.greenpoint.pygreenpoint.rooms import RoomAggregator
+from custom_components.greenpoint.switch import GreenpointSwitch
+
+
+def test_unit_state_resolved_once_per_update():
+    """Test property reads use the state resolved on the last update."""
+    coordinator = MagicMock()
+    coordinator.is_unit_fresh.return_value = True
+    coordinator.unit_status = {"1-0-1": {"status": 1}}
+    updated = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    coordinator.unit_updated = {"1-0-1": updated}
+    device = GreenpointDevice("1-0-1", {"name": "Fan", "room_name": "Hall"})
+    switch = GreenpointSwitch(coordinator, device)
+    switch.async_write_ha_state = MagicMock()
+
+    assert switch.name == "Hall Fan Switch"
+    for _ in range(3):
+        assert switch.available
+        assert switch.is_on
+        assert switch.extra_state_attributes == {"last_updated": updated.isoformat()}
+    coordinator.is_unit_fresh.assert_called_once_with("1-0-1")
+
+    coordinator.unit_status["1-0-1"] = {"status": 0}
+    switch._handle_coordinator_update()
+    switch.async_write_ha_state.assert_called_once()
+    assert switch.is_on is False
+
+    coordinator.is_unit_fresh.return_value = False
+    switch._handle_coordinator_update()
+    assert not switch.available
+    assert switch.is_on is None
+    assert switch.device_status == {}
+    assert coordinator.is_unit_fresh.call_count == 3
+
+
+def test_room_entity_writes_aggregate_changes():
+    """Test a room entity writes state only when its aggregate changes."""
+    coordinator = MagicMock()
+    coordinator.rooms = RoomAggregator()
+    coordinator.rooms.set_topology({"motion-1": {"name": "Motion", "room_name": "Hall"}})
+    coordinator.rooms.update_unit("motion-1", None, {"span_second": 120})
+    motion = GreenpointRoomMotionSensor(coordinator, "Hall")
+    motion.async_write_ha_state = MagicMock()
+    motion._written_value = (motion.available, motion.aggregate_value)
+    assert motion.is_on is False
+
+    motion._handle_coordinator_update()
+    motion.async_write_ha_state.assert_not_called()
+
+    coordinator.rooms.update_unit("motion-1", {"span_second": 120}, {"span_second": 5})
+    motion._handle_coordinator_update()
+    assert motion.is_on
+    motion.async_write_ha_state.assert_called_once()
+
+    coordinator.rooms.remove_unit("motion-1", {"span_second": 5})
+    motion._handle_coordinator_update()
+    assert not motion.available
+    assert motion.async_write_ha_state.call_count == 2
@@ -1,5 +1,5 @@
 """Tests for the Greenpoint IGH Compact integration setup."""
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -8,7 +8,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.setup import async_setup_component
 
 from custom_components.greenpoint.const import DOMAIN
-from custom_components.greenpoint.api import CannotConnect, InvalidAuth
+from custom_components.greenpoint.pygreenpoint.api import CannotConnect, InvalidAuth
 
 
 async def test_setup_entry(hass: HomeAssistant):
@@ -35,7 +35,7 @@ async def test_setup_entry(hass: HomeAssistant):
 
     # Patch the API client and coordinator
     with patch(
-        "custom_components.greenpoint.api.GreenpointApiClient",
+        "custom_components.greenpoint.pygreenpoint.api.GreenpointApiClient",
         return_value=mock_client,
     ), patch(
         "custom_components.greenpoint.coordinator.GreenpointDataUpdateCoordinator",
@@ -70,7 +70,7 @@ async def test_setup_entry_cannot_connect(hass: HomeAssistant):
 
     # Patch the API client
     with patch(
-        "custom_components.greenpoint.api.GreenpointApiClient",
+        "custom_components.greenpoint.pygreenpoint.api.GreenpointApiClient",
         return_value=mock_client,
     ), pytest.raises(Exception):
         # Test setup with connection error
@@ -97,7 +97,7 @@ async def test_setup_entry_invalid_auth(hass: HomeAssistant):
 
     # Patch the API client
     with patch(
-        "custom_components.greenpoint.api.GreenpointApiClient",
+        "custom_components.greenpoint.pygreenpoint.api.GreenpointApiClient",
         return_value=mock_client,
     ):
         # Test setup with invalid auth
@@ -125,3 +125,45 @@ async def test_unload_entry(hass: HomeAssistant):
 
         assert await async_unload_entry(hass, entry)
         assert entry.entry_id not in hass.data[DOMAIN]
+
+
+async def test_options_update_applied_live(hass: HomeAssistant):
+    """Test polling options are applied live and a new token reloads."""
+    from custom_components.greenpoint import ENTITY_OPTIONS, options_update_listener
+
+    entry = MagicMock()
+    entry.data = {"host": "192.168.1.100", "port": 20500, "token": "test_token"}
+    entry.entry_id = "test_entry_id"
+    # The options form submits every default along with the changed options
+    entry.options = {
+        **ENTITY_OPTIONS,
+        "scan_interval": 60,
+        "rate_limit": 5.0,
+        "temp_deadband": 0.2,
+        "temp_heartbeat": 900,
+        "temp_stats_window": 20,
+    }
+
+    coordinator = MagicMock()
+    coordinator.api.host, coordinator.api.port = "192.168.1.100", 20500
+    coordinator.api.token = "test_token"
+    coordinator.api.transport = None
+    coordinator.api.tracer.enabled = False
+    # Set up before any options were saved
+    coordinator.entity_options = dict(ENTITY_OPTIONS)
+    coordinator.async_apply_settings = AsyncMock()
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    with patch.object(hass.config_entries, "async_reload", AsyncMock()) as async_reload:
+        await options_update_listener(hass, entry)
+        async_reload.assert_not_awaited()
+        coordinator.api.limiter.set_rate.assert_called_with(5.0)
+        settings = coordinator.async_apply_settings.await_args.kwargs
+        assert settings["update_interval"] == 60
+        coordinator.apply_temperature_filters.assert_called_with(
+            deadband=0.2, heartbeat=900, stats_window=20
+        )
+
+        entry.data = {**entry.data, "token": "new_token"}
+        await options_update_listener(hass, entry)
+        async_reload.assert_awaited_once_with(entry.entry_id)
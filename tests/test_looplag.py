@@ -0,0 +1,67 @@
+"""Tests for the Greenpoint IGH Compact event loop block monitor."""
+import asyncio
+import time
+
+import pytest
+
+from custom_components.greenpoint.pygreenpoint.looplag import LoopMonitor
+
+
+async def test_slices_are_timed():
+    """Test each synchronous slice is timed and long ones count as blocking."""
+    monitor = LoopMonitor(threshold=0.02)
+
+    async def _work():
+        time.sleep(0.03)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return "done"
+
+    assert await monitor.timed("poll", _work()) == "done"
+    with monitor.block("state writes"):
+        pass
+
+    poll = monitor.sections["poll"]
+    assert poll.slices == 3
+    assert poll.blocked == 1
+    assert poll.worst >= 0.03
+    assert monitor.as_dict()["sections"]["state writes"]["blocked"] == 0
+
+
+async def test_errors_and_cancellation_pass_through():
+    """Test errors raised in and delivered to a timed coroutine propagate."""
+    monitor = LoopMonitor(threshold=1.0)
+
+    async def _fail():
+        await asyncio.sleep(0)
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError):
+        await monitor.timed("command", _fail())
+
+    cancelled = []
+
+    async def _wait():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    task = asyncio.ensure_future(monitor.timed("command", _wait()))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert cancelled == [True]
+
+
+def test_disabled_monitor():
+    """Test a monitor without a threshold passes awaitables through."""
+    monitor = LoopMonitor()
+    awaitable = asyncio.sleep(0)
+    assert monitor.timed("poll", awaitable) is awaitable
+    awaitable.close()
+    with monitor.block("state writes"):
+        pass
+    assert monitor.sections == {}
@@ -0,0 +1,74 @@
+"""Tests for the Greenpoint IGH Compact rate limiter."""
+import asyncio
+
+from custom_components.greenpoint.pygreenpoint.ratelimit import TokenBucket, shared_limiter
+
+
+async def test_rate_and_priority():
+    """Test waiters are spaced out and priority waiters go first."""
+    bucket = TokenBucket(rate=50, burst=1)
+    await bucket.acquire()
+    assert bucket.waits[False] == 0
+
+    order = []
+
+    async def _acquire(name, priority):
+        await bucket.acquire(priority)
+        order.append(name)
+
+    polls = [asyncio.create_task(_acquire(f"poll-{i}", False)) for i in range(2)]
+    await asyncio.sleep(0)
+    command = asyncio.create_task(_acquire("command", True))
+    await asyncio.gather(command, *polls)
+
+    assert order == ["command", "poll-0", "poll-1"]
+    assert bucket.waits == {True: 1, False: 2}
+    assert bucket.wait_time[False] >= 0.03
+    assert bucket.as_dict()["waiting"] == 0
+
+
+async def test_cancelled_waiter():
+    """Test a cancelled waiter leaves the queue."""
+    bucket = TokenBucket(rate=1, burst=1)
+    await bucket.acquire()
+    task = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert bucket.as_dict()["waiting"] == 0
+
+
+async def test_rate_change_reschedules_waiters():
+    """Test waiters are woken at the new rate after a rate change."""
+    bucket = TokenBucket(rate=0.1, burst=1)
+    await bucket.acquire()
+    task = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0)
+
+    bucket.set_rate(100, burst=1)
+    await asyncio.wait_for(task, 1)
+
+    task = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0)
+    bucket.set_rate(0)
+    await asyncio.wait_for(task, 1)
+    assert bucket.as_dict()["waiting"] == 0
+
+
+async def test_disabled():
+    """Test a rate of 0 never waits."""
+    bucket = TokenBucket(rate=0)
+    for _ in range(100):
+        await bucket.acquire()
+    assert bucket.waits[False] == 0
+
+
+def test_shared_limiter():
+    """Test clients of one controller share a limiter."""
+    limiter = shared_limiter("10.0.0.1", 20500, 5)
+    assert shared_limiter("10.0.0.1", 20500) is limiter
+    assert limiter.rate == 5
+    assert shared_limiter("10.0.0.1", 20500, 2) is limiter
+    assert limiter.rate == 2
+    assert shared_limiter("10.0.0.2", 20500) is not limiter
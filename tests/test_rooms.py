@@ -0,0 +1,85 @@
+"""Tests for the Greenpoint IGH Compact room aggregates."""
+from custom_components.greenpoint.pygreenpoint.rooms import RoomAggregator
+
+UNITS = {
+    "temp-1": {"name": "Temp 1", "room_name": "Hall"},
+    "temp-2": {"name": "Temp 2", "room_name": "Hall"},
+    "motion-1": {"name": "Motion", "room_name": "Hall"},
+    "temp-3": {"name": "Temp", "room_name": "Kitchen"},
+    "light-1": {"name": "Light", "room_name": "Kitchen"},
+    "fan-1": {"name": "Fan", "room_name": "Kitchen"},
+}
+
+
+def test_average_temperature():
+    """Test the room average follows unit changes."""
+    aggregator = RoomAggregator()
+    aggregator.set_topology(UNITS)
+
+    assert aggregator.update_unit("temp-1", None, {"temp": 20.0})
+    assert aggregator.update_unit("temp-2", None, {"temp": 22.0})
+    assert aggregator.rooms["Hall"].average_temperature == 21.0
+
+    assert aggregator.update_unit("temp-2", {"temp": 22.0}, {"temp": 24.0})
+    assert aggregator.rooms["Hall"].average_temperature == 22.0
+    assert not aggregator.update_unit("temp-2", {"temp": 24.0}, {"temp": 24.0})
+
+    assert aggregator.rooms["Kitchen"].average_temperature is None
+
+
+def test_any_motion():
+    """Test the room reports motion while any sensor detects it."""
+    aggregator = RoomAggregator()
+    aggregator.set_topology(UNITS)
+
+    assert not aggregator.update_unit("motion-1", None, {"span_second": 120})
+    assert not aggregator.rooms["Hall"].motion
+    assert "motion-1" in aggregator.rooms["Hall"].motion_units
+
+    assert aggregator.update_unit("motion-1", {"span_second": 120}, {"span_second": 5})
+    assert aggregator.rooms["Hall"].motion
+
+    assert aggregator.update_unit("motion-1", {"span_second": 5}, {"span_second": 60})
+    assert not aggregator.rooms["Hall"].motion
+
+
+def test_any_switch_on():
+    """Test the room tracks its switches, lights and whether any is on."""
+    aggregator = RoomAggregator()
+    aggregator.set_topology(UNITS)
+
+    assert not aggregator.update_unit("light-1", None, {"status": 0})
+    assert aggregator.update_unit("fan-1", None, {"status": 1})
+    kitchen = aggregator.rooms["Kitchen"]
+    assert kitchen.switch_units == {"light-1", "fan-1"}
+    assert kitchen.light_units == {"light-1"}
+    assert kitchen.any_on
+
+    assert aggregator.update_unit("fan-1", {"status": 1}, {"status": 0})
+    assert not kitchen.any_on
+    assert not aggregator.rooms["Hall"].switch_units
+
+
+def test_remove_stale_unit():
+    """Test a stale unit's readings leave its room until it reports again."""
+    aggregator = RoomAggregator()
+    aggregator.set_topology(UNITS)
+    aggregator.update_unit("temp-1", None, {"temp": 20.0})
+    aggregator.update_unit("temp-2", None, {"temp": 22.0})
+    aggregator.update_unit("motion-1", None, {"span_second": 5})
+    hall = aggregator.rooms["Hall"]
+
+    assert aggregator.remove_unit("motion-1", {"span_second": 5})
+    assert aggregator.remove_unit("temp-2", {"temp": 22.0})
+    assert not hall.motion
+    assert hall.average_temperature == 20.0
+    assert hall.fresh
+
+    assert aggregator.remove_unit("temp-1", {"temp": 20.0})
+    assert hall.average_temperature is None
+    assert not hall.fresh
+    assert hall.temp_units == {"temp-1", "temp-2"}
+
+    assert aggregator.update_unit("temp-1", None, {"temp": 21.0})
+    assert hall.average_temperature == 21.0
+    assert hall.fresh
@@ -0,0 +1,66 @@
+"""Tests for the Greenpoint IGH Compact poll scheduler."""
+from custom_components.greenpoint.pygreenpoint.scheduler import UnitPollState
+
+
+def test_quiet_unit_backs_off():
+    """Test a unit that never changes drifts to the maximum interval."""
+    state = UnitPollState(30, 10, 300, now=0)
+
+    now = 0.0
+    for _ in range(20):
+        assert state.is_due(now)
+        state.record_poll(False, now)
+        now = state.next_poll
+
+    assert state.interval == 300
+
+
+def test_busy_unit_speeds_up():
+    """Test a unit that changes on every poll drifts to the minimum interval."""
+    state = UnitPollState(30, 10, 300, now=0)
+
+    now = 0.0
+    for _ in range(20):
+        state.record_poll(True, now)
+        now = state.next_poll
+
+    assert state.interval == 10
+    assert state.changes == 20
+
+
+def test_mark_due():
+    """Test a unit can be forced onto the next cycle."""
+    state = UnitPollState(30, 10, 300, now=0)
+    state.record_poll(False, 0)
+    assert not state.is_due(1)
+
+    state.mark_due(1)
+    assert state.is_due(1)
+
+
+def test_set_bounds_reschedules():
+    """Test narrower bounds clamp the interval and bring the next poll forward."""
+    state = UnitPollState(30, 10, 300, now=0)
+    state.record_poll(False, 0)
+    state.record_poll(False, 200)
+    assert state.interval == 100
+    assert state.next_poll == 300
+
+    state.set_bounds(10, 40)
+    assert state.interval == 40
+    assert state.next_poll == 240
+
+
+def test_failed_unit_backs_off():
+    """Test failed polls double the wait up to the maximum interval."""
+    state = UnitPollState(30, 10, 300, now=0)
+
+    waits = []
+    for _ in range(7):
+        state.record_failure(0)
+        waits.append(state.next_poll)
+    assert waits == [10, 20, 40, 80, 160, 300, 300]
+
+    state.record_poll(False, 0)
+    assert state.failures == 0
+    assert state.next_poll == state.interval
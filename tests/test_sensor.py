@@ -0,0 +1,105 @@
+"""Tests for the Greenpoint IGH Compact sensors."""
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from custom_components.greenpoint.device import GreenpointDevice
+from custom_components.greenpoint.sensor import GreenpointTemperatureSensor
+
+
+def _sensor(status, deadband=0.5, heartbeat=900):
+    """Return a temperature sensor backed by a mock coordinator."""
+    coordinator = MagicMock()
+    coordinator.is_unit_fresh.return_value = True
+    coordinator.data = {"status": {"temp-1": status}}
+    coordinator.unit_status = coordinator.data["status"]
+    coordinator.unit_updated = {}
+    device = GreenpointDevice("temp-1", {"name": "Temp", "room_name": "Hall"})
+    sensor = GreenpointTemperatureSensor(coordinator, device, deadband, heartbeat)
+    sensor.async_write_ha_state = MagicMock()
+    return sensor
+
+
+def test_small_changes_are_not_written():
+    """Test changes within the deadband do not write state."""
+    status = {"temp": 21.0}
+    sensor = _sensor(status)
+    assert sensor.native_value == 21.0
+
+    status["temp"] = 21.3
+    sensor._handle_coordinator_update()
+    sensor.async_write_ha_state.assert_not_called()
+    assert sensor.native_value == 21.0
+
+    status["temp"] = 21.6
+    sensor._handle_coordinator_update()
+    sensor.async_write_ha_state.assert_called_once()
+    assert sensor.native_value == 21.6
+
+
+def test_heartbeat_writes_state():
+    """Test the value is republished once the heartbeat has passed."""
+    status = {"temp": 21.0}
+    sensor = _sensor(status, heartbeat=60)
+
+    status["temp"] = 21.1
+    with patch("custom_components.greenpoint.sensor.time.monotonic") as monotonic:
+        monotonic.return_value = sensor._published_at + 61
+        sensor._handle_coordinator_update()
+
+    sensor.async_write_ha_state.assert_called_once()
+    assert sensor.native_value == 21.1
+
+
+def test_unavailable_is_always_written():
+    """Test losing the unit status is written immediately."""
+    sensor = _sensor({"temp": 21.0})
+
+    sensor.coordinator.is_unit_fresh.return_value = False
+    sensor._handle_coordinator_update()
+
+    sensor.async_write_ha_state.assert_called_once()
+    assert sensor.native_value is None
+
+
+def test_rolling_statistics_attributes():
+    """Test each new poll feeds the rolling statistics."""
+    status = {"temp": 20.0}
+    sensor = _sensor(status)
+
+    for minute, temp in enumerate((20.0, 21.0, 19.0)):
+        status["temp"] = temp
+        sensor.coordinator.unit_updated["temp-1"] = datetime(
+            2024, 1, 1, 12, minute, tzinfo=timezone.utc
+        )
+        sensor._handle_coordinator_update()
+    # A coordinator update without a new poll adds nothing
+    sensor._handle_coordinator_update()
+
+    attributes = sensor.extra_state_attributes
+    assert len(sensor.stats) == 3
+    assert attributes["temperature_min"] == 19.0
+    assert attributes["temperature_max"] == 21.0
+    assert attributes["temperature_mean"] == 20.0
+    assert attributes["temperature_rate"] == -30.0
+
+
+def test_filters_applied_live():
+    """Test new filter options apply to a sensor, keeping recent readings."""
+    status = {"temp": 20.0}
+    sensor = _sensor(status)
+    for minute, temp in enumerate((20.0, 21.0, 22.0)):
+        status["temp"] = temp
+        sensor.coordinator.unit_updated["temp-1"] = datetime(
+            2024, 1, 1, 12, minute, tzinfo=timezone.utc
+        )
+        sensor._handle_coordinator_update()
+
+    sensor.set_filters(deadband=5.0, heartbeat=60, stats_window=2)
+
+    assert (sensor.deadband, sensor.heartbeat) == (5.0, 60)
+    assert len(sensor.stats) == 2
+    assert sensor.stats.minimum == 21.0
+    sensor.async_write_ha_state.reset_mock()
+    status["temp"] = 24.0
+    sensor._handle_coordinator_update()
+    sensor.async_write_ha_state.assert_not_called()
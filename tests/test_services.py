@@ -0,0 +1,105 @@
+"""Tests for the Greenpoint IGH Compact services."""
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.greenpoint.const import DOMAIN
+from custom_components.greenpoint.pygreenpoint.looplag import LoopMonitor
+from custom_components.greenpoint.services import (
+    SERVICE_PROFILE,
+    SERVICE_RUN_SCENARIOS,
+    async_setup_services,
+    async_unload_services,
+)
+
+
+async def test_run_scenarios(hass: HomeAssistant):
+    """Test scenarios run in order with a single refresh afterwards."""
+    coordinator = MagicMock()
+    coordinator.api.run_scenario = AsyncMock(
+        side_effect=[{}, Exception("unknown scenario"), {}]
+    )
+    coordinator.get_scenario_units = MagicMock(return_value=["light-1"])
+    coordinator.async_refresh = AsyncMock()
+    coordinator.monitor = LoopMonitor(threshold=1.0)
+    hass.data[DOMAIN] = {"test_entry_id": coordinator}
+
+    await async_setup_services(hass)
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_RUN_SCENARIOS,
+        {"scenarios": ["Light On", "Missing On", "Fan Off"]},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert [call.args[0] for call in coordinator.api.run_scenario.call_args_list] == [
+        "Light On",
+        "Missing On",
+        "Fan Off",
+    ]
+    assert [result["success"] for result in response["results"]] == [True, False, True]
+    assert response["results"][1]["error"] == "unknown scenario"
+    coordinator.mark_unit_commanded.assert_called_with("light-1")
+    coordinator.mark_all_units_due.assert_not_called()
+    coordinator.async_refresh.assert_awaited_once()
+    assert coordinator.monitor.sections["command"].slices == 3
+
+    hass.data[DOMAIN] = {}
+    await async_unload_services(hass)
+    assert not hass.services.has_service(DOMAIN, SERVICE_RUN_SCENARIOS)
+
+
+async def test_run_scene_scenario_polls_all_units(hass: HomeAssistant):
+    """Test a scenario controlling unknown units polls every unit."""
+    coordinator = MagicMock()
+    coordinator.api.run_scenario = AsyncMock(return_value={})
+    coordinator.get_scenario_units = MagicMock(
+        side_effect=lambda scenario: ["light-1"] if scenario == "Light On" else []
+    )
+    coordinator.async_refresh = AsyncMock()
+    coordinator.monitor = LoopMonitor()
+    hass.data[DOMAIN] = {"test_entry_id": coordinator}
+
+    await async_setup_services(hass)
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_RUN_SCENARIOS,
+        {"scenarios": ["Light On", "Good Night"]},
+        blocking=True,
+    )
+
+    coordinator.mark_unit_commanded.assert_called_once_with("light-1")
+    coordinator.mark_all_units_due.assert_called_once()
+    coordinator.async_refresh.assert_awaited_once()
+
+
+async def test_profile(hass: HomeAssistant, tmp_path):
+    """Test profiling writes a stats file and reports a breakdown."""
+    hass.config.config_dir = str(tmp_path)
+    coordinator = MagicMock()
+    coordinator.api.http_time = 0.0
+    coordinator.api.decode_time = 0.0
+    coordinator.listener_time = 0.0
+    coordinator.last_cycle = {"duration": 0.5}
+
+    async def _refresh():
+        # Two requests in flight at once for the whole cycle
+        coordinator.api.http_time += 1.0
+
+    coordinator.async_refresh = AsyncMock(side_effect=_refresh)
+    hass.data[DOMAIN] = {"test_entry_id": coordinator}
+
+    await async_setup_services(hass)
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_PROFILE, {"cycles": 3}, blocking=True, return_response=True
+    )
+
+    assert coordinator.async_refresh.await_count == 3
+    assert coordinator.mark_all_units_due.call_count == 3
+    assert response["cycles"] == 3
+    assert response["polling"] == 1.5
+    assert response["http_requests"] == 3.0
+    assert os.path.exists(response["path"])
+    assert os.path.dirname(response["path"]) == str(tmp_path)
@@ -0,0 +1,189 @@
+"""Soak test of the Greenpoint IGH Compact integration.
+
+Runs the whole integration, coordinator and all four platforms, against
+the fake controller while it injects faults and reboots. It only runs
+when a duration in seconds is set, so the default test run stays quick;
+the soak statistics themselves are always tested.
+Print the report with -s:
+
+    GREENPOINT_SOAK_DURATION=5 pytest tests/test_soak.py -s
+    GREENPOINT_SOAK_DURATION=14400 GREENPOINT_SOAK_REBOOT_INTERVAL=900 \
+        pytest tests/test_soak.py -s
+"""
+import json
+import os
+import random
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.greenpoint import PLATFORMS
+from custom_components.greenpoint.const import (
+    CONF_CYCLE_DEADLINE,
+    CONF_HOST,
+    CONF_MAX_UNIT_INTERVAL,
+    CONF_MIN_UNIT_INTERVAL,
+    CONF_PORT,
+    CONF_RATE_LIMIT,
+    CONF_ROOM_SWITCHES,
+    CONF_SCAN_INTERVAL,
+    CONF_TIMEOUT_CEILING,
+    CONF_TOKEN,
+    CONF_TRANSPORT,
+    DOMAIN,
+    TRANSPORT_AIOHTTP,
+    TRANSPORT_RAW,
+)
+from custom_components.greenpoint.pygreenpoint.fake import FakeController, Faults
+
+from . import soak
+from .soak import HISTOGRAM_GROWTH, Histogram, SoakStats, async_run_soak
+
+SOAK_DURATION = float(os.environ.get("GREENPOINT_SOAK_DURATION", "0"))
+SOAK_REBOOT_INTERVAL = float(os.environ.get("GREENPOINT_SOAK_REBOOT_INTERVAL", "2"))
+SOAK_DOWNTIME = float(os.environ.get("GREENPOINT_SOAK_DOWNTIME", "0.5"))
+SOAK_WARMUP = float(os.environ.get("GREENPOINT_SOAK_WARMUP", "1"))
+SOAK_FAULT_RATE = float(os.environ.get("GREENPOINT_SOAK_FAULT_RATE", "0.02"))
+
+
+
+def test_histogram_percentiles():
+    """Test percentiles come from the bucket holding them, within 5%."""
+    histogram = Histogram()
+    assert histogram.percentile(50) is None
+    for value in range(1, 101):
+        histogram.add(value / 100)
+
+    assert histogram.count == 100
+    assert histogram.max == 1.0
+    assert 0.5 <= histogram.percentile(50) <= 0.5 * HISTOGRAM_GROWTH
+    assert 0.95 <= histogram.percentile(95) <= 0.95 * HISTOGRAM_GROWTH
+    assert histogram.percentile(100) == 1.0
+
+
+def test_memory_growth_fit(monkeypatch):
+    """Test the memory growth fitted to the samples taken after the warmup."""
+    clock = [0.0]
+    memory = [0]
+    monkeypatch.setattr(soak.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(soak.tracemalloc, "is_tracing", lambda: True)
+    monkeypatch.setattr(
+        soak.tracemalloc, "get_traced_memory", lambda: (memory[0], memory[0])
+    )
+    stats = SoakStats(FakeController(rooms=1, units_per_room=1), warmup=1800)
+    assert stats.report()["memory_growth_kib_per_hour"] is None
+
+    # Memory grows 1 MiB an hour from 10 MiB; the first half hour is warmup
+    for minute in range(0, 121, 10):
+        clock[0] = minute * 60.0
+        memory[0] = 1024 * 1024 * 10 + 1024 * 1024 * minute // 60
+        stats.sample_memory()
+
+    report = stats.report()
+    assert report["memory_growth_kib_per_hour"] == pytest.approx(1024)
+    assert report["memory_growth_kib"] == 1536
+    assert report["memory_peak_kib"] == 12 * 1024
+
+
+async def test_run_soak_smoke(socket_enabled):
+    """Test a short run records cycles and reboots the controller."""
+    controller = FakeController(rooms=1, units_per_room=2)
+    await controller.start()
+    stats = SoakStats(controller, warmup=0)
+    stats.record_cycle({"due": 2, "failed": 0, "carried_over": 0, "duration": 0.01}, True)
+    stats.record_cycle({}, False)
+
+    try:
+        report = await async_run_soak(
+            stats, 0.2, reboot_interval=0.05, downtime=0.01, step=0.05
+        )
+    finally:
+        await controller.stop()
+
+    assert report["cycles"] == 1
+    assert report["failed_refreshes"] == 1
+    assert report["polled"] == 2
+    assert report["reboots"] >= 1
+    assert report["recovering"]
+
+
+@pytest.mark.skipif(
+    not SOAK_DURATION, reason="set GREENPOINT_SOAK_DURATION to run the soak test"
+)
+@pytest.mark.parametrize("transport", [TRANSPORT_AIOHTTP, TRANSPORT_RAW])
+async def test_soak(
+    hass: HomeAssistant, enable_custom_integrations, socket_enabled, transport
+):
+    """Test the integration keeps polling through faults and reboots."""
+    controller = FakeController(rooms=4, units_per_room=6, seed=1)
+    port = await controller.start()
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "127.0.0.1", CONF_PORT: port, CONF_TOKEN: controller.token},
+        options={
+            CONF_SCAN_INTERVAL: 1,
+            CONF_MIN_UNIT_INTERVAL: 1,
+            CONF_MAX_UNIT_INTERVAL: 2,
+            CONF_CYCLE_DEADLINE: 1,
+            CONF_TIMEOUT_CEILING: 1,
+            CONF_RATE_LIMIT: 0,
+            CONF_TRANSPORT: transport,
+            CONF_ROOM_SWITCHES: True,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    stats = SoakStats(controller, warmup=SOAK_WARMUP)
+    remove_listener = coordinator.async_add_listener(
+        lambda: stats.record_cycle(
+            coordinator.last_cycle, coordinator.last_update_success
+        )
+    )
+    # Faults start once the entry is set up, so setup itself succeeds
+    controller.faults = Faults(
+        drop=SOAK_FAULT_RATE,
+        unauthorized=SOAK_FAULT_RATE,
+        malformed=SOAK_FAULT_RATE,
+        latency=SOAK_FAULT_RATE,
+        spike=0.5,
+        seed=1,
+    )
+    lights = hass.states.async_entity_ids("light")
+    picker = random.Random(1)
+
+    async def _toggle_light() -> None:
+        await hass.services.async_call(
+            "light",
+            picker.choice(("turn_on", "turn_off")),
+            {"entity_id": picker.choice(lights)},
+            blocking=True,
+        )
+
+    try:
+        report = await async_run_soak(
+            stats,
+            SOAK_DURATION,
+            reboot_interval=SOAK_REBOOT_INTERVAL,
+            downtime=SOAK_DOWNTIME,
+            on_step=_toggle_light,
+        )
+        for platform in PLATFORMS:
+            assert hass.states.async_entity_ids(platform)
+    finally:
+        remove_listener()
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        await controller.stop()
+
+    print(json.dumps(report, indent=2))
+    assert report["cycles"] > 0
+    assert report["polled"] > report["failed_polls"]
+    assert sum(report["faults"].values()) > 0
+    assert report["reboots"] >= 1
+    assert report["recoveries"] >= 1
+    assert report["cycle_p50"] <= report["cycle_p95"] <= report["cycle_max"]
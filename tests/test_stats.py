@@ -0,0 +1,39 @@
+"""Tests for the Greenpoint IGH Compact rolling statistics."""
+import random
+
+import pytest
+
+from custom_components.greenpoint.pygreenpoint.stats import RollingStats
+
+
+def test_matches_full_scan():
+    """Test the rolling values match a scan of the same window."""
+    stats = RollingStats(5)
+    readings = []
+    random.seed(1)
+
+    for second in range(50):
+        value = round(random.uniform(15, 25), 1)
+        stats.add(value, second * 60)
+        readings.append((second * 60, value))
+
+        window = readings[-5:]
+        values = [value for _, value in window]
+        assert stats.minimum == min(values)
+        assert stats.maximum == max(values)
+        assert stats.mean == pytest.approx(sum(values) / len(values))
+
+    assert len(stats) == 5
+    (start, first), (end, last) = readings[-5], readings[-1]
+    assert stats.rate == pytest.approx((last - first) / (end - start) * 3600)
+
+
+def test_empty():
+    """Test statistics are unknown without readings."""
+    stats = RollingStats(5)
+    assert stats.minimum is None
+    assert stats.mean is None
+    assert stats.rate is None
+
+    stats.add(20.0, 0)
+    assert stats.rate is None
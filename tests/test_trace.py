@@ -0,0 +1,148 @@
+"""Tests for the Greenpoint IGH Compact trace recording."""
+import asyncio
+import gc
+import json
+
+from custom_components.greenpoint.pygreenpoint.__main__ import async_main, parse_args
+from custom_components.greenpoint.pygreenpoint.trace import (
+    Tracer,
+    reset_trace_lane,
+    set_trace_lane,
+)
+
+
+def _read_trace(path):
+    """Parse a trace file that is still being appended to."""
+    with open(path, encoding="utf-8") as trace_file:
+        return json.loads(trace_file.read().rstrip(",\n") + "]")
+
+
+def test_disabled_tracer(tmp_path):
+    """Test a tracer without a path records nothing."""
+    tracer = Tracer()
+    with tracer.span("request", "api") as span:
+        span.args["status"] = 200
+
+    assert tracer.drain() == []
+
+
+async def test_spans_and_rotation(tmp_path):
+    """Test spans nest on their lane and the file rotates when full."""
+    path = str(tmp_path / "trace.json")
+    tracer = Tracer(path, max_bytes=2000, backups=1)
+    with tracer.span("cycle", "poll"):
+        with tracer.span("request", "api", {"status": 200}):
+            pass
+    tracer.write(tracer.drain())
+
+    events = _read_trace(path)
+    lanes = [event for event in events if event["ph"] == "M"]
+    spans = [event for event in events if event["ph"] == "X"]
+    assert len(lanes) == 1
+    assert [span["name"] for span in spans] == ["request", "cycle"]
+    request, cycle = spans
+    assert request["tid"] == cycle["tid"] == lanes[0]["tid"]
+    assert cycle["ts"] <= request["ts"]
+    assert request["ts"] + request["dur"] <= cycle["ts"] + cycle["dur"]
+    assert request["args"] == {"status": 200}
+
+    for _ in range(20):
+        with tracer.span("request", "api"):
+            pass
+        tracer.write(tracer.drain())
+
+    assert (tmp_path / "trace.json.1").exists()
+    assert not (tmp_path / "trace.json.2").exists()
+    # A rotated file names its lanes again
+    assert _read_trace(path)[0]["ph"] == "M"
+
+
+async def test_task_lanes(tmp_path):
+    """Test task lanes are never reused and finished ones are forgotten."""
+    tracer = Tracer(str(tmp_path / "trace.json"))
+
+    async def _command(name):
+        with tracer.span(name, "command"):
+            await asyncio.sleep(0)
+
+    lanes = set()
+    for index in range(5):
+        await asyncio.create_task(_command(f"command {index}"))
+        gc.collect()
+        events = tracer.drain()
+        lanes.update(event["tid"] for event in events)
+        tracer.write(events)
+
+    # Every task got a lane of its own even though earlier ones were gone
+    assert len(lanes) == 5
+    assert len(tracer._lane_names) <= 1
+    names = {
+        event["tid"]: event["args"]["name"]
+        for event in _read_trace(tracer.path)
+        if event["ph"] == "M"
+    }
+    assert set(names) == lanes
+
+
+def test_lane_names_drained_with_events(tmp_path):
+    """Test writing uses the lane names copied when the events were drained."""
+    tracer = Tracer(str(tmp_path / "trace.json"))
+    token = set_trace_lane(100, "poll cycle Hall")
+    with tracer.span("cycle", "poll"):
+        pass
+    reset_trace_lane(token)
+    events = tracer.drain()
+
+    # Lanes named on the event loop while the batch is being written
+    tracer._lane_names.clear()
+    tracer._lane_names[200] = "poll cycle Kitchen"
+    tracer.write(events)
+
+    names = [event for event in _read_trace(tracer.path) if event["ph"] == "M"]
+    assert [(event["tid"], event["args"]["name"]) for event in names] == [
+        (100, "poll cycle Hall")
+    ]
+
+
+async def test_poll_trace(tmp_path, socket_enabled):
+    """Test a poll records cycles, worker lanes and requests."""
+    path = str(tmp_path / "trace.json")
+    await async_main(
+        parse_args(
+            [
+                "--fake",
+                "--rooms",
+                "2",
+                "--rate-limit",
+                "0",
+                "--concurrency",
+                "2",
+                "--trace",
+                path,
+                "poll",
+                "--all",
+                "--cycles",
+                "2",
+                "--interval",
+                "0",
+                "--quiet",
+            ]
+        )
+    )
+
+    events = _read_trace(path)
+    lanes = {
+        event["tid"]: event["args"]["name"] for event in events if event["ph"] == "M"
+    }
+    assert lanes == {
+        0: "poll cycle",
+        1: "poll cycle worker 1",
+        2: "poll cycle worker 2",
+    }
+    spans = [event for event in events if event["ph"] == "X"]
+    assert len([span for span in spans if span["name"] == "poll cycle"]) == 2
+    requests = [span for span in spans if span["name"] == "/unit"]
+    assert len(requests) == 40
+    assert {span["tid"] for span in requests} == {1, 2}
+    assert all(span["args"]["status"] == 200 for span in requests)
+    assert all(span["args"]["bytes"] > 0 for span in requests)
@@ -0,0 +1,168 @@
+"""Tests for the Greenpoint IGH Compact raw HTTP transport."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.greenpoint.pygreenpoint.api import (
+    CannotConnect,
+    GreenpointApiClient,
+    InvalidAuth,
+)
+from custom_components.greenpoint.pygreenpoint.transport import (
+    RawHttpProtocol,
+    RawHttpTransport,
+)
+
+
+def _protocol(requests):
+    """Return a connected protocol with a number of pending requests."""
+    protocol = RawHttpProtocol()
+    protocol.connection_made(MagicMock())
+    loop = asyncio.get_running_loop()
+    futures = [loop.create_future() for _ in range(requests)]
+    protocol.pending.extend(futures)
+    return protocol, futures
+
+
+async def test_pipelined_responses():
+    """Test responses split across reads are matched to requests in order."""
+    protocol, futures = _protocol(3)
+    stream = (
+        b"HTTP/1.1 200 OK\r\nContent-Length: 11\r\n\r\n{\"temp\": 1}"
+        b"HTTP/1.1 401 Unauthorized\r\nContent-Length: 0\r\n\r\n"
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"4\r\n{\"st\r\n9\r\natus\": 1}\r\n0\r\n\r\n"
+    )
+    for i in range(0, len(stream), 7):
+        protocol.data_received(stream[i : i + 7])
+
+    assert [future.result() for future in futures] == [
+        (200, b'{"temp": 1}'),
+        (401, b""),
+        (200, b'{"status": 1}'),
+    ]
+    assert not protocol.pending
+    assert not protocol.closed
+
+
+async def test_cancelled_request_is_skipped():
+    """Test the response of a timed out request is discarded."""
+    protocol, futures = _protocol(2)
+    futures[0].cancel()
+    protocol.data_received(
+        b"HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\na"
+        b"HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\nb"
+    )
+
+    assert futures[1].result() == (200, b"b")
+
+
+async def test_connection_close():
+    """Test close-delimited bodies and failing the remaining requests."""
+    protocol, futures = _protocol(2)
+    protocol.data_received(b"HTTP/1.0 200 OK\r\n\r\n{}")
+    protocol.eof_received()
+    protocol.connection_lost(None)
+
+    assert futures[0].result() == (200, b"{}")
+    with pytest.raises(ConnectionResetError):
+        futures[1].result()
+    assert protocol.closed
+
+
+async def test_invalid_response():
+    """Test an unparseable response fails the pending requests."""
+    protocol, futures = _protocol(1)
+    protocol.data_received(b"garbage\r\n\r\n")
+
+    with pytest.raises(ConnectionResetError):
+        futures[0].result()
+    protocol.transport.close.assert_called_once()
+
+
+async def test_client_uses_transport():
+    """Test the API client sends requests through the raw transport."""
+    transport = MagicMock()
+    transport.get = AsyncMock(return_value=(200, b'{"temp": 21.5}'))
+    client = GreenpointApiClient(
+        "192.168.1.100", 20500, "a token", MagicMock(), transport=transport
+    )
+
+    assert await client.get_unit_status("1-2 3") == {"temp": 21.5}
+    transport.get.assert_awaited_once_with("/unit/1-2%203?token=a%20token")
+
+    transport.get.return_value = (401, b"")
+    with pytest.raises(InvalidAuth):
+        await client.get_unit_status("1-2 3")
+
+    transport.get.side_effect = ConnectionRefusedError()
+    with pytest.raises(CannotConnect):
+        await client.get_unit_status("1-2 3")
+
+
+async def test_timeout_reconnects(socket_enabled):
+    """Test a request timing out drops a connection that stopped answering."""
+    connections = []
+
+    async def _handle(reader, writer):
+        connections.append(writer)
+        await reader.readuntil(b"\r\n\r\n")
+        # Only the second connection answers
+        if len(connections) > 1:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+            await writer.drain()
+
+    server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    transport = RawHttpTransport("127.0.0.1", port, pipeline_depth=1)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(transport.get("/unit/1"), 0.1)
+
+        assert await asyncio.wait_for(transport.get("/unit/1"), 1) == (200, b"{}")
+        assert len(connections) == 2
+    finally:
+        transport.close()
+        for writer in connections:
+            writer.close()
+        server.close()
+        await server.wait_closed()
+
+
+async def test_cancelled_pipelined_request(socket_enabled):
+    """Test cancelling a request behind others leaves them answered."""
+    connections = []
+
+    async def _handle(reader, writer):
+        connections.append(writer)
+        while True:
+            request = await reader.readuntil(b"\r\n\r\n")
+            await asyncio.sleep(0.05)
+            body = request.split(b" ")[1]
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+            )
+            await writer.drain()
+
+    server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    transport = RawHttpTransport("127.0.0.1", port, pipeline_depth=3)
+    try:
+        requests = [asyncio.create_task(transport.get(f"/unit/{i}")) for i in range(3)]
+        await asyncio.sleep(0.01)
+        requests[1].cancel()
+        results = await asyncio.gather(*requests, return_exceptions=True)
+
+        assert results[0] == (200, b"/unit/0")
+        assert isinstance(results[1], asyncio.CancelledError)
+        assert results[2] == (200, b"/unit/2")
+        assert len(connections) == 1
+        # The cancelled request's slot is free again once its response came
+        assert transport._slots._value == 3
+    finally:
+        transport.close()
+        for writer in connections:
+            writer.close()
+        server.close()
+        await server.wait_closed()